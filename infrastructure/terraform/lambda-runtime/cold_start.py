@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the ops Lambda packages.
+
+local   Assembles each package the way its archive_file data source does
+        and imports index.py in fresh interpreters, which is the work of
+        the Lambda INIT phase. Prints min/median/p95 import time and, with
+        --profile, the slowest imports from -X importtime.
+
+aws     Reads the Init Duration Lambda reports for a deployed function
+        from CloudWatch Logs Insights, per day, so a change to INIT can be
+        tracked after deployment.
+
+Usage:
+  python3 infrastructure/terraform/lambda-runtime/cold_start.py local [-n 20] [--profile]
+  python3 infrastructure/terraform/lambda-runtime/cold_start.py aws FUNCTION [--days 7] [--region R]
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNTIME_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULES_DIR = os.path.join(RUNTIME_DIR, '..', 'modules')
+
+# package -> (templates dir, handler template); every other .py in the
+# templates dir is shipped beside index.py, as in the archive_file sources
+PACKAGES = {
+    'dr-orchestrator': (os.path.join(MODULES_DIR, 'multi-region', 'templates'), 'dr_orchestrator.py'),
+    'cost-optimizer': (os.path.join(MODULES_DIR, 'cost-optimization', 'templates'), 'cost_optimizer.py'),
+}
+
+# package -> sources shipped from other modules' templates
+EXTRA_FILES = {
+    'cost-optimizer': [os.path.join(MODULES_DIR, 'multi-region', 'templates', 's3_replication.py')],
+}
+
+IMPORT_SNIPPET = ("import time; started = time.perf_counter(); import index; "
+                  "print((time.perf_counter() - started) * 1000)")
+
+INIT_DURATION_QUERY = """
+filter @type = "REPORT" and ispresent(@initDuration)
+| stats count() as cold_starts, avg(@initDuration) as avg_ms, pct(@initDuration, 50) as p50_ms,
+        pct(@initDuration, 95) as p95_ms, max(@initDuration) as max_ms by bin(1d) as day
+| sort day asc
+"""
+
+
+def assemble(package, directory):
+    templates, handler = PACKAGES[package]
+    for path in glob.glob(os.path.join(templates, '*.py')):
+        name = os.path.basename(path)
+        shutil.copyfile(path, os.path.join(directory, 'index.py' if name == handler else name))
+    for path in EXTRA_FILES.get(package, []):
+        shutil.copyfile(path, os.path.join(directory, os.path.basename(path)))
+    shutil.copyfile(os.path.join(RUNTIME_DIR, 'ops_runtime.py'), os.path.join(directory, 'ops_runtime.py'))
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))]
+
+
+def import_times(directory, runs):
+    """Milliseconds to import index.py, each in a new interpreter"""
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], cwd=directory,
+                                capture_output=True, text=True,
+                                env=dict(os.environ, PYTHONPATH=directory, PYTHONDONTWRITEBYTECODE='1'))
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+        times.append(float(result.stdout.strip()))
+    return times
+
+
+def slowest_imports(directory, limit=10):
+    """(cumulative microseconds, module) for the slowest imports under -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import index'], cwd=directory,
+                            capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=directory))
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[1].isdigit():
+            rows.append((int(parts[1]), parts[2].strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def run_local(args):
+    for package in args.packages or PACKAGES:
+        with tempfile.TemporaryDirectory() as directory:
+            assemble(package, directory)
+            try:
+                times = import_times(directory, args.runs)
+            except RuntimeError as e:
+                print(f"{package:16} import failed: {e}")
+                continue
+            print(f"{package:16} init {min(times):7.1f} min {statistics.median(times):7.1f} median "
+                  f"{percentile(times, 0.95):7.1f} p95 ms ({args.runs} runs)")
+            if args.profile:
+                for micros, module in slowest_imports(directory):
+                    print(f"{'':16} {micros / 1000:7.1f} ms  {module}")
+    return 0
+
+
+def run_aws(args):
+    import boto3
+
+    logs = boto3.client('logs', region_name=args.region)
+    end = int(time.time())
+    query = logs.start_query(
+        logGroupName=f"/aws/lambda/{args.function}",
+        startTime=end - args.days * 86400,
+        endTime=end,
+        queryString=INIT_DURATION_QUERY,
+    )
+    while True:
+        result = logs.get_query_results(queryId=query['queryId'])
+        if result['status'] in ('Complete', 'Failed', 'Cancelled', 'Timeout'):
+            break
+        time.sleep(1)
+    if result['status'] != 'Complete':
+        print(f"Query {result['status'].lower()}")
+        return 1
+
+    print(f"{'day':12} {'cold':>6} {'avg':>8} {'p50':>8} {'p95':>8} {'max':>8}  (Init Duration, ms)")
+    for row in result['results']:
+        fields = {field['field']: field['value'] for field in row}
+        print(f"{fields['day'][:10]:12} {fields['cold_starts']:>6} "
+              + ' '.join(f"{float(fields[name]):8.1f}" for name in ('avg_ms', 'p50_ms', 'p95_ms', 'max_ms')))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure ops Lambda cold starts')
+    modes = parser.add_subparsers(dest='mode', required=True)
+
+    local = modes.add_parser('local', help='time importing each package in fresh interpreters')
+    local.add_argument('packages', nargs='*', help=f"packages (default: all of {', '.join(PACKAGES)})")
+    local.add_argument('-n', '--runs', type=int, default=20)
+    local.add_argument('--profile', action='store_true', help='list the slowest imports')
+
+    aws = modes.add_parser('aws', help='Init Duration of a deployed function from CloudWatch Logs')
+    aws.add_argument('function')
+    aws.add_argument('--days', type=int, default=7)
+    aws.add_argument('--region')
+
+    args = parser.parse_args(argv)
+    if args.mode == 'local':
+        unknown = [package for package in args.packages if package not in PACKAGES]
+        if unknown:
+            parser.error(f"unknown package(s): {', '.join(unknown)}")
+    return run_local(args) if args.mode == 'local' else run_aws(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
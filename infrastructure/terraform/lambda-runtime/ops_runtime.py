@@ -0,0 +1,139 @@
+"""
+Shared runtime for the ops Lambdas (DR orchestrator, cost optimizer).
+
+Nothing outside the standard library is imported at module load, so the
+Lambda INIT phase no longer pays for importing boto3. AWS clients are
+created on first use from a single botocore session per container and
+cached by (service, region). botocore reads a service's JSON model when
+the first client for it is created, so an invocation only loads the models
+of the services its code path actually calls: a status check never loads
+Route53 or S3, and a cost report never loads anything but Cost Explorer
+and SNS. The clients are the same botocore clients boto3 returns.
+
+Also shared here: environment lookups, JSON responses and a plain SNS
+publish. The package is copied into each Lambda archive next to index.py
+(see the archive_file data sources of the multi-region and
+cost-optimization modules); cold_start.py in this directory benchmarks the
+INIT phase of both packages.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+SUBJECT_LIMIT = 100
+
+# Set when this module is first imported, i.e. during the container's INIT phase
+INIT_STARTED = time.time()
+
+_session = None
+_clients = {}
+_lock = threading.Lock()
+_invocations = 0
+
+
+class ConfigError(Exception):
+    pass
+
+
+def aws_session():
+    """botocore session shared by every client in the container"""
+    global _session
+    if _session is None:
+        import botocore.session
+        _session = botocore.session.get_session()
+    return _session
+
+
+def aws_client(service, region=None):
+    """Client for service in region (default: the Lambda's own), created once per container"""
+    key = (service, region)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = aws_session().create_client(service, region_name=region or os.environ.get('AWS_REGION'))
+    return _clients[key]
+
+
+class LazyClient:
+    """Stand-in for a client that is only created when a method is first used"""
+
+    def __init__(self, service, region=None):
+        self._service = service
+        self._region = region
+
+    def __getattr__(self, name):
+        return getattr(aws_client(self._service, self._region), name)
+
+    def __repr__(self):
+        return f"LazyClient({self._service!r}, {self._region!r})"
+
+
+def require_env(*names):
+    """Raise ConfigError naming every unset variable"""
+    missing = [name for name in names if not os.environ.get(name)]
+    if missing:
+        raise ConfigError(f"Missing environment variables: {', '.join(missing)}")
+
+
+def env(name, default=None):
+    value = os.environ.get(name)
+    return default if value in (None, '') else value
+
+
+def env_int(name, default=None):
+    value = env(name)
+    return default if value is None else int(value)
+
+
+def env_float(name, default=None):
+    value = env(name)
+    return default if value is None else float(value)
+
+
+def env_json(name, default=None):
+    value = env(name)
+    return default if value is None else json.loads(value)
+
+
+def env_list(name, default=None, separator=','):
+    value = env(name)
+    if value is None:
+        return list(default or [])
+    return [item.strip() for item in value.split(separator) if item.strip()]
+
+
+def response(status_code, body):
+    """Lambda proxy-style response; datetimes and Decimals are serialized as strings"""
+    return {'statusCode': status_code, 'body': json.dumps(body, default=str)}
+
+
+def error_response(message, status_code=500, **fields):
+    return response(status_code, dict({'status': 'error', 'message': message,
+                                       'timestamp': datetime.utcnow().isoformat()}, **fields))
+
+
+def publish(topic_arn, message, subject, sns_client=None):
+    """Publish one SNS message; returns the message id, or None when publishing failed"""
+    try:
+        result = (sns_client or aws_client('sns')).publish(
+            TopicArn=topic_arn,
+            Message=message,
+            Subject=subject[:SUBJECT_LIMIT]
+        )
+        return result['MessageId']
+    except Exception as e:
+        print(f"Failed to publish to {topic_arn}: {e}")
+        return None
+
+
+def invocation_started():
+    """Log cold starts with the time since INIT began; call at the top of the handler"""
+    global _invocations
+    _invocations += 1
+    if _invocations == 1:
+        print(json.dumps({'cold_start': True,
+                          'since_init_ms': round((time.time() - INIT_STARTED) * 1000, 1),
+                          'clients': len(_clients)}))
+    return _invocations == 1
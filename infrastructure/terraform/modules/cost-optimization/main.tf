@@ -260,6 +260,7 @@ resource "aws_budgets_budget" "monthly_cost_budget" {
     threshold_type            = "PERCENTAGE"
     notification_type         = "ACTUAL"
     subscriber_email_addresses = var.cost_alert_emails
+    subscriber_sns_topic_arns  = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? [aws_sns_topic.cost_events[0].arn] : []
   }
 
   notification {
@@ -268,6 +269,7 @@ resource "aws_budgets_budget" "monthly_cost_budget" {
     threshold_type            = "PERCENTAGE"
     notification_type          = "FORECASTED"
     subscriber_email_addresses = var.cost_alert_emails
+    subscriber_sns_topic_arns  = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? [aws_sns_topic.cost_events[0].arn] : []
   }
 
   tags = var.tags
@@ -400,6 +402,47 @@ resource "aws_cloudwatch_dashboard" "cost_optimization_dashboard" {
   tags = var.tags
 }
 
+# Incremental daily cost cache; kept in S3 because the Lambda's /tmp does
+# not survive container recycling between the weekly and hourly runs
+resource "aws_s3_bucket" "cost_cache" {
+  count         = var.enable_cost_optimizer_lambda && var.cost_cache_location == "" ? 1 : 0
+  bucket_prefix = "${var.name_prefix}-cost-cache-"
+  force_destroy = true
+
+  tags = merge(var.tags, {
+    Name    = "${var.name_prefix}-cost-cache"
+    Purpose = "cost-optimizer-cache"
+  })
+}
+
+resource "aws_s3_bucket_public_access_block" "cost_cache" {
+  count  = var.enable_cost_optimizer_lambda && var.cost_cache_location == "" ? 1 : 0
+  bucket = aws_s3_bucket.cost_cache[0].id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+resource "aws_s3_bucket_server_side_encryption_configuration" "cost_cache" {
+  count  = var.enable_cost_optimizer_lambda && var.cost_cache_location == "" ? 1 : 0
+  bucket = aws_s3_bucket.cost_cache[0].id
+
+  rule {
+    apply_server_side_encryption_by_default {
+      sse_algorithm = "AES256"
+    }
+  }
+}
+
+locals {
+  cost_cache_location = var.cost_cache_location != "" ? var.cost_cache_location : (
+    var.enable_cost_optimizer_lambda ? "s3://${aws_s3_bucket.cost_cache[0].id}/cost-cache/" : ""
+  )
+  cost_cache_bucket = local.cost_cache_location != "" ? regex("^s3://([^/]+)", local.cost_cache_location)[0] : ""
+}
+
 # Lambda function for cost optimization recommendations
 resource "aws_lambda_function" "cost_optimizer" {
   count            = var.enable_cost_optimizer_lambda ? 1 : 0
@@ -408,14 +451,43 @@ resource "aws_lambda_function" "cost_optimizer" {
   role            = aws_iam_role.cost_optimizer_role[0].arn
   handler         = "index.handler"
   runtime         = "python3.11"
-  timeout         = 300
+  timeout         = var.cost_optimizer_timeout_seconds
+  memory_size     = var.cost_optimizer_memory_size
   source_code_hash = data.archive_file.cost_optimizer_zip[0].output_base64sha256
 
   environment {
     variables = {
-      SNS_TOPIC_ARN    = aws_sns_topic.cost_optimization_alerts.arn
-      ENVIRONMENT      = var.environment
-      COST_THRESHOLD   = var.cost_anomaly_threshold
+      SNS_TOPIC_ARN         = aws_sns_topic.cost_optimization_alerts.arn
+      ENVIRONMENT           = var.environment
+      COST_THRESHOLD        = var.cost_anomaly_threshold
+      COST_FEATURES         = join(",", var.cost_features)
+      COST_FEATURE_TAG_KEY  = var.cost_feature_tag_key
+      COST_CATEGORY_NAME    = var.cost_category_name
+      COST_SHARED_VALUES    = join(",", var.cost_shared_values)
+      COST_FEATURE_USAGE    = jsonencode(var.cost_feature_usage)
+      COST_ATTRIBUTION_DAYS = var.cost_attribution_days
+
+      S3_INVENTORY_LOCATIONS   = jsonencode(var.s3_inventory_locations)
+      S3_STORAGE_LENS_LOCATION = var.s3_storage_lens_location
+      S3_LIFECYCLE_GROUPS      = jsonencode(var.s3_lifecycle_groups)
+      S3_PRICING               = jsonencode(var.s3_pricing)
+      S3_ACCESS_HALF_LIFE_DAYS = var.s3_access_half_life_days
+
+      CDN_DISTRIBUTIONS    = jsonencode(var.cdn_distributions)
+      CDN_TARGET_HIT_RATIO = var.cdn_target_hit_ratio
+      CDN_ORIGIN_COST      = jsonencode(var.cdn_origin_cost)
+      CDN_MAX_LOG_FILES    = var.cdn_max_log_files
+
+      COST_CACHE_LOCATION           = local.cost_cache_location
+      COMMITMENT_SERVICES           = join(",", var.commitment_services)
+      COMMITMENT_UTILIZATION_TARGET = var.commitment_utilization_target
+      COMMITMENT_SHORT_WINDOW       = var.commitment_short_window
+      COMMITMENT_LONG_WINDOW        = var.commitment_long_window
+
+      FAST_CHECK_BASELINE_DAYS   = var.fast_check_baseline_days
+      FAST_CHECK_ANOMALY_RATIO   = var.fast_check_anomaly_ratio
+      FAST_CHECK_MIN_DELTA       = var.fast_check_min_delta
+      FAST_CHECK_DAILY_THRESHOLD = var.fast_check_daily_threshold
     }
   }
 
@@ -427,12 +499,53 @@ data "archive_file" "cost_optimizer_zip" {
   type        = "zip"
   output_path = "/tmp/cost_optimizer.zip"
 
+  # Plain file, not a template: the handler's f-strings use ${...}
   source {
-    content = templatefile("${path.module}/templates/cost_optimizer.py", {
-      sns_topic_arn = aws_sns_topic.cost_optimization_alerts.arn
-    })
+    content  = file("${path.module}/templates/cost_optimizer.py")
     filename = "index.py"
   }
+
+  source {
+    content  = file("${path.module}/templates/cost_attribution.py")
+    filename = "cost_attribution.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/commitments.py")
+    filename = "commitments.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/cost_cache.py")
+    filename = "cost_cache.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/egress_costs.py")
+    filename = "egress_costs.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/fast_check.py")
+    filename = "fast_check.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/s3_savings.py")
+    filename = "s3_savings.py"
+  }
+
+  # Inventory manifest reader shared with the DR orchestrator
+  source {
+    content  = file("${path.module}/../multi-region/templates/s3_replication.py")
+    filename = "s3_replication.py"
+  }
+
+  # Shared ops Lambda runtime (lazy AWS clients, env and response helpers)
+  source {
+    content  = file("${path.module}/../../lambda-runtime/ops_runtime.py")
+    filename = "ops_runtime.py"
+  }
 }
 
 resource "aws_iam_role" "cost_optimizer_role" {
@@ -478,9 +591,29 @@ resource "aws_iam_role_policy" "cost_optimizer_policy" {
           "ce:GetCostAndUsage",
           "ce:GetRightsizingRecommendation",
           "ce:GetReservationPurchaseRecommendation",
+          "ce:GetReservationUtilization",
+          "ce:GetReservationCoverage",
+          "ce:GetSavingsPlansUtilization",
+          "ce:GetSavingsPlansCoverage",
+          "cloudwatch:GetMetricData",
           "sns:Publish"
         ]
         Resource = "*"
+      },
+      {
+        # S3 Inventory, Storage Lens exports and CloudFront access logs read by the analyses
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:ListBucket"
+        ]
+        Resource = "*"
+      },
+      {
+        # The incremental cost cache is the only place the optimizer writes to
+        Effect   = "Allow"
+        Action   = ["s3:PutObject"]
+        Resource = "arn:aws:s3:::${local.cost_cache_bucket}/*"
       }
     ]
   })
@@ -510,4 +643,101 @@ resource "aws_lambda_permission" "allow_eventbridge" {
   function_name = aws_lambda_function.cost_optimizer[0].function_name
   principal     = "events.amazonaws.com"
   source_arn    = aws_cloudwatch_event_rule.cost_optimization_schedule[0].arn
-}
\ No newline at end of file
+}
+
+# Fast cost check: hourly, and on AWS Budgets and Cost Anomaly Detection notifications
+resource "aws_cloudwatch_event_rule" "fast_cost_check_schedule" {
+  count               = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? 1 : 0
+  name                = "${var.name_prefix}-fast-cost-check"
+  description         = "Check the latest cost data for anomalies between weekly analyses"
+  schedule_expression = var.fast_check_schedule
+
+  tags = var.tags
+}
+
+resource "aws_cloudwatch_event_target" "fast_cost_check_target" {
+  count     = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? 1 : 0
+  rule      = aws_cloudwatch_event_rule.fast_cost_check_schedule[0].name
+  target_id = "FastCostCheckTarget"
+  arn       = aws_lambda_function.cost_optimizer[0].arn
+  input     = jsonencode({ action = "fast_check" })
+}
+
+resource "aws_lambda_permission" "allow_fast_check_schedule" {
+  count         = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? 1 : 0
+  statement_id  = "AllowExecutionFromFastCheckSchedule"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.cost_optimizer[0].function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.fast_cost_check_schedule[0].arn
+}
+
+# Budgets and Cost Anomaly Detection publish here; the cost optimizer subscribes
+resource "aws_sns_topic" "cost_events" {
+  count = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? 1 : 0
+  name  = "${var.name_prefix}-cost-events"
+  tags  = var.tags
+}
+
+resource "aws_sns_topic_policy" "cost_events" {
+  count = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? 1 : 0
+  arn   = aws_sns_topic.cost_events[0].arn
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Principal = {
+          Service = ["budgets.amazonaws.com", "costalerts.amazonaws.com"]
+        }
+        Action   = "SNS:Publish"
+        Resource = aws_sns_topic.cost_events[0].arn
+      }
+    ]
+  })
+}
+
+resource "aws_sns_topic_subscription" "cost_events_to_optimizer" {
+  count     = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? 1 : 0
+  topic_arn = aws_sns_topic.cost_events[0].arn
+  protocol  = "lambda"
+  endpoint  = aws_lambda_function.cost_optimizer[0].arn
+}
+
+resource "aws_lambda_permission" "allow_cost_events" {
+  count         = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda ? 1 : 0
+  statement_id  = "AllowExecutionFromCostEvents"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.cost_optimizer[0].function_name
+  principal     = "sns.amazonaws.com"
+  source_arn    = aws_sns_topic.cost_events[0].arn
+}
+
+# SNS subscribers need IMMEDIATE anomaly notifications; the weekly email digest stays as it is
+resource "aws_cost_anomaly_subscription" "fast_check_notifications" {
+  count     = var.enable_fast_cost_check && var.enable_cost_optimizer_lambda && var.enable_cost_anomaly_detection ? 1 : 0
+  name      = "${var.name_prefix}-fast-cost-check"
+  frequency = "IMMEDIATE"
+
+  monitor_arn_list = [
+    aws_cost_anomaly_detector.ri_recommendations[0].arn
+  ]
+
+  subscriber {
+    type    = "SNS"
+    address = aws_sns_topic.cost_events[0].arn
+  }
+
+  threshold_expression {
+    dimension {
+      key           = "ANOMALY_TOTAL_IMPACT_ABSOLUTE"
+      values        = [tostring(var.fast_check_min_delta)]
+      match_options = ["GREATER_THAN_OR_EQUAL"]
+    }
+  }
+
+  depends_on = [aws_sns_topic_policy.cost_events]
+
+  tags = var.tags
+}
@@ -0,0 +1,318 @@
+"""
+Reservation and Savings Plans usage tracking for the cost optimizer.
+
+Daily utilization and coverage of Reserved Instances and Savings Plans are
+pulled into the incremental cost cache (cost_cache.py), one dataset each:
+
+  ri_utilization  per reservation, folded into instance families
+  ri_coverage     per instance type and service, folded into families
+  sp_utilization  all Savings Plans together (the API has no daily breakdown)
+  sp_coverage     per instance family
+
+The cached days become one column per measure and per (instrument, family):
+purchased and used hours, unused amortized fee, on-demand hours and cost.
+Rolling sums over a short and a long window are computed for whole columns
+at once from prefix sums. This yields, for every day, utilization, coverage
+and on-demand spill over both windows.
+The short window reacts within days when the load shape changes (instances
+moved to another family, a service scaled in), and the long window is the
+baseline it is compared against. The latest day raises an alert when
+utilization falls below the target or when on-demand spill grows clearly
+above its baseline.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from cost_cache import days_between, refresh
+
+DEFAULT_SERVICES = ('Amazon Elastic Compute Cloud - Compute', 'Amazon Relational Database Service')
+DEFAULT_UTILIZATION_TARGET = 0.9
+DEFAULT_SHORT_WINDOW = 3
+DEFAULT_LONG_WINDOW = 28
+DEFAULT_SPILL_TOLERANCE = 0.25
+DEFAULT_MIN_DAILY_SPILL = 1.0
+SAVINGS_PLANS = 'savings_plans'
+
+
+def instance_family(instance_type):
+    """'m5.large' -> 'm5', 'db.r6g.large' -> 'db.r6g', 'cache.t3.micro' -> 'cache.t3'"""
+    parts = (instance_type or 'unknown').split('.')
+    if parts[0] in ('db', 'cache', 'ml') and len(parts) > 2:
+        return '.'.join(parts[:2])
+    return parts[0]
+
+
+def _no_data(error):
+    return getattr(error, 'response', {}).get('Error', {}).get('Code') == 'DataUnavailableException'
+
+
+def _amount(value):
+    return float(value or 0.0)
+
+
+def fetch_ri_utilization(ce_client, start, end):
+    """
+    {day: [{family, purchased_hours, used_hours, unused_fee, net_savings}]}
+
+    Grouping by reservation rules out a daily granularity, so each day is
+    one (paginated) call. Only the days missing from the cache are asked for.
+    """
+    result = {}
+    for day in days_between(start, end):
+        next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        families = defaultdict(lambda: defaultdict(float))
+        request = {'TimePeriod': {'Start': day, 'End': next_day},
+                   'GroupBy': [{'Type': 'DIMENSION', 'Key': 'SUBSCRIPTION_ID'}]}
+        try:
+            while True:
+                page = ce_client.get_reservation_utilization(**request)
+                for period in page.get('UtilizationsByTime', []):
+                    for group in period.get('Groups', []):
+                        utilization = group['Utilization']
+                        family = families[instance_family(group.get('Attributes', {}).get('instanceType'))]
+                        purchased = _amount(utilization.get('PurchasedHours'))
+                        unused = _amount(utilization.get('UnusedHours'))
+                        family['purchased_hours'] += purchased
+                        family['used_hours'] += _amount(utilization.get('TotalActualHours'))
+                        family['unused_fee'] += (_amount(utilization.get('TotalAmortizedFee')) * unused / purchased
+                                                 if purchased else 0.0)
+                        family['net_savings'] += _amount(utilization.get('NetRISavings'))
+                if not page.get('NextPageToken'):
+                    break
+                request['NextPageToken'] = page['NextPageToken']
+        except Exception as e:
+            if not _no_data(e):
+                raise
+        result[day] = [{'family': name, **values} for name, values in sorted(families.items())]
+    return result
+
+
+def fetch_ri_coverage(ce_client, start, end, services=DEFAULT_SERVICES):
+    """{day: [{family, on_demand_hours, reserved_hours, total_hours, on_demand_cost}]}"""
+    per_day = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
+    for service in services:
+        request = {'TimePeriod': {'Start': start, 'End': end}, 'Granularity': 'DAILY',
+                   'GroupBy': [{'Type': 'DIMENSION', 'Key': 'INSTANCE_TYPE'}],
+                   'Filter': {'Dimensions': {'Key': 'SERVICE', 'Values': [service]}}}
+        try:
+            while True:
+                page = ce_client.get_reservation_coverage(**request)
+                for period in page.get('CoveragesByTime', []):
+                    day = period['TimePeriod']['Start']
+                    for group in period.get('Groups', []):
+                        hours = group['Coverage'].get('CoverageHours', {})
+                        family = per_day[day][instance_family(group.get('Attributes', {}).get('instanceType'))]
+                        family['on_demand_hours'] += _amount(hours.get('OnDemandHours'))
+                        family['reserved_hours'] += _amount(hours.get('ReservedHours'))
+                        family['total_hours'] += _amount(hours.get('TotalRunningHours'))
+                        family['on_demand_cost'] += _amount(group['Coverage'].get('CoverageCost', {}).get('OnDemandCost'))
+                if not page.get('NextPageToken'):
+                    break
+                request['NextPageToken'] = page['NextPageToken']
+        except Exception as e:
+            if not _no_data(e):
+                raise
+    return {day: [{'family': name, **values} for name, values in sorted(families.items())]
+            for day, families in per_day.items()}
+
+
+def fetch_sp_utilization(ce_client, start, end):
+    """{day: [{family: 'savings_plans', commitment, used_commitment, unused_commitment}]}"""
+    try:
+        page = ce_client.get_savings_plans_utilization(TimePeriod={'Start': start, 'End': end}, Granularity='DAILY')
+    except Exception as e:
+        if _no_data(e):
+            return {}
+        raise
+    result = {}
+    for period in page.get('SavingsPlansUtilizationsByTime', []):
+        utilization = period.get('Utilization', {})
+        result[period['TimePeriod']['Start']] = [{
+            'family': SAVINGS_PLANS,
+            'commitment': _amount(utilization.get('TotalCommitment')),
+            'used_commitment': _amount(utilization.get('UsedCommitment')),
+            'unused_commitment': _amount(utilization.get('UnusedCommitment')),
+        }]
+    return result
+
+
+def fetch_sp_coverage(ce_client, start, end):
+    """{day: [{family, covered_spend, on_demand_cost, total_cost}]}"""
+    per_day = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
+    request = {'TimePeriod': {'Start': start, 'End': end}, 'Granularity': 'DAILY',
+               'GroupBy': [{'Type': 'DIMENSION', 'Key': 'INSTANCE_FAMILY'}]}
+    try:
+        while True:
+            page = ce_client.get_savings_plans_coverage(**request)
+            for entry in page.get('SavingsPlansCoverages', []):
+                attributes = entry.get('Attributes', {})
+                family = per_day[entry['TimePeriod']['Start']][next(iter(attributes.values()), 'unknown')]
+                coverage = entry.get('Coverage', {})
+                family['covered_spend'] += _amount(coverage.get('SpendCoveredBySavingsPlans'))
+                family['on_demand_cost'] += _amount(coverage.get('OnDemandCost'))
+                family['total_cost'] += _amount(coverage.get('TotalCost'))
+            if not page.get('NextToken'):
+                break
+            request['NextToken'] = page['NextToken']
+    except Exception as e:
+        if not _no_data(e):
+            raise
+    return {day: [{'family': name, **values} for name, values in sorted(families.items())]
+            for day, families in per_day.items()}
+
+
+def load(cache, ce_client, start, end, services=DEFAULT_SERVICES):
+    """Refresh the four datasets in the cache for [start, end) and return {dataset: {day: rows}}"""
+    return {
+        'ri_utilization': refresh(cache, 'ri_utilization',
+                                  lambda first, last: fetch_ri_utilization(ce_client, first, last), start, end),
+        'ri_coverage': refresh(cache, 'ri_coverage',
+                               lambda first, last: fetch_ri_coverage(ce_client, first, last, services), start, end),
+        'sp_utilization': refresh(cache, 'sp_utilization',
+                                  lambda first, last: fetch_sp_utilization(ce_client, first, last), start, end),
+        'sp_coverage': refresh(cache, 'sp_coverage',
+                               lambda first, last: fetch_sp_coverage(ce_client, first, last), start, end),
+    }
+
+
+# dataset -> (instrument, measures copied into the columns)
+COLUMNS = {
+    'ri_utilization': ('ri', ('purchased_hours', 'used_hours', 'unused_fee', 'net_savings')),
+    'ri_coverage': ('ri', ('on_demand_hours', 'total_hours', 'on_demand_cost')),
+    'sp_utilization': ('sp', ('commitment', 'used_commitment', 'unused_commitment')),
+    'sp_coverage': ('sp', ('covered_spend', 'on_demand_cost', 'total_cost')),
+}
+
+
+def columns(datasets, days):
+    """{(instrument, family): {measure: [value per day]}}, zero where a day has no row"""
+    index = {day: position for position, day in enumerate(days)}
+    series = defaultdict(lambda: defaultdict(lambda: [0.0] * len(days)))
+    for dataset, (instrument, measures) in COLUMNS.items():
+        for day, rows in datasets.get(dataset, {}).items():
+            if day not in index:
+                continue
+            for row in rows:
+                column = series[(instrument, row['family'])]
+                for measure in measures:
+                    column[measure][index[day]] += row.get(measure, 0.0)
+    return series
+
+
+def rolling_sum(values, window):
+    """Sum over the window ending at each position, from one pass of prefix sums"""
+    prefix = [0.0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+    return [prefix[i + 1] - prefix[max(0, i + 1 - window)] for i in range(len(values))]
+
+
+def _ratio(numerators, denominators):
+    return [numerator / denominator if denominator > 0 else None
+            for numerator, denominator in zip(numerators, denominators)]
+
+
+def windowed(column, window):
+    """Utilization, coverage and daily on-demand spill over the window ending at each day"""
+    sums = {measure: rolling_sum(values, window) for measure, values in column.items()}
+    empty = [0.0] * len(next(iter(column.values()), []))
+    if 'purchased_hours' in sums:
+        utilization = _ratio(sums['used_hours'], sums['purchased_hours'])
+        waste = sums['unused_fee']
+    else:
+        utilization = _ratio(sums.get('used_commitment', empty), sums.get('commitment', empty))
+        waste = sums.get('unused_commitment', empty)
+    if 'total_hours' in sums:
+        coverage = [None if ratio is None else 1 - ratio
+                    for ratio in _ratio(sums['on_demand_hours'], sums['total_hours'])]
+    else:
+        coverage = _ratio(sums.get('covered_spend', empty), sums.get('total_cost', empty))
+    days_in_window = [min(window, i + 1) for i in range(len(empty))]
+    return {
+        'utilization': utilization,
+        'coverage': coverage,
+        'unused_per_day': [value / count for value, count in zip(waste, days_in_window)],
+        'on_demand_per_day': [value / count for value, count in zip(sums.get('on_demand_cost', empty), days_in_window)],
+    }
+
+
+def _round(value, digits=4):
+    return None if value is None else round(value, digits)
+
+
+def analyze(datasets, days, utilization_target=DEFAULT_UTILIZATION_TARGET, short_window=DEFAULT_SHORT_WINDOW,
+            long_window=DEFAULT_LONG_WINDOW, spill_tolerance=DEFAULT_SPILL_TOLERANCE,
+            min_daily_spill=DEFAULT_MIN_DAILY_SPILL):
+    """Per (instrument, family) rolling series and the alerts the latest day raises"""
+    families = {}
+    alerts = []
+    for (instrument, family), column in sorted(columns(datasets, days).items()):
+        short = windowed(column, short_window)
+        long = windowed(column, long_window)
+        name = f'{instrument}:{family}'
+        latest = {
+            'utilization_short': _round(short['utilization'][-1]),
+            'utilization_long': _round(long['utilization'][-1]),
+            'coverage_short': _round(short['coverage'][-1]),
+            'coverage_long': _round(long['coverage'][-1]),
+            'unused_per_day': round(short['unused_per_day'][-1], 2),
+            'on_demand_per_day_short': round(short['on_demand_per_day'][-1], 2),
+            'on_demand_per_day_long': round(long['on_demand_per_day'][-1], 2),
+        }
+        families[name] = {
+            **latest,
+            'series': [{'date': day, 'utilization': _round(short['utilization'][i]),
+                        'coverage': _round(short['coverage'][i]),
+                        'unused_per_day': round(short['unused_per_day'][i], 2),
+                        'on_demand_per_day': round(short['on_demand_per_day'][i], 2)}
+                       for i, day in enumerate(days)],
+        }
+
+        utilization = latest['utilization_short']
+        if utilization is not None and utilization < utilization_target:
+            baseline = latest['utilization_long']
+            alerts.append({
+                'family': name, 'kind': 'under_utilized', 'waste_per_day': latest['unused_per_day'],
+                'message': f"{name} utilization {utilization:.0%} over {short_window} days"
+                           + (f" ({baseline:.0%} over {long_window})" if baseline is not None else '')
+                           + f", ${latest['unused_per_day']:.2f}/day unused",
+            })
+        spill, baseline = latest['on_demand_per_day_short'], latest['on_demand_per_day_long']
+        if spill >= min_daily_spill and spill > baseline * (1 + spill_tolerance):
+            coverage = latest['coverage_short']
+            alerts.append({
+                'family': name, 'kind': 'on_demand_spill', 'spill_per_day': spill,
+                'message': f"{name} on-demand spill ${spill:.2f}/day over {short_window} days, "
+                           f"up from ${baseline:.2f}/day"
+                           + (f" (coverage {coverage:.0%})" if coverage is not None else ''),
+            })
+
+    return {
+        'period': {'start': days[0], 'end': days[-1]} if days else None,
+        'windows': {'short': short_window, 'long': long_window},
+        'families': families,
+        'alerts': sorted(alerts, key=lambda alert: -alert.get('waste_per_day', alert.get('spill_per_day', 0))),
+        'unused_per_day': round(sum(family['unused_per_day'] for family in families.values()), 2),
+    }
+
+
+def track_commitments(cache, ce_client, today, days=35, services=DEFAULT_SERVICES, **thresholds):
+    """Refresh the cache for the last days complete days and analyze them"""
+    start = (today - timedelta(days=days)).isoformat()
+    end = today.isoformat()
+    datasets = load(cache, ce_client, start, end, services)
+    return analyze(datasets, days_between(start, end), **thresholds)
+
+
+def format_commitments(report):
+    lines = [f"=== COMMITMENT USE (last {report['windows']['short']} vs {report['windows']['long']} days) ==="]
+    if not report['families']:
+        lines.append('No Reserved Instances or Savings Plans usage found')
+    for alert in report['alerts']:
+        lines.append(f"⚠️  {alert['message']}")
+    if report['families'] and not report['alerts']:
+        lines.append('✅ Commitments fully used, no growing on-demand spill')
+    if report['unused_per_day']:
+        lines.append(f"Unused commitment: ${report['unused_per_day']:.2f}/day")
+    return '\n'.join(lines) + '\n'
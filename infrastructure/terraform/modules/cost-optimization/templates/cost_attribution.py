@@ -0,0 +1,188 @@
+"""
+Cost attribution per platform feature for the cost optimizer.
+
+Cost Explorer spend is grouped by day and by the feature tag (or by a cost
+category, whose rules can combine tags, accounts and services). Everything
+comes from one paginated query per run. Costs tagged with a feature (PDF
+delivery, AI image/cover generation, the reading API, ...) go to that
+feature directly. Untagged costs and costs tagged as shared are split
+across the features day by day, in proportion to each feature's usage
+metric for that day (request counts, generation jobs, bytes served). When
+no usage was recorded on a day, the split follows that day's direct spend.
+
+Amortized cost is used, so Savings Plans and reservations are spread over
+the days they cover instead of landing on the day they were bought.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+COST_METRIC = 'AmortizedCost'
+UNTAGGED = ''
+
+
+def _group_by(tag_key, cost_category):
+    if cost_category:
+        return [{'Type': 'COST_CATEGORY', 'Key': cost_category}, {'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+    return [{'Type': 'TAG', 'Key': tag_key}, {'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+
+
+def _group_value(key):
+    """'Feature$pdf-delivery' -> 'pdf-delivery'; untagged groups come back as 'Feature$'"""
+    return key.split('$', 1)[1] if '$' in key else key
+
+
+def daily_costs(ce_client, start_date, end_date, tag_key='Feature', cost_category=None):
+    """{day: {(group value, service): cost}} for every day in [start_date, end_date)"""
+    costs = defaultdict(lambda: defaultdict(float))
+    request = {
+        'TimePeriod': {'Start': start_date, 'End': end_date},
+        'Granularity': 'DAILY',
+        'Metrics': [COST_METRIC],
+        'GroupBy': _group_by(tag_key, cost_category),
+    }
+    while True:
+        result = ce_client.get_cost_and_usage(**request)
+        for period in result['ResultsByTime']:
+            day = period['TimePeriod']['Start']
+            for group in period.get('Groups', []):
+                value, service = _group_value(group['Keys'][0]), group['Keys'][1]
+                costs[day][(value, service)] += float(group['Metrics'][COST_METRIC]['Amount'])
+        if not result.get('NextPageToken'):
+            return costs
+        request['NextPageToken'] = result['NextPageToken']
+
+
+def daily_usage(cloudwatch_client, usage_metrics, start, end):
+    """{feature: {day: value}} from one CloudWatch metric per feature, summed per UTC day"""
+    if not usage_metrics:
+        return {}
+    queries = []
+    ids = {}
+    for index, (feature, spec) in enumerate(sorted(usage_metrics.items())):
+        query_id = f'u{index}'
+        ids[query_id] = feature
+        queries.append({
+            'Id': query_id,
+            'MetricStat': {
+                'Metric': {
+                    'Namespace': spec['namespace'],
+                    'MetricName': spec['metric'],
+                    'Dimensions': [{'Name': name, 'Value': value}
+                                   for name, value in spec.get('dimensions', {}).items()],
+                },
+                'Period': 86400,
+                'Stat': spec.get('stat', 'Sum'),
+            },
+        })
+
+    usage = defaultdict(dict)
+    request = {'MetricDataQueries': queries, 'StartTime': start, 'EndTime': end}
+    while True:
+        result = cloudwatch_client.get_metric_data(**request)
+        for series in result['MetricDataResults']:
+            for timestamp, value in zip(series['Timestamps'], series['Values']):
+                usage[ids[series['Id']]][timestamp.strftime('%Y-%m-%d')] = value
+        if not result.get('NextToken'):
+            return usage
+        request['NextToken'] = result['NextToken']
+
+
+def _weights(features, usage, direct, day):
+    """Share of the day's shared cost per feature: usage if any was recorded, else direct spend"""
+    measured = {feature: usage.get(feature, {}).get(day, 0.0) for feature in features}
+    basis = measured if sum(measured.values()) > 0 else {feature: direct.get(feature, 0.0) for feature in features}
+    total = sum(basis.values())
+    if total <= 0:
+        return {}
+    return {feature: value / total for feature, value in basis.items()}
+
+
+def allocate(costs, usage, features, shared_values=('shared',)):
+    """
+    Cost per feature per day.
+
+    Group values that are not listed in features, untagged costs and
+    shared_values are shared; they are split by _weights(). A day's shared
+    cost that has no basis for a split (no usage, no direct spend) is reported
+    as unallocated.
+    """
+    features = list(features)
+    days = []
+    for day in sorted(costs):
+        direct = defaultdict(float)
+        shared = 0.0
+        shared_by_service = defaultdict(float)
+        for (value, service), cost in costs[day].items():
+            if value in features and value not in shared_values:
+                direct[value] += cost
+            else:
+                shared += cost
+                shared_by_service[service] += cost
+
+        weights = _weights(features, usage, direct, day)
+        entry = {'date': day, 'features': {}, 'shared': round(shared, 2),
+                 'unallocated': round(shared if not weights else 0.0, 2),
+                 'top_shared_services': dict(sorted(shared_by_service.items(), key=lambda item: -item[1])[:3])}
+        for feature in features:
+            allocated = shared * weights.get(feature, 0.0)
+            entry['features'][feature] = {
+                'direct': round(direct[feature], 2),
+                'shared': round(allocated, 2),
+                'total': round(direct[feature] + allocated, 2),
+            }
+        days.append(entry)
+    return days
+
+
+def feature_totals(days, recent_days=7):
+    """Total per feature over the period, and the last recent_days against the recent_days before"""
+    totals = {}
+    for entry in days:
+        for feature, cost in entry['features'].items():
+            totals.setdefault(feature, {'total': 0.0, 'recent': 0.0, 'previous': 0.0})
+            totals[feature]['total'] += cost['total']
+    for entry in days[-recent_days:]:
+        for feature, cost in entry['features'].items():
+            totals[feature]['recent'] += cost['total']
+    for entry in days[-2 * recent_days:-recent_days]:
+        for feature, cost in entry['features'].items():
+            totals[feature]['previous'] += cost['total']
+    for summary in totals.values():
+        previous = summary['previous']
+        summary['growth'] = round((summary['recent'] - previous) / previous, 3) if previous > 0 else None
+        for key in ('total', 'recent', 'previous'):
+            summary[key] = round(summary[key], 2)
+    return dict(sorted(totals.items(), key=lambda item: -item[1]['total']))
+
+
+def attribute_costs(ce_client, cloudwatch_client, features, days=14, tag_key='Feature', cost_category=None,
+                    shared_values=('shared',), usage_metrics=None, today=None):
+    """Cost per feature per day over the last days complete days, with totals and week-over-week growth"""
+    today = today or datetime.now(timezone.utc).date()
+    start = today - timedelta(days=days)
+    costs = daily_costs(ce_client, start.isoformat(), today.isoformat(), tag_key, cost_category)
+    usage = daily_usage(
+        cloudwatch_client, usage_metrics,
+        datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc),
+        datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc),
+    )
+    per_day = allocate(costs, usage, features, shared_values)
+    return {
+        'period': {'start': start.isoformat(), 'end': today.isoformat()},
+        'grouped_by': f'cost category {cost_category}' if cost_category else f'tag {tag_key}',
+        'features': feature_totals(per_day),
+        'unallocated': round(sum(entry['unallocated'] for entry in per_day), 2),
+        'days': per_day,
+    }
+
+
+def format_attribution(report):
+    lines = [f"=== COST BY FEATURE ({report['period']['start']} to {report['period']['end']}, "
+             f"by {report['grouped_by']}) ==="]
+    for feature, summary in report['features'].items():
+        growth = '' if summary['growth'] is None else f" ({summary['growth']:+.0%} week over week)"
+        lines.append(f"{feature}: ${summary['total']:.2f}, last 7 days ${summary['recent']:.2f}{growth}")
+    if report['unallocated']:
+        lines.append(f"Unallocated shared cost: ${report['unallocated']:.2f}")
+    return '\n'.join(lines) + '\n'
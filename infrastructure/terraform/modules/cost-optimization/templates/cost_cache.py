@@ -0,0 +1,120 @@
+"""
+Incremental daily cost cache for the cost optimizer.
+
+Cost Explorer answers are kept per dataset and per day, so each run only
+asks for the days it does not have yet. The last few days are always asked
+again, because Cost Explorer keeps revising them for up to three days. A day
+without data is stored as an empty list, so it is not asked for again.
+
+  s3://bucket/prefix/   one JSON object per dataset and day under
+                        dataset/dt=YYYY-MM-DD.json; rewriting a day replaces it
+  path/to/cache.db      a local SQLite file with the same rows, for running the
+                        optimizer off AWS (or in the Lambda's /tmp, which only
+                        lives as long as the container)
+"""
+
+import json
+import os
+import sqlite3
+from datetime import date, timedelta
+from urllib.parse import urlparse
+
+DEFAULT_SETTLE_DAYS = 3
+
+
+def days_between(start, end):
+    """ISO dates in [start, end)"""
+    day = date.fromisoformat(start)
+    last = date.fromisoformat(end)
+    days = []
+    while day < last:
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+class S3CostCache:
+    def __init__(self, bucket, prefix, s3_client):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix.strip('/') else ''
+        self.s3_client = s3_client
+
+    def _key(self, dataset, day):
+        return f'{self.prefix}{dataset}/dt={day}.json'
+
+    def days(self, dataset):
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        found = set()
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f'{self.prefix}{dataset}/dt='):
+            for item in page.get('Contents', []):
+                found.add(item['Key'].rsplit('dt=', 1)[1][:-len('.json')])
+        return found
+
+    def put(self, dataset, day, rows):
+        self.s3_client.put_object(Bucket=self.bucket, Key=self._key(dataset, day), ContentType='application/json',
+                                  Body=json.dumps(rows, sort_keys=True, default=str).encode())
+
+    def get(self, dataset, start, end):
+        """{day: rows} for the cached days in [start, end)"""
+        wanted = set(days_between(start, end)) & self.days(dataset)
+        return {day: json.loads(self.s3_client.get_object(Bucket=self.bucket, Key=self._key(dataset, day))['Body'].read())
+                for day in sorted(wanted)}
+
+
+class SqliteCostCache:
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute('CREATE TABLE IF NOT EXISTS daily '
+                           '(dataset TEXT, day TEXT, rows TEXT, PRIMARY KEY (dataset, day))')
+        return connection
+
+    def days(self, dataset):
+        with self._connect() as connection:
+            return {row[0] for row in connection.execute('SELECT day FROM daily WHERE dataset = ?', (dataset,))}
+
+    def put(self, dataset, day, rows):
+        with self._connect() as connection:
+            connection.execute('INSERT OR REPLACE INTO daily VALUES (?, ?, ?)',
+                               (dataset, day, json.dumps(rows, sort_keys=True, default=str)))
+
+    def get(self, dataset, start, end):
+        with self._connect() as connection:
+            rows = connection.execute('SELECT day, rows FROM daily WHERE dataset = ? AND day >= ? AND day < ? '
+                                      'ORDER BY day', (dataset, start, end)).fetchall()
+        return {day: json.loads(value) for day, value in rows}
+
+
+def open_cache(location, s3_client=None):
+    """s3://bucket/prefix/ or a local SQLite path"""
+    parsed = urlparse(location)
+    if parsed.scheme == 's3':
+        return S3CostCache(parsed.netloc, parsed.path, s3_client)
+    directory = os.path.dirname(os.path.abspath(location))
+    os.makedirs(directory, exist_ok=True)
+    return SqliteCostCache(location)
+
+
+def missing_days(cache, dataset, start, end, settle_days=DEFAULT_SETTLE_DAYS):
+    """Days in [start, end) that are not cached, plus the last settle_days, which may still change"""
+    days = days_between(start, end)
+    cached = cache.days(dataset)
+    unsettled = set(days[-settle_days:]) if settle_days else set()
+    return [day for day in days if day not in cached or day in unsettled]
+
+
+def refresh(cache, dataset, fetch, start, end, settle_days=DEFAULT_SETTLE_DAYS):
+    """
+    Bring a dataset up to date for [start, end) and return {day: rows}.
+
+    fetch(first day, day after the last) returns {day: rows} for the range; it
+    is called once, for the span of the missing days.
+    """
+    missing = missing_days(cache, dataset, start, end, settle_days)
+    if missing:
+        fetched = fetch(missing[0], (date.fromisoformat(missing[-1]) + timedelta(days=1)).isoformat())
+        for day in missing:
+            cache.put(dataset, day, fetched.get(day, []))
+    return cache.get(dataset, start, end)
@@ -1,22 +1,60 @@
-import json
-import boto3
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
+from commitments import format_commitments, track_commitments
+from cost_attribution import attribute_costs, format_attribution
+from cost_cache import open_cache
+from egress_costs import EGRESS_SERVICES, analyze_egress, format_egress
+from fast_check import fast_check, format_fast_check, parse_cost_event
+from s3_savings import merge_pricing, simulate_bucket
+from ops_runtime import (
+    aws_client,
+    env,
+    env_float,
+    env_int,
+    env_json,
+    env_list,
+    invocation_started,
+    publish,
+    require_env,
+    response,
+)
+
 def handler(event, context):
     """
     AWS Lambda function for cost optimization recommendations
     Analyzes usage patterns and sends recommendations via SNS
     """
 
-    ce_client = boto3.client('ce')  # Cost Explorer
-    sns_client = boto3.client('sns')
+    invocation_started()
+    require_env('SNS_TOPIC_ARN', 'ENVIRONMENT', 'COST_THRESHOLD')
+    ce_client = aws_client('ce')  # Cost Explorer
 
     sns_topic_arn = os.environ['SNS_TOPIC_ARN']
     environment = os.environ['ENVIRONMENT']
-    cost_threshold = float(os.environ['COST_THRESHOLD'])
+    cost_threshold = env_float('COST_THRESHOLD')
+
+    if event.get('action') == 'attribution':
+        return handle_attribution(event, ce_client, sns_topic_arn, environment)
+
+    if event.get('action') == 's3_lifecycle':
+        return handle_s3_lifecycle(event)
+
+    if event.get('action') == 'egress':
+        return handle_egress(event, ce_client, sns_topic_arn, environment)
+
+    if event.get('action') == 'commitments':
+        return handle_commitments(event, ce_client, sns_topic_arn, environment)
+
+    # Hourly schedule, or an AWS Budgets / Cost Anomaly Detection notification over SNS
+    if event.get('action') == 'fast_check' or event.get('Records'):
+        return handle_fast_check(event, ce_client, sns_topic_arn, environment, cost_threshold)
+
+    return run_full_analysis(ce_client, sns_topic_arn, environment, cost_threshold)
 
+def run_full_analysis(ce_client, sns_topic_arn, environment, cost_threshold):
+    """Analyze the last 30 days and send the cost optimization report"""
     try:
         # Get cost and usage for the last 30 days
         end_date = datetime.now().strftime('%Y-%m-%d')
@@ -40,6 +78,7 @@ def handler(event, context):
 
         recommendations = []
         total_cost = 0
+        egress_services_cost = 0
 
         # Analyze costs by service
         for result in cost_response['ResultsByTime']:
@@ -48,6 +87,9 @@ def handler(event, context):
                 cost = float(group['Metrics']['BlendedCost']['Amount'])
                 total_cost += cost
 
+                if service in EGRESS_SERVICES:
+                    egress_services_cost += cost
+
                 if cost > cost_threshold:
                     # Generate service-specific recommendations
                     if 'Amazon Elastic Compute Cloud' in service:
@@ -65,6 +107,13 @@ def handler(event, context):
                         if rec:
                             recommendations.append(rec)
 
+        egress = None
+        if egress_services_cost > cost_threshold:
+            egress = get_egress_analysis(ce_client)
+            rec = egress_recommendation(egress)
+            if rec:
+                recommendations.append(rec)
+
         # Get Reserved Instance recommendations
         ri_recommendations = get_ri_recommendations(ce_client)
         recommendations.extend(ri_recommendations)
@@ -73,47 +122,116 @@ def handler(event, context):
         rightsizing_recommendations = get_rightsizing_recommendations(ce_client)
         recommendations.extend(rightsizing_recommendations)
 
+        attribution = get_feature_attribution(ce_client)
+
+        commitments = get_commitment_tracking(ce_client)
+        if commitments and commitments['alerts']:
+            recommendations.extend(commitment_recommendations(commitments))
+
         # Send recommendations if any found
         if recommendations or total_cost > (cost_threshold * 5):
-            message = format_recommendations_message(recommendations, total_cost, environment)
+            message = format_recommendations_message(recommendations, total_cost, environment, attribution, egress,
+                                                     commitments)
 
-            sns_response = sns_client.publish(
-                TopicArn=sns_topic_arn,
-                Message=message,
-                Subject=f'Cost Optimization Report - {environment}'
-            )
+            message_id = publish(sns_topic_arn, message, f'Cost Optimization Report - {environment}')
 
-            return {
-                'statusCode': 200,
-                'body': json.dumps({
-                    'message': f'Cost optimization report sent. Total cost: ${total_cost:.2f}',
-                    'recommendations_count': len(recommendations),
-                    'sns_message_id': sns_response['MessageId']
-                })
-            }
-
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'message': f'No significant cost optimization opportunities found. Total cost: ${total_cost:.2f}',
-                'recommendations_count': 0
+            return response(200, {
+                'message': f'Cost optimization report sent. Total cost: ${total_cost:.2f}',
+                'recommendations_count': len(recommendations),
+                'sns_message_id': message_id
             })
-        }
+
+        return response(200, {
+            'message': f'No significant cost optimization opportunities found. Total cost: ${total_cost:.2f}',
+            'recommendations_count': 0
+        })
 
     except Exception as e:
         error_message = f'Error in cost optimization analysis: {str(e)}'
 
         # Send error notification
-        sns_client.publish(
-            TopicArn=sns_topic_arn,
-            Message=error_message,
-            Subject=f'Cost Optimization Error - {environment}'
+        publish(sns_topic_arn, error_message, f'Cost Optimization Error - {environment}')
+
+        return response(500, {'error': error_message})
+
+def get_feature_attribution(ce_client, days=None):
+    """Cost per platform feature per day, or None when no features are configured"""
+    features = env_list('COST_FEATURES')
+    if not features:
+        return None
+    try:
+        return attribute_costs(
+            ce_client,
+            aws_client('cloudwatch'),
+            features,
+            days=days or env_int('COST_ATTRIBUTION_DAYS', 14),
+            tag_key=env('COST_FEATURE_TAG_KEY', 'Feature'),
+            cost_category=env('COST_CATEGORY_NAME'),
+            shared_values=env_list('COST_SHARED_VALUES', ['shared']),
+            usage_metrics=env_json('COST_FEATURE_USAGE', {})
         )
+    except Exception as e:
+        print(f"Error attributing costs to features: {e}")
+        return None
+
+def handle_attribution(event, ce_client, sns_topic_arn, environment):
+    """Report cost per feature per day"""
+    if not env_list('COST_FEATURES'):
+        return response(400, {'error': 'COST_FEATURES not configured'})
 
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': error_message})
-        }
+    attribution = get_feature_attribution(ce_client, days=event.get('days'))
+    if attribution is None:
+        return response(500, {'error': 'Cost attribution failed'})
+
+    if event.get('notify'):
+        publish(sns_topic_arn, format_attribution(attribution), f'Cost by Feature - {environment}')
+    return response(200, attribution)
+
+def get_egress_analysis(ce_client, days=30):
+    """Egress spend with CloudFront cache and compression savings, or None on failure"""
+    try:
+        return analyze_egress(
+            ce_client,
+            aws_client('cloudwatch', 'us-east-1'),  # CloudFront metrics only exist in us-east-1
+            distributions=env_json('CDN_DISTRIBUTIONS', []),
+            s3_client=aws_client('s3'),
+            days=days,
+            target_hit_ratio=env_float('CDN_TARGET_HIT_RATIO', 0.95),
+            origin_cost=env_json('CDN_ORIGIN_COST', {}),
+            max_log_files=env_int('CDN_MAX_LOG_FILES', 200)
+        )
+    except Exception as e:
+        print(f"Error analyzing egress costs: {e}")
+        return None
+
+def egress_recommendation(egress):
+    """Recommendation for the report from an egress analysis with savings"""
+    if not egress or egress['potential_savings'] <= 0:
+        return None
+    savings = egress['savings']
+    actions = []
+    if savings['compression'] > 0:
+        actions.append('enable compression on text behaviors')
+    if savings['caching'] > 0:
+        actions.append('raise cache hit ratios')
+    if savings['cdn'] > 0:
+        actions.append('serve direct egress through CloudFront')
+    return {
+        'service': 'Data Transfer / CloudFront',
+        'recommendation': 'Reduce egress: ' + ', '.join(actions),
+        'current_cost': egress['spend']['total'],
+        'potential_savings': egress['potential_savings']
+    }
+
+def handle_egress(event, ce_client, sns_topic_arn, environment):
+    """Report egress spend by usage type and region with per distribution and path pattern savings"""
+    egress = get_egress_analysis(ce_client, days=event.get('days', 30))
+    if egress is None:
+        return response(500, {'error': 'Egress analysis failed'})
+
+    if event.get('notify'):
+        publish(sns_topic_arn, format_egress(egress), f'Data Transfer Costs - {environment}')
+    return response(200, egress)
 
 def analyze_ec2_costs(ce_client, start_date, end_date):
     """Analyze EC2 costs and provide recommendations"""
@@ -207,6 +325,41 @@ def analyze_rds_costs(ce_client, start_date, end_date):
 
     return None
 
+def simulate_s3_lifecycle(buckets=None):
+    """Lifecycle simulation per bucket from its S3 Inventory, or None when no inventories are configured"""
+    inventories = env_json('S3_INVENTORY_LOCATIONS', {})
+    if buckets:
+        inventories = {bucket: location for bucket, location in inventories.items() if bucket in buckets}
+    if not inventories:
+        return None
+
+    s3_client = aws_client('s3')
+    pricing = merge_pricing(env_json('S3_PRICING', {}))
+    groups = env_json('S3_LIFECYCLE_GROUPS', {})
+    results = {}
+    for bucket, location in inventories.items():
+        try:
+            results[bucket] = simulate_bucket(
+                location,
+                storage_lens_location=env('S3_STORAGE_LENS_LOCATION'),
+                bucket=bucket,
+                groups=groups.get(bucket),
+                s3_client=s3_client,
+                pricing=pricing,
+                half_life_days=env_float('S3_ACCESS_HALF_LIFE_DAYS', 90)
+            )
+        except Exception as e:
+            print(f"Error simulating lifecycle policies for {bucket}: {e}")
+            results[bucket] = {'error': str(e)}
+    return results
+
+def handle_s3_lifecycle(event):
+    """Full lifecycle simulation, with the lifecycle configuration to apply per bucket"""
+    results = simulate_s3_lifecycle(event.get('buckets'))
+    if results is None:
+        return response(400, {'error': 'S3_INVENTORY_LOCATIONS not configured'})
+    return response(200, results)
+
 def analyze_s3_costs(ce_client, start_date, end_date):
     """Analyze S3 costs and provide recommendations"""
     try:
@@ -245,17 +398,125 @@ def analyze_s3_costs(ce_client, start_date, end_date):
 
         if storage_costs:
             total_storage_cost = sum([item['cost'] for item in storage_costs])
+            simulation = simulate_s3_lifecycle()
+            if not simulation:
+                # Without inventory data there is nothing to base a savings figure on
+                return {
+                    'service': 'S3',
+                    'recommendation': 'Enable S3 Inventory on the publishing buckets to simulate lifecycle policies',
+                    'current_cost': total_storage_cost
+                }
+
+            simulated = {bucket: result for bucket, result in simulation.items() if 'error' not in result}
+            policies = [f"{bucket}/{group}: {result['policy']}"
+                        for bucket, bucket_result in simulated.items()
+                        for group, result in bucket_result['groups'].items()
+                        if result['monthly_savings'] > 0]
+            unscoped = [f"{bucket} (${result['potential_monthly_savings']:.2f}/month)"
+                        for bucket, bucket_result in simulated.items()
+                        for result in bucket_result['groups'].values() if result.get('skipped')]
+            recommendation = (('Apply lifecycle policies: ' + ', '.join(policies)) if policies
+                              else 'Current storage classes are already the cheapest simulated option')
+            if unscoped:
+                recommendation += '; move root-level keys under a prefix to also cover ' + ', '.join(unscoped)
             return {
                 'service': 'S3',
-                'recommendation': 'Implement Intelligent Tiering and lifecycle policies for infrequently accessed data',
+                'recommendation': recommendation,
                 'current_cost': total_storage_cost,
-                'potential_savings': total_storage_cost * 0.2  # Estimated 20% savings
+                'potential_savings': sum(result['monthly_savings'] for result in simulated.values()),
+                'transition_cost': sum(result['transition_cost'] for result in simulated.values()),
+                'lifecycle_configurations': {bucket: result['lifecycle_configuration']
+                                             for bucket, result in simulated.items()}
             }
     except Exception as e:
         print(f"Error analyzing S3 costs: {e}")
 
     return None
 
+def open_cost_cache():
+    """Incremental daily cost cache at COST_CACHE_LOCATION (S3 when deployed)"""
+    location = env('COST_CACHE_LOCATION')
+    if not location:
+        # /tmp is lost whenever the container is recycled, so nothing stays incremental
+        print("COST_CACHE_LOCATION not set; caching in /tmp for this container only")
+        location = '/tmp/cost-cache.db'
+    return open_cache(location, aws_client('s3'))
+
+def handle_fast_check(event, ce_client, sns_topic_arn, environment, cost_threshold):
+    """Check the latest cost data; alert and run the full analysis only when something new looks wrong"""
+    events = [parse_cost_event(record) for record in event.get('Records', [])
+              if record.get('EventSource') == 'aws:sns']
+    try:
+        # Sent alerts are remembered in the cache; in /tmp each new container would repeat them
+        if not env('COST_CACHE_LOCATION', '').startswith('s3://'):
+            raise ValueError('the fast check needs an s3:// COST_CACHE_LOCATION to remember sent alerts')
+        result = fast_check(
+            open_cost_cache(),
+            ce_client,
+            datetime.now(timezone.utc).date(),
+            baseline_days=env_int('FAST_CHECK_BASELINE_DAYS', 14),
+            anomaly_ratio=env_float('FAST_CHECK_ANOMALY_RATIO', 0.5),
+            min_delta=env_float('FAST_CHECK_MIN_DELTA', 50),
+            daily_threshold=env_float('FAST_CHECK_DAILY_THRESHOLD', 0)
+        )
+    except Exception as e:
+        print(f"Error in fast cost check: {e}")
+        if not events:
+            return response(500, {'error': f'Fast cost check failed: {str(e)}'})
+        result = {'checked': ['n/a', 'n/a'], 'yesterday_total': 0.0, 'today_total': 0.0, 'alerts': [], 'new': []}
+
+    # A Budgets or anomaly notification is reason enough for the full analysis
+    if not result['new'] and not events:
+        return response(200, result)
+
+    publish(sns_topic_arn, format_fast_check(result, events), f'Cost Alert - {environment}')
+    full = run_full_analysis(ce_client, sns_topic_arn, environment, cost_threshold)
+    return response(200, dict(result, events=events, full_analysis_status=full['statusCode']))
+
+def get_commitment_tracking(ce_client):
+    """Rolling Reserved Instance and Savings Plans utilization and coverage, or None on failure"""
+    try:
+        return track_commitments(
+            open_cost_cache(),
+            ce_client,
+            datetime.now(timezone.utc).date(),
+            days=env_int('COMMITMENT_LONG_WINDOW', 28) + 7,
+            services=env_list('COMMITMENT_SERVICES', ['Amazon Elastic Compute Cloud - Compute',
+                                                      'Amazon Relational Database Service']),
+            utilization_target=env_float('COMMITMENT_UTILIZATION_TARGET', 0.9),
+            short_window=env_int('COMMITMENT_SHORT_WINDOW', 3),
+            long_window=env_int('COMMITMENT_LONG_WINDOW', 28)
+        )
+    except Exception as e:
+        print(f"Error tracking commitments: {e}")
+        return None
+
+def commitment_recommendations(commitments):
+    """One recommendation per commitment alert"""
+    recommendations = []
+    for alert in commitments['alerts']:
+        if alert['kind'] == 'under_utilized':
+            recommendations.append({
+                'service': 'Reserved Instances / Savings Plans',
+                'recommendation': f"Move load back onto or exchange the commitment: {alert['message']}"
+            })
+        else:
+            recommendations.append({
+                'service': 'Reserved Instances / Savings Plans',
+                'recommendation': f"Review coverage: {alert['message']}"
+            })
+    return recommendations
+
+def handle_commitments(event, ce_client, sns_topic_arn, environment):
+    """Report commitment utilization, coverage and on-demand spill per instance family"""
+    commitments = get_commitment_tracking(ce_client)
+    if commitments is None:
+        return response(500, {'error': 'Commitment tracking failed'})
+
+    if event.get('notify') or (event.get('notify_on_alert') and commitments['alerts']):
+        publish(sns_topic_arn, format_commitments(commitments), f'Commitment Use - {environment}')
+    return response(200, commitments)
+
 def get_ri_recommendations(ce_client):
     """Get Reserved Instance purchase recommendations"""
     try:
@@ -305,7 +566,8 @@ def get_rightsizing_recommendations(ce_client):
         print(f"Error getting rightsizing recommendations: {e}")
         return []
 
-def format_recommendations_message(recommendations, total_cost, environment):
+def format_recommendations_message(recommendations, total_cost, environment, attribution=None, egress=None,
+                                   commitments=None):
     """Format the recommendations into a readable message"""
     message = f"""
 1001 Stories Cost Optimization Report
@@ -342,6 +604,9 @@ Annual Projection: ${total_cost * 12:.2f}
             if 'current_cost' in rec:
                 message += f"   Current Monthly Cost: ${rec['current_cost']:.2f}\n"
 
+            if 'transition_cost' in rec:
+                message += f"   One-time Transition Cost: ${rec['transition_cost']:.2f}\n"
+
             if 'payback_months' in rec:
                 message += f"   Payback Period: {rec['payback_months']:.1f} months\n"
 
@@ -352,6 +617,15 @@ Annual Projection: ${total_cost * 12:.2f}
         savings_percentage = (total_potential_savings / total_cost) * 100 if total_cost > 0 else 0
         message += f"Savings Percentage: {savings_percentage:.1f}%\n"
 
+    if attribution:
+        message += "\n" + format_attribution(attribution)
+
+    if egress:
+        message += "\n" + format_egress(egress)
+
+    if commitments:
+        message += "\n" + format_commitments(commitments)
+
     message += f"\n=== NEXT STEPS ===\n"
     message += "1. Review recommendations in AWS Cost Explorer\n"
     message += "2. Implement Reserved Instances for consistent workloads\n"
@@ -0,0 +1,428 @@
+"""
+Data transfer and CDN cost analysis for the cost optimizer.
+
+Egress spend comes from one paginated Cost Explorer query, grouped by
+service and usage type. Each usage type is classified and given an edge or
+AWS region, where the usage type carries one ('US-', 'EU-', 'USE1-',
+'APN2-', ...):
+
+  cdn_to_viewer   CloudFront DataTransfer-Out-Bytes, what book PDFs and
+                  images cost to deliver
+  cdn_to_origin   CloudFront DataTransfer-Out-OBytes (uploads, POSTs)
+  cdn_requests    CloudFront request fees
+  internet        DataTransfer-Out-Bytes that bypasses CloudFront
+  inter_region    traffic between AWS regions (replication, DR)
+  inter_az        DataTransfer-Regional-Bytes
+  nat             NAT gateway data processing
+
+Per distribution, Requests, BytesDownloaded and CacheHitRate (the latter
+needs the distribution's additional metrics) are fetched in one batched
+GetMetricData call. An optional origin metric can be added to the same
+batch, for example the S3 request metric BytesDownloaded of the origin
+bucket. CloudFront metrics only exist in us-east-1, so the origin metric
+has to live there too.
+
+CloudWatch has no breakdown by path, so per path pattern figures come from
+the distribution's standard access logs. Every log file of the period is
+listed, and an evenly spaced sample of them is read and scaled to the
+whole period. For each path pattern the sample gives requests, bytes
+served, bytes fetched from the origin (misses) and compressible bytes
+served by behaviors that do not compress.
+
+Savings estimates:
+  caching      origin fetches removed by raising the hit ratio of a
+               pattern to the target, priced at the origin's per GB and
+               per request cost. Transfer from AWS origins to CloudFront is
+               free, so this is mostly origin request fees and is often
+               small; the hit ratio matters more for latency.
+  compression  compressible bytes of uncompressed behaviors times the share
+               compression removes, at the distribution's effective
+               CloudFront $/GB
+  cdn          internet egress that bypasses CloudFront, priced at the
+               difference between the direct and the CloudFront $/GB
+"""
+
+import gzip
+import io
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from fnmatch import fnmatchcase
+from urllib.parse import urlparse
+
+GB = 1024 ** 3
+COST_METRIC = 'UnblendedCost'
+USAGE_METRIC = 'UsageQuantity'
+DEFAULT_TARGET_HIT_RATIO = 0.95
+DEFAULT_MAX_LOG_FILES = 200
+
+# Origin cost of a cache miss: S3 GET pricing, no charge for S3/ALB -> CloudFront transfer
+DEFAULT_ORIGIN_COST = {'per_gb': 0.0, 'per_1000_requests': 0.0004}
+
+# Share of the bytes gzip/brotli removes, by content type prefix
+COMPRESSION_SAVINGS = {
+    'text/': 0.7,
+    'application/json': 0.75,
+    'application/javascript': 0.7,
+    'application/xml': 0.7,
+    'image/svg+xml': 0.6,
+}
+# CloudFront only compresses objects between 1,000 and 10,000,000 bytes
+COMPRESSIBLE_SIZE = (1000, 10_000_000)
+
+EGRESS_SERVICES = ['Amazon CloudFront', 'AWS Data Transfer', 'Amazon Simple Storage Service',
+                   'Amazon Elastic Compute Cloud - Compute', 'EC2 - Other', 'Amazon Elastic Load Balancing']
+
+ORIGIN_FETCH_RESULTS = ('Miss', 'RefreshHit')
+DEFAULT_PATTERN = 'Default (*)'
+
+_REGION_PREFIX = re.compile(r'^([A-Z]{2,3}\d?)-')
+_INTER_REGION = re.compile(r'^[A-Z]{2,4}\d-[A-Z]{2,4}\d-AWS-(In|Out)-Bytes$')
+
+
+def classify(service, usage_type):
+    """Egress category of a usage type, or None for usage that is not data transfer"""
+    if service == 'Amazon CloudFront':
+        if 'DataTransfer-Out-OBytes' in usage_type:
+            return 'cdn_to_origin'
+        if 'DataTransfer-Out-Bytes' in usage_type:
+            return 'cdn_to_viewer'
+        if 'Requests-' in usage_type:
+            return 'cdn_requests'
+        return None
+    if 'NatGateway-Bytes' in usage_type:
+        return 'nat'
+    if 'DataTransfer-Regional-Bytes' in usage_type:
+        return 'inter_az'
+    if _INTER_REGION.match(usage_type):
+        return 'inter_region'
+    if 'DataTransfer-Out-Bytes' in usage_type:
+        return 'internet'
+    return None
+
+
+def usage_region(usage_type):
+    """'EU-DataTransfer-Out-Bytes' -> 'EU', 'USE1-DataTransfer-Out-Bytes' -> 'USE1'; us-east-1 has no prefix"""
+    match = _REGION_PREFIX.match(usage_type)
+    return match.group(1) if match else 'USE1'
+
+
+def egress_spend(ce_client, start_date, end_date):
+    """Data transfer line items in [start_date, end_date): category, region, usage type, cost and GB"""
+    items = defaultdict(lambda: {'cost': 0.0, 'quantity': 0.0})
+    request = {
+        'TimePeriod': {'Start': start_date, 'End': end_date},
+        'Granularity': 'MONTHLY',
+        'Metrics': [COST_METRIC, USAGE_METRIC],
+        'GroupBy': [{'Type': 'DIMENSION', 'Key': 'SERVICE'}, {'Type': 'DIMENSION', 'Key': 'USAGE_TYPE'}],
+        'Filter': {'Dimensions': {'Key': 'SERVICE', 'Values': EGRESS_SERVICES}},
+    }
+    while True:
+        result = ce_client.get_cost_and_usage(**request)
+        for period in result['ResultsByTime']:
+            for group in period.get('Groups', []):
+                service, usage_type = group['Keys']
+                category = classify(service, usage_type)
+                if category is None:
+                    continue
+                item = items[(category, usage_region(usage_type), usage_type)]
+                item['cost'] += float(group['Metrics'][COST_METRIC]['Amount'])
+                item['quantity'] += float(group['Metrics'][USAGE_METRIC]['Amount'])
+        if not result.get('NextPageToken'):
+            break
+        request['NextPageToken'] = result['NextPageToken']
+
+    return [{'category': category, 'region': region, 'usage_type': usage_type,
+             'cost': round(item['cost'], 2), 'quantity': round(item['quantity'], 2)}
+            for (category, region, usage_type), item in sorted(items.items(), key=lambda entry: -entry[1]['cost'])]
+
+
+def summarize_spend(items):
+    """Cost per category and per region, and the effective $/GB of CloudFront and of direct egress"""
+    by_category = defaultdict(float)
+    by_region = defaultdict(float)
+    gb = defaultdict(float)
+    for item in items:
+        by_category[item['category']] += item['cost']
+        if item['category'] != 'cdn_requests':
+            by_region[item['region']] += item['cost']
+            # Data transfer usage types are metered in GB
+            gb[item['category']] += item['quantity']
+
+    def rate(category):
+        return by_category[category] / gb[category] if gb[category] > 0 else None
+
+    return {
+        'total': round(sum(by_category.values()), 2),
+        'by_category': {key: round(value, 2) for key, value in sorted(by_category.items(), key=lambda e: -e[1])},
+        'by_region': {key: round(value, 2) for key, value in sorted(by_region.items(), key=lambda e: -e[1])},
+        'gb': {key: round(value, 1) for key, value in gb.items()},
+        'cdn_per_gb': rate('cdn_to_viewer'),
+        'internet_per_gb': rate('internet'),
+    }
+
+
+def distribution_metrics(cloudwatch_client, distributions, start, end):
+    """
+    {distribution id: {'requests', 'bytes_downloaded', 'cache_hit_rate', 'origin_bytes'}} over the period.
+
+    One GetMetricData call (paginated) for every distribution; the client has to be
+    in us-east-1. A distribution's 'origin_metric' ({namespace, metric, dimensions,
+    stat}) is added to the batch as its bytes from origin.
+    """
+    # One period for the whole range; beyond 15 days CloudWatch wants whole hours
+    period = max(3600, int((end - start).total_seconds()) // 3600 * 3600)
+    queries = []
+    ids = {}
+
+    def add(distribution_id, field, namespace, metric, dimensions, stat):
+        query_id = f'q{len(queries)}'
+        ids[query_id] = (distribution_id, field)
+        queries.append({
+            'Id': query_id,
+            'MetricStat': {
+                'Metric': {'Namespace': namespace, 'MetricName': metric,
+                           'Dimensions': [{'Name': name, 'Value': value} for name, value in dimensions.items()]},
+                'Period': period,
+                'Stat': stat,
+            },
+        })
+
+    for distribution in distributions:
+        distribution_id = distribution['id']
+        dimensions = {'DistributionId': distribution_id, 'Region': 'Global'}
+        add(distribution_id, 'requests', 'AWS/CloudFront', 'Requests', dimensions, 'Sum')
+        add(distribution_id, 'bytes_downloaded', 'AWS/CloudFront', 'BytesDownloaded', dimensions, 'Sum')
+        add(distribution_id, 'cache_hit_rate', 'AWS/CloudFront', 'CacheHitRate', dimensions, 'Average')
+        origin = distribution.get('origin_metric')
+        if origin:
+            add(distribution_id, 'origin_bytes', origin['namespace'], origin['metric'],
+                origin.get('dimensions', {}), origin.get('stat', 'Sum'))
+
+    metrics = {distribution['id']: {'requests': None, 'bytes_downloaded': None, 'cache_hit_rate': None,
+                                    'origin_bytes': None} for distribution in distributions}
+    if not queries:
+        return metrics
+
+    request = {'MetricDataQueries': queries, 'StartTime': start, 'EndTime': end}
+    while True:
+        result = cloudwatch_client.get_metric_data(**request)
+        for series in result['MetricDataResults']:
+            if not series['Values']:
+                continue
+            distribution_id, field = ids[series['Id']]
+            # One period covers the whole range; a partial first period can add a second value
+            if field == 'cache_hit_rate':
+                metrics[distribution_id][field] = sum(series['Values']) / len(series['Values'])
+            else:
+                metrics[distribution_id][field] = sum(series['Values'])
+        if not result.get('NextToken'):
+            return metrics
+        request['NextToken'] = result['NextToken']
+
+
+def pattern_of(path, patterns):
+    """First cache behavior path pattern that matches, as CloudFront evaluates them"""
+    for pattern in patterns:
+        if fnmatchcase(path, pattern):
+            return pattern
+    return DEFAULT_PATTERN
+
+
+def compression_saving(content_type):
+    content_type = (content_type or '').split(';', 1)[0].strip().lower()
+    for prefix, saving in COMPRESSION_SAVINGS.items():
+        if content_type.startswith(prefix):
+            return saving
+    return 0.0
+
+
+class PathStats:
+    """Per path pattern request, byte and origin fetch counts from access log lines"""
+
+    def __init__(self, patterns, uncompressed_patterns=()):
+        self.patterns = list(patterns)
+        self.uncompressed = set(uncompressed_patterns)
+        self.stats = defaultdict(lambda: {'requests': 0, 'bytes': 0, 'origin_requests': 0, 'origin_bytes': 0,
+                                          'compressible_bytes': 0.0})
+        self.lines = 0
+
+    def add_log(self, lines):
+        """Fold one standard (tab separated, W3C) CloudFront log file into the stats"""
+        fields = None
+        for line in lines:
+            if line.startswith('#Fields:'):
+                names = line[len('#Fields:'):].split()
+                fields = {name: index for index, name in enumerate(names)}
+                continue
+            if not line or line.startswith('#') or fields is None:
+                continue
+            row = line.rstrip('\n').split('\t')
+            self.lines += 1
+            pattern = pattern_of(row[fields['cs-uri-stem']], self.patterns)
+            sent = int(row[fields['sc-bytes']]) if row[fields['sc-bytes']].isdigit() else 0
+            entry = self.stats[pattern]
+            entry['requests'] += 1
+            entry['bytes'] += sent
+            if row[fields['x-edge-result-type']] in ORIGIN_FETCH_RESULTS:
+                entry['origin_requests'] += 1
+                entry['origin_bytes'] += sent
+            if pattern in self.uncompressed and 'sc-content-type' in fields:
+                if COMPRESSIBLE_SIZE[0] <= sent <= COMPRESSIBLE_SIZE[1]:
+                    entry['compressible_bytes'] += sent * compression_saving(row[fields['sc-content-type']])
+
+    def scaled(self, factor):
+        return {pattern: {key: value * factor for key, value in entry.items()}
+                for pattern, entry in self.stats.items()}
+
+
+def _log_keys(s3_client, bucket, prefix, distribution_id, start, end):
+    """Keys of the distribution's log files for hours in [start, end); names are DISTID.YYYY-MM-DD-HH.*.gz"""
+    first = f'{prefix}{distribution_id}.{start:%Y-%m-%d-%H}'
+    last = f'{prefix}{distribution_id}.{end:%Y-%m-%d-%H}'
+    paginator = s3_client.get_paginator('list_objects_v2')
+    keys = []
+    for page in paginator.paginate(Bucket=bucket, Prefix=f'{prefix}{distribution_id}.', StartAfter=first):
+        for item in page.get('Contents', []):
+            if item['Key'] >= last:
+                return keys
+            if item['Key'] >= first:
+                keys.append(item['Key'])
+    return keys
+
+
+def _sample(keys, max_files):
+    if len(keys) <= max_files:
+        return keys
+    step = len(keys) / max_files
+    return [keys[int(index * step)] for index in range(max_files)]
+
+
+def path_stats(log_location, distribution, start, end, s3_client, max_files=DEFAULT_MAX_LOG_FILES):
+    """Per path pattern stats for the period, scaled up from an evenly spaced sample of log files"""
+    parsed = urlparse(log_location)
+    bucket, prefix = parsed.netloc, parsed.path.lstrip('/')
+    stats = PathStats(distribution.get('path_patterns', []), distribution.get('uncompressed_patterns', []))
+    keys = _log_keys(s3_client, bucket, prefix, distribution['id'], start, end)
+    sample = _sample(keys, max_files)
+    for key in sample:
+        body = s3_client.get_object(Bucket=bucket, Key=key)['Body']
+        with gzip.GzipFile(fileobj=body) as raw:
+            stats.add_log(io.TextIOWrapper(raw, encoding='utf-8', errors='replace'))
+    factor = len(keys) / len(sample) if sample else 0.0
+    return {'log_files': len(keys), 'sampled_files': len(sample), 'sampled_lines': stats.lines,
+            'patterns': stats.scaled(factor)}
+
+
+def pattern_savings(entry, target_hit_ratio, origin_cost, cdn_per_gb):
+    """Savings over the analysed period for one path pattern, from caching and from compression"""
+    requests = entry['requests']
+    hit_ratio = 1 - entry['origin_requests'] / requests if requests else None
+    removable = max(0.0, entry['origin_requests'] - requests * (1 - target_hit_ratio))
+    bytes_per_fetch = entry['origin_bytes'] / entry['origin_requests'] if entry['origin_requests'] else 0.0
+    caching = (removable * bytes_per_fetch / GB * origin_cost['per_gb']
+               + removable / 1000 * origin_cost['per_1000_requests'])
+    compression = entry['compressible_bytes'] / GB * (cdn_per_gb or 0.0)
+    return {
+        'requests': int(requests),
+        'gb_served': round(entry['bytes'] / GB, 2),
+        'gb_from_origin': round(entry['origin_bytes'] / GB, 2),
+        'hit_ratio': round(hit_ratio, 4) if hit_ratio is not None else None,
+        'caching_savings': round(caching, 2),
+        'compression_savings': round(compression, 2),
+    }
+
+
+def analyze_egress(ce_client, cloudwatch_client, distributions=None, s3_client=None, days=30,
+                   target_hit_ratio=DEFAULT_TARGET_HIT_RATIO, origin_cost=None,
+                   max_log_files=DEFAULT_MAX_LOG_FILES, today=None):
+    """
+    Egress spend by category and region over the last days complete days, per
+    distribution cache metrics and per path pattern savings estimates.
+
+    distributions: [{'id', 'path_patterns', 'uncompressed_patterns', 'log_location',
+    'origin_metric', 'origin_cost'}]; every key but 'id' is optional.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    start_day = today - timedelta(days=days)
+    start = datetime.combine(start_day, datetime.min.time(), tzinfo=timezone.utc)
+    end = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
+    distributions = distributions or []
+    origin_cost = {**DEFAULT_ORIGIN_COST, **(origin_cost or {})}
+
+    items = egress_spend(ce_client, start_day.isoformat(), today.isoformat())
+    spend = summarize_spend(items)
+    metrics = distribution_metrics(cloudwatch_client, distributions, start, end) if distributions else {}
+    downloaded = sum(metric['bytes_downloaded'] or 0 for metric in metrics.values())
+
+    report = {
+        'period': {'start': start_day.isoformat(), 'end': today.isoformat()},
+        'spend': spend,
+        'top_usage_types': items[:10],
+        'distributions': {},
+        'findings': [],
+    }
+    savings = {'caching': 0.0, 'compression': 0.0, 'cdn': 0.0}
+
+    for distribution in distributions:
+        distribution_id = distribution['id']
+        metric = metrics.get(distribution_id, {})
+        share = (metric.get('bytes_downloaded') or 0) / downloaded if downloaded else None
+        result = {
+            **metric,
+            'cdn_cost': round(spend['by_category'].get('cdn_to_viewer', 0.0) * share, 2) if share is not None else None,
+        }
+        if result['origin_bytes'] is None and metric.get('bytes_downloaded') and metric.get('cache_hit_rate') is not None:
+            # Estimated from the request hit rate when no origin metric is configured
+            result['origin_bytes_estimated'] = metric['bytes_downloaded'] * (1 - metric['cache_hit_rate'] / 100)
+
+        if distribution.get('log_location') and s3_client is not None:
+            try:
+                paths = path_stats(distribution['log_location'], distribution, start, end, s3_client, max_log_files)
+                pattern_origin_cost = {**origin_cost, **distribution.get('origin_cost', {})}
+                result['log_files'] = paths['log_files']
+                result['sampled_files'] = paths['sampled_files']
+                result['patterns'] = {
+                    pattern: pattern_savings(entry, target_hit_ratio, pattern_origin_cost, spend['cdn_per_gb'])
+                    for pattern, entry in sorted(paths['patterns'].items(), key=lambda e: -e[1]['bytes'])
+                }
+                for pattern, estimate in result['patterns'].items():
+                    savings['caching'] += estimate['caching_savings']
+                    savings['compression'] += estimate['compression_savings']
+                    if estimate['hit_ratio'] is not None and estimate['hit_ratio'] < target_hit_ratio and estimate['gb_served'] > 1:
+                        report['findings'].append(
+                            f"{distribution_id} {pattern}: hit ratio {estimate['hit_ratio']:.0%} "
+                            f"({estimate['gb_from_origin']:.0f} GB from origin)")
+                    if estimate['compression_savings'] > 0:
+                        report['findings'].append(
+                            f"{distribution_id} {pattern}: enable compression, "
+                            f"~${estimate['compression_savings']:.2f} per period")
+            except Exception as e:
+                result['log_error'] = str(e)
+        report['distributions'][distribution_id] = result
+
+    internet_gb = spend['gb'].get('internet', 0.0)
+    if spend['internet_per_gb'] and spend['cdn_per_gb'] and spend['internet_per_gb'] > spend['cdn_per_gb']:
+        savings['cdn'] = internet_gb * (spend['internet_per_gb'] - spend['cdn_per_gb'])
+        report['findings'].append(
+            f"{internet_gb:.0f} GB served directly to the internet at ${spend['internet_per_gb']:.3f}/GB "
+            f"vs ${spend['cdn_per_gb']:.3f}/GB through CloudFront")
+
+    report['savings'] = {key: round(value, 2) for key, value in savings.items()}
+    report['potential_savings'] = round(sum(savings.values()), 2)
+    return report
+
+
+def format_egress(report):
+    spend = report['spend']
+    lines = [f"=== DATA TRANSFER AND CDN ({report['period']['start']} to {report['period']['end']}) ===",
+             f"Egress spend: ${spend['total']:.2f}"]
+    for category, cost in spend['by_category'].items():
+        lines.append(f"  {category}: ${cost:.2f}")
+    for distribution_id, result in report['distributions'].items():
+        hit_rate = result.get('cache_hit_rate')
+        lines.append(f"{distribution_id}: cache hit rate "
+                     f"{'n/a' if hit_rate is None else f'{hit_rate:.1f}%'}"
+                     + (f", ~${result['cdn_cost']:.2f} delivery" if result.get('cdn_cost') is not None else ''))
+    lines.extend(f"- {finding}" for finding in report['findings'])
+    return '\n'.join(lines) + '\n'
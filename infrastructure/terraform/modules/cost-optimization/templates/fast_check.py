@@ -0,0 +1,152 @@
+"""
+Fast cost check for the cost optimizer.
+
+Runs hourly and on AWS Budgets and Cost Anomaly Detection notifications,
+between the weekly full analyses. Daily cost per service lives in the
+incremental cost cache (cost_cache.py), so a run asks Cost Explorer for
+the days that can still change (normally yesterday and today) and reads
+the baseline from the cache. Cold starts backfill the baseline once.
+
+For yesterday and for today so far, each service is compared with the
+median of its previous baseline days. A service is anomalous when it costs
+more than the median by both a ratio and an absolute amount. Today is
+partial, so comparing it unscaled errs on the side of silence. A day
+whose total exceeds the daily threshold is flagged too. Alerts already sent
+are remembered in the cache, so an hourly schedule does not repeat them;
+that needs the S3 cache, since a new Lambda container starts with an empty
+/tmp.
+"""
+
+import json
+from datetime import timedelta
+
+from cost_cache import days_between, refresh
+
+DEFAULT_BASELINE_DAYS = 14
+DEFAULT_ANOMALY_RATIO = 0.5
+DEFAULT_MIN_DELTA = 50.0
+COST_METRIC = 'UnblendedCost'
+ALERTS_DATASET = 'fast_check_alerts'
+
+
+def fetch_service_costs(ce_client, start, end):
+    """{day: [{service, cost}]} for [start, end), one paginated DAILY query"""
+    result = {}
+    request = {
+        'TimePeriod': {'Start': start, 'End': end},
+        'Granularity': 'DAILY',
+        'Metrics': [COST_METRIC],
+        'GroupBy': [{'Type': 'DIMENSION', 'Key': 'SERVICE'}],
+    }
+    while True:
+        page = ce_client.get_cost_and_usage(**request)
+        for period in page['ResultsByTime']:
+            rows = result.setdefault(period['TimePeriod']['Start'], [])
+            for group in period.get('Groups', []):
+                rows.append({'service': group['Keys'][0],
+                             'cost': float(group['Metrics'][COST_METRIC]['Amount'])})
+        if not page.get('NextPageToken'):
+            return result
+        request['NextPageToken'] = page['NextPageToken']
+
+
+def _median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if not ordered:
+        return 0.0
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def check_day(day, costs, history, anomaly_ratio=DEFAULT_ANOMALY_RATIO, min_delta=DEFAULT_MIN_DELTA,
+              daily_threshold=None, partial=False):
+    """
+    Alerts for one day.
+
+    costs is {service: cost} for the day, history a list of {service: cost}
+    for the baseline days; services missing on a baseline day count as 0.
+    """
+    alerts = []
+    for service, cost in costs.items():
+        baseline = _median([day_costs.get(service, 0.0) for day_costs in history])
+        if cost - baseline >= min_delta and cost > baseline * (1 + anomaly_ratio):
+            alerts.append({
+                'key': f'{day}:{service}:anomaly', 'day': day, 'service': service, 'kind': 'anomaly',
+                'cost': round(cost, 2), 'baseline': round(baseline, 2),
+                'message': f"{service} ${cost:.2f} on {day}{' so far' if partial else ''}, "
+                           f"median ${baseline:.2f}/day over {len(history)} days",
+            })
+    total = sum(costs.values())
+    if daily_threshold and total > daily_threshold:
+        alerts.append({
+            'key': f'{day}:total:threshold', 'day': day, 'service': 'total', 'kind': 'threshold',
+            'cost': round(total, 2), 'baseline': daily_threshold,
+            'message': f"Total ${total:.2f} on {day}{' so far' if partial else ''} exceeds ${daily_threshold:.2f}/day",
+        })
+    return alerts
+
+
+def fast_check(cache, ce_client, today, baseline_days=DEFAULT_BASELINE_DAYS, anomaly_ratio=DEFAULT_ANOMALY_RATIO,
+               min_delta=DEFAULT_MIN_DELTA, daily_threshold=None):
+    """
+    Check yesterday and today against the cached baseline.
+
+    Returns all alerts and the ones not sent before ('new'); the new ones
+    are recorded in the cache as sent.
+    """
+    start = (today - timedelta(days=baseline_days + 1)).isoformat()
+    end = (today + timedelta(days=1)).isoformat()
+    # Cost Explorer keeps revising yesterday and today; older days come from the cache
+    cached = refresh(cache, 'daily_service', lambda first, last: fetch_service_costs(ce_client, first, last),
+                     start, end, settle_days=2)
+    days = days_between(start, end)
+    by_day = {day: {row['service']: row['cost'] for row in cached.get(day, [])} for day in days}
+    history = [by_day[day] for day in days[:-2]]
+
+    alerts = []
+    for day, partial in ((days[-2], False), (days[-1], True)):
+        alerts.extend(check_day(day, by_day[day], history, anomaly_ratio, min_delta, daily_threshold, partial))
+
+    sent_by_day = cache.get(ALERTS_DATASET, days[-2], end)
+    sent = {key for rows in sent_by_day.values() for key in rows}
+    new = [alert for alert in alerts if alert['key'] not in sent]
+    if new:
+        cache.put(ALERTS_DATASET, today.isoformat(),
+                  sorted(set(sent_by_day.get(today.isoformat(), [])) | {alert['key'] for alert in new}))
+    return {
+        'checked': [days[-2], days[-1]],
+        'yesterday_total': round(sum(by_day[days[-2]].values()), 2),
+        'today_total': round(sum(by_day[days[-1]].values()), 2),
+        'alerts': alerts,
+        'new': new,
+    }
+
+
+def parse_cost_event(record):
+    """Summary of an AWS Budgets or Cost Anomaly Detection SNS notification"""
+    message = record.get('Sns', {}).get('Message', '')
+    try:
+        payload = json.loads(message)
+    except ValueError:
+        payload = None
+    if isinstance(payload, dict) and 'anomalyId' in payload:
+        causes = ', '.join(cause.get('service', '?') for cause in payload.get('rootCauses', []))
+        impact = payload.get('impact', {}).get('totalImpact')
+        return {'source': 'anomaly', 'id': payload['anomalyId'],
+                'summary': f"Cost anomaly {payload['anomalyId']}"
+                           + (f", impact ${float(impact):.2f}" if impact is not None else '')
+                           + (f" ({causes})" if causes else '')}
+    subject = record.get('Sns', {}).get('Subject') or (message.strip().splitlines() or [''])[0]
+    return {'source': 'budget' if 'Budget' in (subject or message) else 'sns', 'id': None,
+            'summary': subject or 'Cost notification'}
+
+
+def format_fast_check(result, events=()):
+    lines = ['=== FAST COST CHECK ===']
+    lines.extend(f"Event: {event['summary']}" for event in events)
+    lines.append(f"Checked {result['checked'][0]} (${result['yesterday_total']:.2f}) and "
+                 f"{result['checked'][1]} so far (${result['today_total']:.2f})")
+    lines.extend(f"⚠️  {alert['message']}" for alert in result['new'])
+    if not result['new']:
+        lines.append('No new anomalies in the latest cost data')
+    return '\n'.join(lines) + '\n'
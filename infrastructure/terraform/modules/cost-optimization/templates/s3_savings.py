@@ -0,0 +1,517 @@
+"""
+S3 lifecycle savings simulator for the cost optimizer.
+
+Reads the S3 Inventory of a publishing bucket in one streaming pass and
+folds every object version into a histogram by prefix group, age, storage
+class and size (below or above the 128 KB minimum billable size). Memory
+depends only on the number of histogram bins, so millions of objects cost
+seconds, not gigabytes. CSV inventories are parsed row by row. Parquet
+inventories are aggregated a batch at a time with pyarrow.compute, when
+pyarrow is in the Lambda package.
+
+Access frequency comes from two sources. The first is a Storage Lens
+export (activity metrics per prefix or bucket: GET requests and bytes
+downloaded against stored bytes and objects). The second is the inventory's
+Intelligent-Tiering access tier for objects that are already in
+INTELLIGENT_TIERING. Reads are spread over a group's age bins with a
+half-life, so new books and PDFs take most of them.
+
+Every candidate policy is priced on the histogram, per prefix group:
+  - Intelligent-Tiering
+  - STANDARD_IA after N days
+  - Glacier Instant Retrieval after M days
+  - Glacier IR for noncurrent (old) PDF versions
+Each price covers storage with minimum billable sizes, retrieval per GB,
+the GET price of the class, monitoring and one-time transition requests.
+The cheapest candidate per group becomes a rule of the proposed lifecycle
+configuration. Keys outside every prefix group only get a rule when they
+are the whole bucket, since a rule without a prefix would overlap the
+others; otherwise their savings are reported as potential.
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import math
+import sys
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from urllib.parse import unquote_plus
+
+from s3_replication import ManifestLocation
+
+GB = 1024 ** 3
+MIN_BILLABLE_BYTES = 128 * 1024
+AGE_BIN_DAYS = (0, 30, 60, 90, 180, 365, 730)
+DAYS_PER_MONTH = 30
+
+# us-east-1 list prices in USD; S3_PRICING can override any entry
+DEFAULT_PRICING = {
+    'storage_gb_month': {
+        'STANDARD': 0.023,
+        'INTELLIGENT_TIERING:FREQUENT': 0.023,
+        'INTELLIGENT_TIERING:INFREQUENT': 0.0125,
+        'INTELLIGENT_TIERING:ARCHIVE_INSTANT_ACCESS': 0.004,
+        'STANDARD_IA': 0.0125,
+        'ONEZONE_IA': 0.01,
+        'GLACIER_IR': 0.004,
+        'GLACIER': 0.0036,
+        'DEEP_ARCHIVE': 0.00099,
+    },
+    'retrieval_gb': {'STANDARD_IA': 0.01, 'ONEZONE_IA': 0.01, 'GLACIER_IR': 0.03},
+    'get_per_1000': {'STANDARD': 0.0004, 'INTELLIGENT_TIERING': 0.0004, 'STANDARD_IA': 0.001,
+                     'ONEZONE_IA': 0.001, 'GLACIER_IR': 0.01},
+    'transition_per_1000': {'INTELLIGENT_TIERING': 0.01, 'STANDARD_IA': 0.01, 'GLACIER_IR': 0.02},
+    'monitoring_per_1000_objects': 0.0025,
+}
+
+# Classes a lifecycle rule never moves objects out of
+COLD_CLASSES = ('GLACIER_IR', 'GLACIER', 'DEEP_ARCHIVE')
+MIN_BILLABLE_CLASSES = ('STANDARD_IA', 'ONEZONE_IA', 'GLACIER_IR')
+
+
+class Histogram:
+    """(group, current, storage class, age bin, small) -> [objects, bytes]"""
+
+    def __init__(self, groups=None):
+        self.groups = sorted(groups or [], key=len, reverse=True)
+        self.bins = defaultdict(lambda: [0, 0])
+        self.objects = 0
+
+    def group_of(self, key):
+        for prefix in self.groups:
+            if key.startswith(prefix):
+                return prefix
+        if self.groups:
+            return ''
+        return key.split('/', 1)[0] + '/' if '/' in key else ''
+
+    def add(self, key, size, age_days, storage_class, current, access_tier=None, count=1):
+        if storage_class == 'INTELLIGENT_TIERING':
+            storage_class = f"INTELLIGENT_TIERING:{access_tier or 'FREQUENT'}"
+        entry = self.bins[(self.group_of(key), current, storage_class or 'STANDARD',
+                           age_bin(age_days), size < MIN_BILLABLE_BYTES)]
+        entry[0] += count
+        entry[1] += size
+        self.objects += count
+
+
+def age_bin(age_days):
+    return max(bisect_right(AGE_BIN_DAYS, age_days) - 1, 0)
+
+
+def _field_names(schema):
+    # "Bucket, Key, Size, IsLatest" -> ['bucket', 'key', 'size', 'is_latest']
+    return [''.join('_' + c.lower() if c.isupper() else c for c in name.strip()).lstrip('_')
+            for name in schema.split(',')]
+
+
+def _add_csv_file(histogram, location, file_key, fields, as_of):
+    index = {name: position for position, name in enumerate(fields)}
+    key_at, size_at, modified_at = index['key'], index.get('size'), index.get('last_modified_date')
+    class_at, latest_at = index.get('storage_class'), index.get('is_latest')
+    marker_at, tier_at = index.get('is_delete_marker'), index.get('intelligent_tiering_access_tier')
+    as_of_day = datetime.fromtimestamp(as_of, timezone.utc).date().toordinal()
+    # Many objects share a modification date; ages are counted in whole days
+    ages = {}
+
+    stream = location.open_stream(file_key)
+    try:
+        raw = gzip.GzipFile(fileobj=stream) if file_key.endswith('.gz') else stream
+        for row in csv.reader(io.TextIOWrapper(raw, encoding='utf-8', newline='')):
+            if marker_at is not None and row[marker_at] == 'true':
+                continue
+            day = row[modified_at][:10] if modified_at is not None else ''
+            age = ages.get(day)
+            if age is None:
+                age = ages[day] = max(0, as_of_day - date.fromisoformat(day).toordinal()) if day else 0
+            key = row[key_at]
+            histogram.add(
+                unquote_plus(key) if '%' in key or '+' in key else key,
+                int(row[size_at] or 0) if size_at is not None else 0,
+                age,
+                (row[class_at] if class_at is not None else '') or 'STANDARD',
+                latest_at is None or row[latest_at] != 'false',
+                row[tier_at] if tier_at is not None else None,
+            )
+    finally:
+        stream.close()
+
+
+def _top_level_prefix(pc, keys):
+    """'books/a.pdf' -> 'books/', 'robots.txt' -> '' (vectorized Histogram.group_of without groups)"""
+    parts = pc.split_pattern(keys, pattern='/', max_splits=1)
+    nested = pc.greater(pc.list_value_length(parts), 1)
+    return pc.if_else(nested, pc.binary_join_element_wise(pc.list_element(parts, 0), '/', ''), '')
+
+
+def _configured_prefix(pa, pc, keys, groups):
+    """Longest configured prefix each key starts with, '' for none"""
+    group = pa.array([''] * len(keys), pa.string())
+    assigned = pa.array([False] * len(keys))
+    for prefix in groups:
+        match = pc.and_(pc.starts_with(keys, pattern=prefix), pc.invert(assigned))
+        group = pc.if_else(match, prefix, group)
+        assigned = pc.or_(assigned, match)
+    return group
+
+
+def _add_parquet_file(histogram, location, file_key, as_of):
+    """Aggregate each record batch with pyarrow.compute, then fold the groups into the histogram"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError('Parquet inventories require pyarrow in the Lambda package')
+
+    with location.open_seekable(file_key) as f:
+        parquet = pq.ParquetFile(f)
+        as_of_day = (datetime.fromtimestamp(as_of, timezone.utc).date() - date(1970, 1, 1)).days
+        names = set(parquet.schema_arrow.names)
+        for batch in parquet.iter_batches(batch_size=65536):
+            table = pa.Table.from_batches([batch])
+            if 'is_delete_marker' in names:
+                table = table.filter(pc.invert(pc.fill_null(table['is_delete_marker'], False)))
+            rows = table.num_rows
+            if not rows:
+                continue
+
+            def column(name, default, kind):
+                if name not in names:
+                    return pa.array([default] * rows, kind)
+                return pc.fill_null(pc.cast(table[name], kind), default)
+
+            # Whole days between the modification date and the inventory date, as in the CSV path
+            modified = pc.cast(pc.cast(pc.cast(table['last_modified_date'], pa.timestamp('ms', tz='UTC')),
+                                       pa.date32()), pa.int32())
+            age = pc.fill_null(pc.subtract(as_of_day, pc.cast(modified, pa.int64())), 0)
+            age_index = pa.array([0] * rows, pa.int64())
+            for edge in AGE_BIN_DAYS[1:]:
+                age_index = pc.add(age_index, pc.cast(pc.greater_equal(age, edge), pa.int64()))
+            size = pc.cast(pc.fill_null(table['size'], 0), pa.int64())
+            keys = pc.fill_null(table['key'], '').combine_chunks()
+
+            grouped = pa.table({
+                'group': _configured_prefix(pa, pc, keys, histogram.groups) if histogram.groups
+                else _top_level_prefix(pc, keys),
+                'current': column('is_latest', True, pa.bool_()),
+                'storage_class': column('storage_class', 'STANDARD', pa.string()),
+                'tier': column('intelligent_tiering_access_tier', '', pa.string()),
+                'age_bin': age_index,
+                'small': pc.less(size, MIN_BILLABLE_BYTES),
+                'size': size,
+            }).group_by(['group', 'current', 'storage_class', 'tier', 'age_bin', 'small']) \
+              .aggregate([('size', 'sum'), ('size', 'count')])
+
+            for row in grouped.to_pylist():
+                storage_class = row['storage_class'] or 'STANDARD'
+                if storage_class == 'INTELLIGENT_TIERING':
+                    storage_class = f"INTELLIGENT_TIERING:{row['tier'] or 'FREQUENT'}"
+                entry = histogram.bins[(row['group'], row['current'], storage_class, row['age_bin'], row['small'])]
+                entry[0] += row['size_count']
+                entry[1] += row['size_sum']
+                histogram.objects += row['size_count']
+
+
+def build_histogram(inventory_location, groups=None, s3_client=None):
+    """Stream every data file of the newest inventory into a Histogram"""
+    location = ManifestLocation(inventory_location, s3_client)
+    manifest = location.read_manifest()
+    created = manifest.get('creationTimestamp')
+    as_of = int(created) / 1000.0 if created else time.time()
+    histogram = Histogram(groups)
+    file_format = manifest.get('fileFormat', 'CSV').upper()
+    for item in manifest['files']:
+        if file_format == 'CSV':
+            _add_csv_file(histogram, location, item['key'], _field_names(manifest.get('fileSchema', '')), as_of)
+        elif file_format == 'PARQUET':
+            _add_parquet_file(histogram, location, item['key'], as_of)
+        else:
+            raise ValueError(f'Unsupported inventory format: {file_format}')
+    return histogram
+
+
+def read_storage_lens(export_location, bucket, groups=None, s3_client=None):
+    """
+    {group: {'read_ratio': bytes read / bytes stored per month, 'gets_per_object': GETs per object per month}}
+    from a Storage Lens CSV export. Prefix records are used when the export has
+    them; the bucket record covers every group under the '*' entry.
+    """
+    location = ManifestLocation(export_location, s3_client)
+    manifest = location.read_manifest()
+    fields = [name.strip() for name in manifest['reportSchema'].split(',')]
+    totals = defaultdict(lambda: defaultdict(float))
+    dates = set()
+    for item in manifest['reportFiles']:
+        stream = location.open_stream(item['key'])
+        try:
+            raw = gzip.GzipFile(fileobj=stream) if item['key'].endswith('.gz') else stream
+            for row in csv.reader(io.TextIOWrapper(raw, encoding='utf-8', newline='')):
+                record = dict(zip(fields, row))
+                if record.get('bucket_name') != bucket or record.get('metric_name') not in (
+                        'GetRequests', 'BytesDownloaded', 'StorageBytes', 'ObjectCount'):
+                    continue
+                if record.get('record_type') == 'BUCKET':
+                    target = '*'
+                elif record.get('record_type') == 'PREFIX':
+                    target = record.get('record_value', '')
+                    if groups and target not in groups:
+                        continue
+                else:
+                    continue
+                dates.add(record.get('report_date'))
+                totals[target][record['metric_name']] += float(record['metric_value'] or 0)
+        finally:
+            stream.close()
+
+    days = max(len(dates), 1)
+    access = {}
+    for target, metrics in totals.items():
+        # Activity metrics are daily sums; storage metrics are daily snapshots
+        stored = metrics['StorageBytes'] / days
+        objects = metrics['ObjectCount'] / days
+        access[target] = {
+            'read_ratio': metrics['BytesDownloaded'] / days * DAYS_PER_MONTH / stored if stored else 0.0,
+            'gets_per_object': metrics['GetRequests'] / days * DAYS_PER_MONTH / objects if objects else 0.0,
+        }
+    return access
+
+
+def _access_by_bin(histogram, access, half_life_days, default_access):
+    """Reads per bin: each group's monthly reads weighted towards younger objects by the half-life"""
+    mid_age = [(low + (AGE_BIN_DAYS[i + 1] if i + 1 < len(AGE_BIN_DAYS) else low * 2)) / 2
+               for i, low in enumerate(AGE_BIN_DAYS)]
+    weight = [0.5 ** (age / half_life_days) if half_life_days else 1.0 for age in mid_age]
+
+    by_group = defaultdict(lambda: [0.0, 0.0, 0.0, 0.0])
+    for (group, _, _, age_index, _), (count, size) in histogram.bins.items():
+        totals = by_group[group]
+        totals[0] += size
+        totals[1] += size * weight[age_index]
+        totals[2] += count
+        totals[3] += count * weight[age_index]
+
+    rates = {}
+    for key in histogram.bins:
+        group, age_index = key[0], key[3]
+        group_access = access.get(group) or access.get('*') or default_access
+        bytes_total, bytes_weighted, count_total, count_weighted = by_group[group]
+        rates[key] = (
+            group_access['read_ratio'] * weight[age_index] * bytes_total / bytes_weighted if bytes_weighted else 0.0,
+            group_access['gets_per_object'] * weight[age_index] * count_total / count_weighted if count_weighted else 0.0,
+        )
+    return rates
+
+
+def _int_tier(age_low, gets_per_object):
+    """Expected Intelligent-Tiering tier mix: objects read within 30 days stay frequent, idle ones move down by age"""
+    if age_low >= 90:
+        idle = 'INTELLIGENT_TIERING:ARCHIVE_INSTANT_ACCESS'
+    elif age_low >= 30:
+        idle = 'INTELLIGENT_TIERING:INFREQUENT'
+    else:
+        return {'INTELLIGENT_TIERING:FREQUENT': 1.0}
+    accessed = 1 - math.exp(-gets_per_object)
+    return {'INTELLIGENT_TIERING:FREQUENT': accessed, idle: 1 - accessed}
+
+
+def _base_class(storage_class):
+    return storage_class.split(':', 1)[0]
+
+
+def bin_cost(pricing, storage_class, count, size, read_ratio, gets_per_object, tier_mix=None):
+    """Monthly cost of one histogram bin kept in storage_class"""
+    base = _base_class(storage_class)
+    billable = max(size, count * MIN_BILLABLE_BYTES) if base in MIN_BILLABLE_CLASSES else size
+    storage = pricing['storage_gb_month']
+    if tier_mix:
+        cost = sum(billable / GB * storage[tier] * share for tier, share in tier_mix.items())
+    else:
+        cost = billable / GB * storage.get(storage_class, storage['STANDARD'])
+    if base == 'INTELLIGENT_TIERING' and size >= count * MIN_BILLABLE_BYTES:
+        cost += count / 1000 * pricing['monitoring_per_1000_objects']
+    cost += size * read_ratio / GB * pricing['retrieval_gb'].get(base, 0.0)
+    cost += count * gets_per_object / 1000 * pricing['get_per_1000'].get(base, pricing['get_per_1000']['STANDARD'])
+    return cost
+
+
+def candidate_policies():
+    """Lifecycle options for current versions x options for noncurrent versions"""
+    current = [{'name': 'keep'}, {'name': 'intelligent_tiering', 'intelligent_tiering': True}]
+    for ia in (None, 30, 60, 90):
+        for gir in (None, 90, 180, 365):
+            if (ia is None and gir is None) or (ia and gir and gir <= ia):
+                continue
+            name = '_'.join(part for part in (ia and f'ia_after_{ia}', gir and f'glacier_ir_after_{gir}') if part)
+            current.append({'name': name, 'ia_after': ia, 'glacier_ir_after': gir})
+    noncurrent = [None, 30, 90]
+    return [dict(policy, noncurrent_glacier_ir_after=days) for policy in current for days in noncurrent]
+
+
+def _target_class(policy, storage_class, age_low, current, small):
+    base = _base_class(storage_class)
+    if small or base in COLD_CLASSES:
+        return storage_class
+    if not current:
+        after = policy.get('noncurrent_glacier_ir_after')
+        return 'GLACIER_IR' if after is not None and age_low >= after else storage_class
+    if policy.get('intelligent_tiering'):
+        return storage_class if base == 'INTELLIGENT_TIERING' else 'INTELLIGENT_TIERING'
+    if policy.get('glacier_ir_after') is not None and age_low >= policy['glacier_ir_after']:
+        return 'GLACIER_IR'
+    # S3 lifecycle moves objects to STANDARD_IA only from STANDARD
+    if policy.get('ia_after') is not None and age_low >= policy['ia_after'] and base == 'STANDARD':
+        return 'STANDARD_IA'
+    return storage_class
+
+
+def price_policy(histogram, rates, pricing, policy, group):
+    """(monthly cost, one-time transition cost) of a policy applied to one group"""
+    monthly = transitions = 0.0
+    for key, (count, size) in histogram.bins.items():
+        bin_group, current, storage_class, age_index, small = key
+        if bin_group != group:
+            continue
+        read_ratio, gets_per_object = rates[key]
+        target = _target_class(policy, storage_class, AGE_BIN_DAYS[age_index], current, small)
+        tier_mix = _int_tier(AGE_BIN_DAYS[age_index], gets_per_object) if target == 'INTELLIGENT_TIERING' else None
+        monthly += bin_cost(pricing, target, count, size, read_ratio, gets_per_object, tier_mix)
+        if target != storage_class:
+            transitions += count / 1000 * pricing['transition_per_1000'][_base_class(target)]
+    return monthly, transitions
+
+
+def lifecycle_rule(group, policy):
+    """S3 lifecycle rule (PutBucketLifecycleConfiguration shape) for a chosen policy"""
+    rule = {
+        'ID': f"{group.rstrip('/') or 'root'}-{policy['name']}",
+        'Status': 'Enabled',
+        # Objects under 128 KB cost more in IA/Glacier IR than in Standard
+        'Filter': {'And': {'Prefix': group, 'ObjectSizeGreaterThan': MIN_BILLABLE_BYTES - 1}},
+    }
+    transitions = []
+    if policy.get('intelligent_tiering'):
+        transitions.append({'Days': 0, 'StorageClass': 'INTELLIGENT_TIERING'})
+    if policy.get('ia_after') is not None:
+        transitions.append({'Days': policy['ia_after'], 'StorageClass': 'STANDARD_IA'})
+    if policy.get('glacier_ir_after') is not None:
+        transitions.append({'Days': policy['glacier_ir_after'], 'StorageClass': 'GLACIER_IR'})
+    if transitions:
+        rule['Transitions'] = transitions
+    if policy.get('noncurrent_glacier_ir_after') is not None:
+        rule['NoncurrentVersionTransitions'] = [
+            {'NoncurrentDays': policy['noncurrent_glacier_ir_after'], 'StorageClass': 'GLACIER_IR'}]
+    return rule
+
+
+def simulate(histogram, access=None, pricing=None, half_life_days=90, amortize_months=12,
+             default_access=None):
+    """
+    Price every candidate policy per group and pick the cheapest.
+
+    One-time transition costs are spread over amortize_months when policies are
+    compared. default_access applies to groups the Storage Lens export does not cover.
+    """
+    pricing = pricing or DEFAULT_PRICING
+    default_access = default_access or {'read_ratio': 0.1, 'gets_per_object': 1.0}
+    rates = _access_by_bin(histogram, access or {}, half_life_days, default_access)
+    groups = sorted({key[0] for key in histogram.bins})
+    keep = {'name': 'keep', 'noncurrent_glacier_ir_after': None}
+
+    results = {}
+    rules = []
+    for group in groups:
+        # A rule for the catch-all group would need Prefix '', which matches the
+        # whole bucket and overlaps every prefix rule; it is only proposed alone
+        overlaps = group == '' and len(groups) > 1
+        current_cost, _ = price_policy(histogram, rates, pricing, keep, group)
+        best = (current_cost, 0.0, keep)
+        for policy in candidate_policies():
+            monthly, transitions = price_policy(histogram, rates, pricing, policy, group)
+            if monthly + transitions / amortize_months < best[0] + best[1] / amortize_months:
+                best = (monthly, transitions, policy)
+        monthly, transitions, policy = best
+        skipped = overlaps and policy is not keep and monthly < current_cost
+        if skipped:
+            potential, monthly, transitions, policy = current_cost - monthly, current_cost, 0.0, keep
+        savings = current_cost - monthly
+        results[group] = {
+            'objects': sum(count for key, (count, _) in histogram.bins.items() if key[0] == group),
+            'bytes': sum(size for key, (_, size) in histogram.bins.items() if key[0] == group),
+            'policy': policy['name'] if policy.get('noncurrent_glacier_ir_after') is None
+            else f"{policy['name']}+noncurrent_glacier_ir_after_{policy['noncurrent_glacier_ir_after']}",
+            'current_monthly_cost': round(current_cost, 2),
+            'projected_monthly_cost': round(monthly, 2),
+            'monthly_savings': round(savings, 2),
+            'transition_cost': round(transitions, 2),
+            'payback_months': round(transitions / savings, 1) if savings > 0 else None,
+        }
+        if skipped:
+            results[group]['skipped'] = ('keys outside the prefix groups; a rule would apply to the whole bucket '
+                                         'and overlap the prefix rules (move them under a prefix or add a group)')
+            results[group]['potential_monthly_savings'] = round(potential, 2)
+        if policy is not keep and savings > 0:
+            rules.append(lifecycle_rule(group, policy))
+
+    current_total = sum(result['current_monthly_cost'] for result in results.values())
+    projected_total = sum(result['projected_monthly_cost'] for result in results.values())
+    return {
+        'objects': histogram.objects,
+        'bins': len(histogram.bins),
+        'current_monthly_cost': round(current_total, 2),
+        'projected_monthly_cost': round(projected_total, 2),
+        'monthly_savings': round(current_total - projected_total, 2),
+        'transition_cost': round(sum(result['transition_cost'] for result in results.values()), 2),
+        'groups': results,
+        'lifecycle_configuration': {'Rules': rules},
+    }
+
+
+def simulate_bucket(inventory_location, storage_lens_location=None, bucket=None, groups=None,
+                    s3_client=None, pricing=None, half_life_days=90):
+    """build_histogram + read_storage_lens + simulate for one bucket"""
+    started = time.monotonic()
+    histogram = build_histogram(inventory_location, groups, s3_client)
+    access = read_storage_lens(storage_lens_location, bucket, groups, s3_client) if storage_lens_location else {}
+    result = simulate(histogram, access, pricing, half_life_days)
+    result['access_source'] = 'storage_lens' if access else 'default'
+    result['seconds'] = round(time.monotonic() - started, 1)
+    return result
+
+
+def merge_pricing(overrides):
+    pricing = json.loads(json.dumps(DEFAULT_PRICING))
+    for section, values in (overrides or {}).items():
+        if isinstance(values, dict):
+            pricing[section].update(values)
+        else:
+            pricing[section] = values
+    return pricing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate S3 lifecycle policies on an inventory')
+    parser.add_argument('inventory', help='inventory location (s3://bucket/prefix/, manifest.json or directory)')
+    parser.add_argument('--storage-lens', help='Storage Lens export location for access metrics')
+    parser.add_argument('--bucket', help='bucket name in the Storage Lens export')
+    parser.add_argument('--group', action='append', dest='groups', help='prefix to price separately (repeatable)')
+    parser.add_argument('--half-life-days', type=float, default=90)
+    args = parser.parse_args(argv)
+
+    s3_client = None
+    if args.inventory.startswith('s3://') or (args.storage_lens or '').startswith('s3://'):
+        import boto3
+        s3_client = boto3.client('s3')
+    result = simulate_bucket(args.inventory, args.storage_lens, args.bucket, args.groups, s3_client,
+                             half_life_days=args.half_life_days)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
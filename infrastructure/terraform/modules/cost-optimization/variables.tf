@@ -190,12 +190,200 @@ variable "enable_cost_optimizer_lambda" {
   default     = true
 }
 
+variable "cost_optimizer_memory_size" {
+  description = "Memory of the cost optimizer Lambda in MB; CPU scales with it, and the weekly analysis streams S3 Inventories and CloudFront logs inline (1769 MB = one full vCPU)"
+  type        = number
+  default     = 1769
+
+  validation {
+    condition     = var.cost_optimizer_memory_size >= 128 && var.cost_optimizer_memory_size <= 10240
+    error_message = "cost_optimizer_memory_size must be between 128 and 10240 MB."
+  }
+}
+
+variable "cost_optimizer_timeout_seconds" {
+  description = "Timeout of the cost optimizer Lambda; a timeout loses the whole weekly report"
+  type        = number
+  default     = 900
+
+  validation {
+    condition     = var.cost_optimizer_timeout_seconds >= 60 && var.cost_optimizer_timeout_seconds <= 900
+    error_message = "cost_optimizer_timeout_seconds must be between 60 and 900 seconds."
+  }
+}
+
 variable "cost_anomaly_threshold" {
   description = "Cost anomaly threshold for Lambda function"
   type        = number
   default     = 100
 }
 
+# Cost Attribution
+variable "cost_features" {
+  description = "Platform features costs are attributed to, as values of the feature tag or cost category (e.g. pdf-delivery, ai-generation, reading-api)"
+  type        = list(string)
+  default     = []
+}
+
+variable "cost_feature_tag_key" {
+  description = "Cost allocation tag that names the feature a resource serves (must be activated in Billing)"
+  type        = string
+  default     = "Feature"
+}
+
+variable "cost_category_name" {
+  description = "Cost category to group by instead of the feature tag; empty uses the tag"
+  type        = string
+  default     = ""
+}
+
+variable "cost_shared_values" {
+  description = "Tag or cost category values whose cost is shared across features, like untagged cost"
+  type        = list(string)
+  default     = ["shared"]
+}
+
+variable "cost_feature_usage" {
+  description = "Per feature CloudWatch usage metric used to split shared cost: { feature = { namespace, metric, dimensions, stat } }"
+  type        = any
+  default     = {}
+}
+
+variable "cost_attribution_days" {
+  description = "Number of complete days covered by the cost attribution report"
+  type        = number
+  default     = 14
+}
+
+# S3 Lifecycle Simulation
+variable "s3_inventory_locations" {
+  description = "S3 Inventory destination per publishing bucket: { bucket = \"s3://inventory-bucket/prefix/\" }; empty reports S3 cost without a savings estimate"
+  type        = map(string)
+  default     = {}
+}
+
+variable "s3_storage_lens_location" {
+  description = "Storage Lens metrics export location (s3://bucket/prefix/) for per prefix access rates; empty assumes a low default access rate"
+  type        = string
+  default     = ""
+}
+
+variable "s3_lifecycle_groups" {
+  description = "Key prefixes priced as separate lifecycle rules per bucket: { bucket = [\"books/pdf/\", \"covers/\"] }; buckets not listed are grouped by top level prefix"
+  type        = map(list(string))
+  default     = {}
+}
+
+variable "s3_pricing" {
+  description = "Overrides of the simulator's us-east-1 list prices, by section (storage_gb_month, retrieval_gb, get_per_1000, transition_per_1000, monitoring_per_1000_objects)"
+  type        = any
+  default     = {}
+}
+
+variable "s3_access_half_life_days" {
+  description = "Age in days over which an object's access rate halves, used to spread prefix access rates across object ages"
+  type        = number
+  default     = 90
+}
+
+# Data Transfer and CDN Analysis
+variable "cdn_distributions" {
+  description = "CloudFront distributions to analyze: [{ id, path_patterns, uncompressed_patterns, log_location = \"s3://logs-bucket/cloudfront-logs/\", origin_metric, origin_cost }]; only id is required"
+  type        = any
+  default     = []
+}
+
+variable "cdn_target_hit_ratio" {
+  description = "Cache hit ratio each path pattern is measured against when estimating caching savings"
+  type        = number
+  default     = 0.95
+}
+
+variable "cdn_origin_cost" {
+  description = "Origin cost of a cache miss: { per_gb, per_1000_requests }; defaults to S3 GET pricing with free transfer to CloudFront"
+  type        = any
+  default     = {}
+}
+
+variable "cdn_max_log_files" {
+  description = "Maximum CloudFront access log files sampled per distribution and analysis"
+  type        = number
+  default     = 200
+}
+
+# Commitment Tracking
+variable "cost_cache_location" {
+  description = "Incremental daily cost cache (s3://bucket/prefix/); empty provisions a cache bucket for the module"
+  type        = string
+  default     = ""
+
+  validation {
+    condition     = var.cost_cache_location == "" || can(regex("^s3://[^/]+", var.cost_cache_location))
+    error_message = "cost_cache_location must be empty or an s3://bucket/prefix/ location."
+  }
+}
+
+variable "commitment_services" {
+  description = "Services whose Reserved Instance coverage is tracked"
+  type        = list(string)
+  default     = ["Amazon Elastic Compute Cloud - Compute", "Amazon Relational Database Service"]
+}
+
+variable "commitment_utilization_target" {
+  description = "Reservation or Savings Plans utilization below which a family is reported as under-utilized"
+  type        = number
+  default     = 0.9
+}
+
+variable "commitment_short_window" {
+  description = "Days in the rolling window that detects load shape changes"
+  type        = number
+  default     = 3
+}
+
+variable "commitment_long_window" {
+  description = "Days in the rolling baseline window"
+  type        = number
+  default     = 28
+}
+
+# Fast Cost Check
+variable "enable_fast_cost_check" {
+  description = "Check the latest cost data hourly and on Budgets / Cost Anomaly Detection notifications, running the full analysis only on new anomalies"
+  type        = bool
+  default     = true
+}
+
+variable "fast_check_schedule" {
+  description = "Schedule of the fast cost check"
+  type        = string
+  default     = "rate(1 hour)"
+}
+
+variable "fast_check_baseline_days" {
+  description = "Days of per service cost the latest days are compared against"
+  type        = number
+  default     = 14
+}
+
+variable "fast_check_anomaly_ratio" {
+  description = "Share above a service's baseline median that counts as an anomaly (0.5 = 50% above)"
+  type        = number
+  default     = 0.5
+}
+
+variable "fast_check_min_delta" {
+  description = "Minimum USD per day above the baseline for an anomaly, and the impact threshold of immediate anomaly notifications"
+  type        = number
+  default     = 50
+}
+
+variable "fast_check_daily_threshold" {
+  description = "Total USD per day that triggers an alert on its own; 0 disables it"
+  type        = number
+  default     = 0
+}
+
 # Service References
 variable "service_name" {
   description = "ECS service name for cost monitoring"
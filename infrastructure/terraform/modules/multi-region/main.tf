@@ -13,6 +13,10 @@ terraform {
         aws.backup_region
       ]
     }
+    http = {
+      source  = "hashicorp/http"
+      version = "~> 3.4"
+    }
   }
 }
 
@@ -459,16 +463,80 @@ resource "aws_lambda_function" "disaster_recovery_orchestrator" {
       DR_SERVICE_NAME               = module.disaster_recovery_region.ecs_service_name
       DATABASE_CLUSTER_IDENTIFIER   = module.primary_region.database_cluster_identifier
       SNS_TOPIC_ARN                = aws_sns_topic.disaster_recovery_alerts.arn
+      NOTIFICATION_TOPICS           = jsonencode({
+        CRITICAL = aws_sns_topic.disaster_recovery_alerts.arn
+        WARNING  = aws_sns_topic.disaster_recovery_alerts.arn
+        SUCCESS  = aws_sns_topic.disaster_recovery_reports.arn
+        INFO     = aws_sns_topic.disaster_recovery_reports.arn
+      })
+      NOTIFICATION_DEDUPE_SECONDS   = var.notification_dedupe_seconds
       RTO_TARGET_SECONDS           = local.rto_target_seconds
       RPO_TARGET_SECONDS           = local.rpo_target_seconds
+      REPLICATION_SOURCE_INVENTORY  = var.replication_inventory_source
+      REPLICATION_REPLICA_INVENTORY = var.replication_inventory_replica
+      PRIMARY_CLUSTER_NAME          = module.primary_region.ecs_cluster_name
+      PRIMARY_SERVICE_NAME          = module.primary_region.ecs_service_name
+      PRIMARY_LOAD_BALANCER         = module.primary_region.load_balancer_name
+      DR_MIN_TASKS                  = var.primary_region_capacity.min
+      DR_MAX_TASKS                  = local.regions.backup.capacity.max
+      DR_CAPACITY_HEADROOM          = var.dr_capacity_headroom
+      DR_TARGET_CPU_PERCENT         = var.dr_target_cpu_percent
+      DR_REQUESTS_PER_TASK          = var.dr_requests_per_task
+      PRIMARY_HEALTH_CHECK_ID       = aws_route53_health_check.primary_region_health.id
+      DR_DATABASE_CLUSTER_IDENTIFIER = module.disaster_recovery_region.database_cluster_identifier
+      DR_LOAD_BALANCER_DNS          = module.disaster_recovery_region.load_balancer_dns_name
+      DOMAIN_NAME                   = var.domain_name
+      WARM_STANDBY_MIN_TASKS        = var.warm_standby_min_tasks
+      WARM_STANDBY_RECOVERY_SECONDS = var.warm_standby_recovery_minutes * 60
+      WARM_STANDBY_CAPACITY_UNITS   = var.warm_standby_capacity_units
+      WARM_STANDBY_PATHS            = join(",", var.warm_standby_paths)
+      PILOT_LIGHT_TASKS             = local.regions.backup.capacity.desired
+      HEALTH_PROBE_PATHS            = join(",", concat(var.health_probe_paths, compact([var.health_probe_pdf_path])))
+      HEALTH_PROBE_REQUESTS         = var.health_probe_requests
+      HEALTH_PROBE_CONCURRENCY      = var.health_probe_concurrency
+      HEALTH_PROBE_SLO              = jsonencode(var.health_probe_slo)
+      HEALTH_PROBE_PATH_SLOS        = jsonencode({ for path in compact([var.health_probe_pdf_path]) : path => var.health_probe_pdf_slo })
+      HEALTH_PROBE_WAIT_SECONDS     = var.health_probe_wait_minutes * 60
+      HOSTED_ZONE_ID                = aws_route53_zone.main.zone_id
+      PRIMARY_LOAD_BALANCER_DNS     = module.primary_region.load_balancer_dns_name
+      PRIMARY_LOAD_BALANCER_ZONE_ID = module.primary_region.load_balancer_zone_id
+      DR_LOAD_BALANCER_ZONE_ID      = module.disaster_recovery_region.load_balancer_zone_id
+      DNS_CUTOVER_NAMES             = join(",", var.dns_cutover_names)
+      DNS_CHANGE_TIMEOUT_SECONDS    = var.dns_change_timeout_seconds
+      ADDITIONAL_DATABASE_CLUSTERS  = jsonencode(var.additional_database_clusters)
+      DATABASE_FAILOVER_TIMEOUT_SECONDS = var.database_failover_timeout_seconds
+      DATABASE_SECRET_ID            = var.database_secret_id
+      DATABASE_CA_BUNDLE            = var.database_secret_id != "" ? "/var/task/rds-ca-bundle.pem" : ""
+      DR_HISTORY_LOCATION           = var.dr_history_location
     }
   }
 
   source_code_hash = data.archive_file.dr_orchestrator_zip.output_base64sha256
 
+  lifecycle {
+    precondition {
+      # The orchestrator also cuts each wait short at run time, keeping 60 seconds to report
+      condition     = var.database_failover_timeout_seconds + var.dns_change_timeout_seconds + var.health_probe_wait_minutes * 60 + 60 <= 900
+      error_message = "database_failover_timeout_seconds + dns_change_timeout_seconds + health_probe_wait_minutes * 60 must leave 60 seconds of the orchestrator's 900 second timeout."
+    }
+  }
+
   tags = var.tags
 }
 
+# RDS certificate authorities, so the write check verifies the cluster it sends the password to
+data "http" "rds_ca_bundle" {
+  count = var.database_secret_id != "" ? 1 : 0
+  url   = var.database_ca_bundle_url
+
+  lifecycle {
+    postcondition {
+      condition     = self.status_code == 200 && can(regex("BEGIN CERTIFICATE", self.response_body))
+      error_message = "Could not download the RDS CA bundle from ${var.database_ca_bundle_url}"
+    }
+  }
+}
+
 data "archive_file" "dr_orchestrator_zip" {
   type        = "zip"
   output_path = "/tmp/dr_orchestrator.zip"
@@ -479,6 +547,70 @@ data "archive_file" "dr_orchestrator_zip" {
     })
     filename = "index.py"
   }
+
+  source {
+    content  = file("${path.module}/templates/s3_replication.py")
+    filename = "s3_replication.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/db_backups.py")
+    filename = "db_backups.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/dr_capacity.py")
+    filename = "dr_capacity.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/notifier.py")
+    filename = "notifier.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/warm_standby.py")
+    filename = "warm_standby.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/service_probe.py")
+    filename = "service_probe.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/dns_cutover.py")
+    filename = "dns_cutover.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/db_failover.py")
+    filename = "db_failover.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/pg_check.py")
+    filename = "pg_check.py"
+  }
+
+  source {
+    content  = file("${path.module}/templates/drill_history.py")
+    filename = "drill_history.py"
+  }
+
+  dynamic "source" {
+    for_each = data.http.rds_ca_bundle
+    content {
+      content  = source.value.response_body
+      filename = "rds-ca-bundle.pem"
+    }
+  }
+
+  # Shared ops Lambda runtime (lazy AWS clients, env and response helpers)
+  source {
+    content  = file("${path.module}/../../lambda-runtime/ops_runtime.py")
+    filename = "ops_runtime.py"
+  }
 }
 
 # IAM Role for DR Orchestrator
@@ -524,11 +656,32 @@ resource "aws_iam_policy" "dr_orchestrator_policy" {
           "ecs:UpdateService",
           "ecs:DescribeServices",
           "ecs:DescribeClusters",
+          "ecs:DescribeTaskDefinition",
+          "ecs:ListTagsForResource",
+          "ecs:TagResource",
+          "elasticloadbalancing:DescribeTargetGroups",
+          "elasticloadbalancing:DescribeTargetHealth",
+          "elasticloadbalancing:DescribeCapacityReservation",
+          "elasticloadbalancing:ModifyCapacityReservation",
+          "cloudwatch:GetMetricData",
+          "servicequotas:GetServiceQuota",
+          "ec2:DescribeSubnets",
           "rds:DescribeDBClusters",
+          "rds:DescribeDBClusterSnapshots",
           "rds:RestoreDBClusterFromSnapshot",
           "rds:CreateDBCluster",
+          "rds:DescribeGlobalClusters",
+          "rds:FailoverGlobalCluster",
+          "rds:SwitchoverGlobalCluster",
+          "rds:PromoteReadReplicaDBCluster",
+          "secretsmanager:GetSecretValue",
           "route53:ChangeResourceRecordSets",
           "route53:GetHostedZone",
+          "route53:ListResourceRecordSets",
+          "route53:GetChange",
+          "s3:GetObject",
+          "s3:ListBucket",
+          "s3:PutObject",
           "sns:Publish"
         ]
         Resource = "*"
@@ -559,13 +712,59 @@ resource "aws_sns_topic_subscription" "dr_email_notifications" {
   endpoint  = var.disaster_recovery_alerts[count.index]
 }
 
+# Non-paging DR reports (test results, completed operations)
+resource "aws_sns_topic" "disaster_recovery_reports" {
+  provider = aws.us_east_1
+  name     = "${var.name_prefix}-disaster-recovery-reports"
+
+  tags = var.tags
+}
+
+resource "aws_sns_topic_subscription" "dr_report_email_notifications" {
+  provider  = aws.us_east_1
+  count     = length(var.disaster_recovery_alerts)
+  topic_arn = aws_sns_topic.disaster_recovery_reports.arn
+  protocol  = "email"
+  endpoint  = var.disaster_recovery_alerts[count.index]
+}
+
+# Pilot light / warm standby evaluation
+resource "aws_cloudwatch_event_rule" "dr_standby_schedule" {
+  provider            = aws.us_east_1
+  count               = var.enable_warm_standby ? 1 : 0
+  name                = "${var.name_prefix}-dr-standby-check"
+  description         = "Pre-scale the DR region while the primary is degraded"
+  schedule_expression = "rate(1 minute)"
+
+  tags = var.tags
+}
+
+resource "aws_cloudwatch_event_target" "dr_standby_target" {
+  provider  = aws.us_east_1
+  count     = var.enable_warm_standby ? 1 : 0
+  rule      = aws_cloudwatch_event_rule.dr_standby_schedule[0].name
+  target_id = "DROrchestratorStandby"
+  arn       = aws_lambda_function.disaster_recovery_orchestrator.arn
+  input     = jsonencode({ action = "standby" })
+}
+
+resource "aws_lambda_permission" "allow_standby_schedule" {
+  provider      = aws.us_east_1
+  count         = var.enable_warm_standby ? 1 : 0
+  statement_id  = "AllowStandbyScheduleInvocation"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.disaster_recovery_orchestrator.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.dr_standby_schedule[0].arn
+}
+
 # CloudWatch Alarms for Multi-Region Health
 resource "aws_cloudwatch_metric_alarm" "multi_region_health" {
   provider            = aws.us_east_1
   alarm_name          = "${var.name_prefix}-multi-region-health"
   comparison_operator = "LessThanThreshold"
   evaluation_periods  = "2"
-  metric_name         = "HealthCheckPercentHealthy"
+  metric_name         = "HealthCheckPercentageHealthy"
   namespace           = "AWS/Route53"
   period              = "60"
   statistic           = "Average"
@@ -596,9 +795,9 @@ resource "aws_cloudwatch_dashboard" "multi_region_dashboard" {
 
         properties = {
           metrics = [
-            ["AWS/Route53", "HealthCheckPercentHealthy", "HealthCheckId", aws_route53_health_check.primary_region_health.id, {region: "us-east-1", label: "US East 1 (Primary)"}],
-            ["AWS/Route53", "HealthCheckPercentHealthy", "HealthCheckId", aws_route53_health_check.europe_region_health.id, {region: "us-east-1", label: "EU West 1"}],
-            ["AWS/Route53", "HealthCheckPercentHealthy", "HealthCheckId", aws_route53_health_check.asia_region_health.id, {region: "us-east-1", label: "AP Southeast 1"}]
+            ["AWS/Route53", "HealthCheckPercentageHealthy", "HealthCheckId", aws_route53_health_check.primary_region_health.id, {region: "us-east-1", label: "US East 1 (Primary)"}],
+            ["AWS/Route53", "HealthCheckPercentageHealthy", "HealthCheckId", aws_route53_health_check.europe_region_health.id, {region: "us-east-1", label: "EU West 1"}],
+            ["AWS/Route53", "HealthCheckPercentageHealthy", "HealthCheckId", aws_route53_health_check.asia_region_health.id, {region: "us-east-1", label: "AP Southeast 1"}]
           ]
           period = 300
           stat   = "Average"
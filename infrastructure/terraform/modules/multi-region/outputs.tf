@@ -85,6 +85,7 @@ output "disaster_recovery_orchestrator" {
     function_arn           = aws_lambda_function.disaster_recovery_orchestrator.arn
     function_name          = aws_lambda_function.disaster_recovery_orchestrator.function_name
     sns_topic_arn          = aws_sns_topic.disaster_recovery_alerts.arn
+    reports_topic_arn      = aws_sns_topic.disaster_recovery_reports.arn
     multi_region_alarm_arn = aws_cloudwatch_metric_alarm.multi_region_health.arn
   }
 }
@@ -152,7 +153,7 @@ output "disaster_recovery_commands" {
 
     failback = {
       command = "aws lambda invoke --function-name ${aws_lambda_function.disaster_recovery_orchestrator.function_name} --payload '{\"action\":\"failback\"}' /tmp/response.json"
-      description = "Failback to primary region after recovery"
+      description = "Failback to primary region after recovery; refused unless the primary is HEALTHY (add \"force\":true to the payload to override)"
     }
 
     dr_test = {
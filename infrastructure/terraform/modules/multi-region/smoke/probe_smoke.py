@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Runs the service prober against a local stand-in for the application.
+
+The stand-in is a threaded http.server on 127.0.0.1 with an ephemeral port,
+serving a few endpoints that behave like the real ones:
+
+  /api/health    200, small JSON body
+  /api/books     200 after ~20 ms, larger JSON body
+  /api/slow      200 after ~300 ms
+  /api/flaky     503 on every fifth request
+
+Three probes run against it:
+
+  healthy   /api/health and /api/books against the default SLO   -> SUCCESS
+  latency   /api/slow against a 100 ms p95 target                -> FAILED
+  errors    /api/flaky against the default 1% error rate          -> FAILED
+
+A per-path SLO relaxing /api/slow to 1 s is checked to pass as well.
+
+Usage:
+  python3 smoke/probe_smoke.py
+"""
+
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(MODULE_DIR, 'templates'))
+
+from service_probe import verify_endpoints  # noqa: E402
+
+REQUESTS_PER_PATH = 100
+CONCURRENCY = 16
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    flaky_counter = itertools.count(1)
+
+    def do_GET(self):
+        status, delay, body = 200, 0.0, b'{"status":"ok"}'
+        if self.path == '/api/books':
+            delay, body = 0.02, json.dumps([{'id': i, 'title': f'Book {i}'} for i in range(200)]).encode()
+        elif self.path == '/api/slow':
+            delay = 0.3
+        elif self.path == '/api/flaky':
+            if next(self.flaky_counter) % 5 == 0:
+                status, body = 503, b'{"error":"unavailable"}'
+        elif self.path != '/api/health':
+            status, body = 404, b'{"error":"not found"}'
+
+        time.sleep(delay)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connects under the probe's concurrency,
+    # and the 1 s SYN retransmit would show up as latency
+    request_queue_size = 128
+
+
+def main():
+    server = StandInServer(('127.0.0.1', 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    cases = (
+        ('healthy', dict(paths=('/api/health', '/api/books')), 'SUCCESS'),
+        ('latency', dict(paths=('/api/slow',), slo={'p95_ms': 100.0, 'p99_ms': 200.0}), 'FAILED'),
+        ('errors', dict(paths=('/api/flaky',)), 'FAILED'),
+        ('path slo', dict(paths=('/api/health', '/api/slow'), slo={'p95_ms': 100.0, 'p99_ms': 200.0},
+                          path_slos={'/api/slow': {'p95_ms': 1000.0, 'p99_ms': 1500.0}}), 'SUCCESS'),
+    )
+    mismatches = []
+    try:
+        for name, options, expected in cases:
+            result = verify_endpoints(base_url, requests_per_path=REQUESTS_PER_PATH, concurrency=CONCURRENCY,
+                                      **options)
+            print(f"  {name:<9} {result['status']:<8} {result['details']}")
+            if result['status'] != expected:
+                mismatches.append(f"{name}: expected {expected}, got {result['status']}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for mismatch in mismatches:
+        print(f'  MISMATCH {mismatch}', file=sys.stderr)
+    print(f"probe smoke: {'FAILED' if mismatches else 'OK'}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+Database backup freshness check for the DR orchestrator.
+
+Enumerates automated and manual cluster snapshots in the primary region and
+cross-region copies in BACKUP_REGION with paginators, adds the primary's
+point-in-time restore window and the DR replica cluster, measures each
+restore point's age against the RPO target and picks the restore point a
+recovery would use. Results are cached per Lambda container for a short TTL so
+back-to-back status and test invocations do not hammer the RDS API.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+SNAPSHOT_TYPES = ('automated', 'manual')
+DEFAULT_TTL_SECONDS = 300
+
+# {(cluster_identifier, backup_region): (expires_at, result)}
+_cache = {}
+
+
+def _age_seconds(timestamp, now):
+    return round((now - timestamp).total_seconds())
+
+
+def list_cluster_snapshots(rds_client, cluster_identifier, snapshot_type):
+    """Yield every available snapshot of the given type for a cluster, page by page"""
+    paginator = rds_client.get_paginator('describe_db_cluster_snapshots')
+    pages = paginator.paginate(
+        SnapshotType=snapshot_type,
+        Filters=[{'Name': 'db-cluster-id', 'Values': [cluster_identifier]}],
+    )
+    for page in pages:
+        for snapshot in page.get('DBClusterSnapshots', []):
+            if snapshot.get('Status') == 'available' and snapshot.get('SnapshotCreateTime'):
+                yield snapshot
+
+
+def _newest(snapshots):
+    newest = None
+    count = 0
+    for snapshot in snapshots:
+        count += 1
+        if newest is None or snapshot['SnapshotCreateTime'] > newest['SnapshotCreateTime']:
+            newest = snapshot
+    return newest, count
+
+
+def _latest_restorable_time(rds_client, cluster_identifier):
+    clusters = rds_client.describe_db_clusters(DBClusterIdentifier=cluster_identifier)['DBClusters']
+    return clusters[0].get('LatestRestorableTime') if clusters else None
+
+
+def _replica_state(backup_rds_client, replica_identifier):
+    """Status of the DR replica cluster in the backup region"""
+    clusters = backup_rds_client.describe_db_clusters(DBClusterIdentifier=replica_identifier)['DBClusters']
+    if not clusters:
+        return None
+    return {'status': clusters[0].get('Status'),
+            'replication_source': clusters[0].get('ReplicationSourceIdentifier')}
+
+
+def evaluate_backups(rds_client, backup_rds_client, cluster_identifier, rpo_target_seconds, backup_region=None,
+                     replica_identifier=None, replica_lag=None):
+    """
+    Collect snapshot inventory and choose the freshest usable restore point.
+
+    Each source (primary snapshots, primary point-in-time, backup-region
+    copies, DR replica) is read on its own, so an unreachable primary region
+    leaves the backup-region state to decide. Only the absence of any restore
+    point fails; a restore point older than the RPO target is a warning.
+
+    replica_lag() returns the DR replica's lag in seconds, or None when it
+    cannot be read. A replica of unknown lag is not a restore point of known
+    age, so it is left out of the choice and the result is at best WARN.
+    """
+    now = datetime.now(timezone.utc)
+    candidates = []
+    inventory = {}
+    errors = []
+
+    sources = [('primary', rds_client, SNAPSHOT_TYPES)]
+    if backup_rds_client is not None:
+        # Cross-region copies are always manual snapshots in the backup region
+        sources.append(('backup', backup_rds_client, ('manual',)))
+
+    for location, client, snapshot_types in sources:
+        for snapshot_type in snapshot_types:
+            try:
+                newest, count = _newest(list_cluster_snapshots(client, cluster_identifier, snapshot_type))
+            except Exception as e:
+                errors.append(f'{location} {snapshot_type} snapshots: {e}')
+                inventory[f'{location}_{snapshot_type}'] = {'error': str(e)}
+                continue
+            summary = {'count': count}
+            if newest is not None:
+                summary.update({
+                    'newest_snapshot': newest['DBClusterSnapshotIdentifier'],
+                    'newest_time': newest['SnapshotCreateTime'].isoformat(),
+                    'age_seconds': _age_seconds(newest['SnapshotCreateTime'], now),
+                })
+                candidates.append({
+                    'type': 'snapshot',
+                    'snapshot_type': snapshot_type,
+                    'snapshot_identifier': newest['DBClusterSnapshotIdentifier'],
+                    'snapshot_arn': newest.get('DBClusterSnapshotArn'),
+                    'region': backup_region if location == 'backup' else 'primary',
+                    'time': newest['SnapshotCreateTime'],
+                })
+            inventory[f'{location}_{snapshot_type}'] = summary
+
+    try:
+        restorable = _latest_restorable_time(rds_client, cluster_identifier)
+        if restorable is not None:
+            candidates.append({'type': 'point_in_time', 'region': 'primary', 'time': restorable})
+    except Exception as e:
+        errors.append(f'primary point-in-time: {e}')
+
+    lag_unknown = False
+    if backup_rds_client is not None and replica_identifier:
+        try:
+            replica = _replica_state(backup_rds_client, replica_identifier)
+        except Exception as e:
+            replica = None
+            errors.append(f'DR replica {replica_identifier}: {e}')
+        if replica is not None and replica['status'] == 'available':
+            lag = replica_lag() if replica_lag is not None else None
+            inventory['replica'] = dict(replica, lag_seconds=lag)
+            if lag is None:
+                # No datapoints or no reading: replication may be exactly what is broken
+                lag_unknown = True
+            else:
+                candidates.append({'type': 'replica', 'region': backup_region, 'cluster': replica_identifier,
+                                   'time': now - timedelta(seconds=lag)})
+        elif replica is not None:
+            inventory['replica'] = replica
+
+    if not candidates:
+        if lag_unknown:
+            details = (f'No snapshot or point-in-time restore point for {cluster_identifier}; '
+                       f'DR replica {replica_identifier} is available but replica lag unknown')
+        else:
+            details = f'No restore point found for {cluster_identifier} in any region'
+        return {
+            'status': 'WARN' if lag_unknown else 'FAIL',
+            'details': details + (f" ({'; '.join(errors)})" if errors else ''),
+            'snapshots': inventory,
+            'errors': errors,
+            'restore_point': None,
+        }
+
+    restore_point = max(candidates, key=lambda candidate: candidate['time'])
+    age = _age_seconds(restore_point['time'], now)
+    restore_point = dict(restore_point, time=restore_point['time'].isoformat(), age_seconds=age)
+
+    within_rpo = age <= rpo_target_seconds
+    details = (f"Restore point {restore_point['type']} from {restore_point['region']} is {age}s old "
+               f"(RPO target {rpo_target_seconds}s)")
+    if not within_rpo:
+        details += f'; RPO missed by {age - rpo_target_seconds}s'
+    if lag_unknown:
+        details += f'; DR replica {replica_identifier} not counted, replica lag unknown'
+    if errors:
+        details += f" ({len(errors)} source(s) unreachable)"
+    return {
+        'status': 'PASS' if within_rpo and not lag_unknown else 'WARN',
+        'details': details,
+        'rpo_met': within_rpo,
+        'snapshots': inventory,
+        'errors': errors,
+        'restore_point': restore_point,
+    }
+
+
+def check_backups_cached(rds_client, backup_rds_client, cluster_identifier, rpo_target_seconds,
+                         backup_region=None, ttl_seconds=DEFAULT_TTL_SECONDS, replica_identifier=None,
+                         replica_lag=None):
+    """evaluate_backups() with a per-container TTL cache; replica_lag is only called on a miss"""
+    cache_key = (cluster_identifier, backup_region)
+    cached = _cache.get(cache_key)
+    now = time.time()
+    if cached and cached[0] > now:
+        return dict(cached[1], cached=True)
+
+    result = evaluate_backups(rds_client, backup_rds_client, cluster_identifier,
+                              rpo_target_seconds, backup_region, replica_identifier, replica_lag)
+    result['checked_at'] = datetime.now(timezone.utc).isoformat()
+    _cache[cache_key] = (now + ttl_seconds, result)
+    return dict(result, cached=False)
@@ -0,0 +1,197 @@
+"""
+Database failover for the DR orchestrator.
+
+Each cluster is moved to the writer role with the mechanism that fits it:
+
+  failover     member of an Aurora global database whose primary region is
+               lost: failover_global_cluster with AllowDataLoss, the managed
+               cross-region failover
+  switchover   member of an Aurora global database during a planned move
+               (failback, drills): switchover_global_cluster, which waits
+               for replication to catch up and loses nothing
+  promote      regional read replica cluster: promote_read_replica_db_cluster
+
+A cluster that already is the writer is left alone, so a retried failover
+does not start a second one. During a planned move outside a global
+database, the old writer only counts as the writer again once its DR
+counterpart is confirmed to replicate from it: a promoted DR cluster holds
+the writes made since the failover, and moving traffic back would lose
+them. Several clusters (the application database and the analytics
+replica, for example) are failed over in parallel, because each takes
+minutes and they do not depend on each other. A cluster only
+counts as failed over once the RDS API reports it as the writer and, when
+a write check is given, a real connection to its writer endpoint has
+committed a transaction id.
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_TIMEOUT_SECONDS = 600
+INITIAL_POLL_SECONDS = 5.0
+MAX_POLL_SECONDS = 30.0
+
+
+def describe_cluster(rds_client, identifier):
+    clusters = rds_client.describe_db_clusters(DBClusterIdentifier=identifier)['DBClusters']
+    if not clusters:
+        raise ValueError(f'Cluster {identifier} not found')
+    return clusters[0]
+
+
+def find_global_membership(rds_client, cluster_arn):
+    """(global cluster, member entry) for the cluster, or (None, None) outside a global database"""
+    paginator = rds_client.get_paginator('describe_global_clusters')
+    for page in paginator.paginate():
+        for global_cluster in page.get('GlobalClusters', []):
+            for member in global_cluster.get('GlobalClusterMembers', []):
+                if member['DBClusterArn'] == cluster_arn:
+                    return global_cluster, member
+    return None, None
+
+
+def is_writer(rds_client, identifier, global_cluster_identifier=None):
+    """The cluster is available and the RDS API reports it as the writer"""
+    cluster = describe_cluster(rds_client, identifier)
+    if cluster['Status'] != 'available':
+        return False, cluster
+    if global_cluster_identifier:
+        global_cluster = rds_client.describe_global_clusters(
+            GlobalClusterIdentifier=global_cluster_identifier)['GlobalClusters'][0]
+        if global_cluster.get('Status') != 'available':
+            return False, cluster
+        members = {member['DBClusterArn']: member for member in global_cluster['GlobalClusterMembers']}
+        return members.get(cluster['DBClusterArn'], {}).get('IsWriter', False), cluster
+    return not cluster.get('ReplicationSourceIdentifier'), cluster
+
+
+def start(rds_client, identifier, planned=False, replica=None):
+    """
+    Start moving the writer role to the cluster; returns (method, global cluster identifier).
+
+    replica is the (rds_client, identifier) of the cluster that has to
+    replicate from this one for a planned move to lose nothing.
+    """
+    cluster = describe_cluster(rds_client, identifier)
+    global_cluster, member = find_global_membership(rds_client, cluster['DBClusterArn'])
+
+    if global_cluster is not None:
+        global_id = global_cluster['GlobalClusterIdentifier']
+        if member.get('IsWriter'):
+            return 'already_writer', global_id
+        if planned:
+            rds_client.switchover_global_cluster(GlobalClusterIdentifier=global_id,
+                                                 TargetDbClusterIdentifier=cluster['DBClusterArn'])
+            return 'switchover', global_id
+        rds_client.failover_global_cluster(GlobalClusterIdentifier=global_id,
+                                           TargetDbClusterIdentifier=cluster['DBClusterArn'],
+                                           AllowDataLoss=True)
+        return 'failover', global_id
+
+    if cluster.get('ReplicationSourceIdentifier'):
+        if planned:
+            # A promoted replica cannot be switched back; it has to be re-seeded
+            return 'unsupported', None
+        rds_client.promote_read_replica_db_cluster(DBClusterIdentifier=identifier)
+        return 'promote', None
+    if planned:
+        if replica is None:
+            return 'unverified', None
+        if describe_cluster(*replica).get('ReplicationSourceIdentifier') != cluster['DBClusterArn']:
+            # The DR cluster was promoted and has taken writes since
+            return 'diverged', None
+    return 'already_writer', None
+
+
+def wait_writer(rds_client, identifier, global_cluster_identifier, started, timeout_seconds):
+    """Poll with jittered exponential backoff until the cluster is the writer; returns (writer?, cluster)"""
+    delay = INITIAL_POLL_SECONDS
+    while True:
+        writer, cluster = is_writer(rds_client, identifier, global_cluster_identifier)
+        if writer or time.monotonic() - started + delay > timeout_seconds:
+            return writer, cluster
+        time.sleep(delay * random.uniform(0.8, 1.2))
+        delay = min(delay * 2, MAX_POLL_SECONDS)
+
+
+def fail_over_cluster(rds_client, identifier, planned=False, timeout_seconds=DEFAULT_TIMEOUT_SECONDS,
+                      write_check=None, replica=None):
+    """
+    Make one cluster the writer and wait until it is.
+
+    write_check(cluster) receives the DescribeDBClusters entry of the new writer
+    and returns a dict with 'writable' and 'details'.
+    """
+    started = time.monotonic()
+    result = {'cluster': identifier}
+    try:
+        method, global_id = start(rds_client, identifier, planned, replica)
+        result['method'] = method
+        if method == 'unsupported':
+            result.update(status='SKIPPED',
+                          details=f'{identifier} is a promoted replica outside a global database; re-seed it to move the writer back')
+            return result
+        if method == 'diverged':
+            result.update(status='FAILED',
+                          details=f'{replica[1]} was promoted and holds the writes since the failover; '
+                                  f're-seed required before {identifier} can be the writer again')
+            return result
+        if method == 'unverified':
+            result.update(status='FAILED',
+                          details=f'{identifier} is outside a global database and no DR counterpart was given; '
+                                  f'cannot confirm the DR cluster replicates from it')
+            return result
+
+        writer, cluster = wait_writer(rds_client, identifier, global_id, started, timeout_seconds)
+        result['writer_endpoint'] = cluster.get('Endpoint')
+        if not writer:
+            result.update(status='FAILED',
+                          details=f"{identifier} not the writer after {time.monotonic() - started:.0f}s "
+                                  f"(cluster status {cluster['Status']})")
+            return result
+
+        if write_check is not None:
+            result['write_check'] = write_check(cluster)
+            if not result['write_check']['writable']:
+                result.update(status='FAILED',
+                              details=f"{identifier} is the writer but rejects writes: {result['write_check']['details']}")
+                return result
+
+        result.update(status='SUCCESS', details=f'{identifier} is the writer ({method})')
+    except Exception as e:
+        result.update(status='FAILED', details=f'{identifier}: {str(e)}')
+    finally:
+        result['seconds'] = round(time.monotonic() - started, 1)
+    return result
+
+
+def fail_over_clusters(clusters, planned=False, timeout_seconds=DEFAULT_TIMEOUT_SECONDS, write_check=None):
+    """
+    Fail over every (rds_client, identifier) pair in parallel; SUCCESS only if all of them succeed.
+
+    For planned moves an entry can be (rds_client, identifier, replica) with
+    replica the (rds_client, identifier) of its DR counterpart.
+    """
+    if not clusters:
+        return {'status': 'FAILED', 'details': 'No database clusters configured', 'clusters': []}
+
+    with ThreadPoolExecutor(max_workers=len(clusters)) as pool:
+        results = list(pool.map(
+            lambda entry: fail_over_cluster(entry[0], entry[1], planned, timeout_seconds, write_check,
+                                            entry[2] if len(entry) > 2 else None), clusters))
+
+    failed = [result for result in results if result['status'] == 'FAILED']
+    skipped = [result for result in results if result['status'] == 'SKIPPED']
+    if failed:
+        status = 'FAILED'
+    elif skipped:
+        status = 'PARTIAL'
+    else:
+        status = 'SUCCESS'
+    return {
+        'status': status,
+        'details': '; '.join(result['details'] for result in results),
+        'seconds': max(result['seconds'] for result in results),
+        'clusters': results,
+    }
@@ -0,0 +1,154 @@
+"""
+Route53 cutover for the DR orchestrator.
+
+The records that send traffic to a load balancer are found in the hosted
+zone by their target (alias target or CNAME value). A cutover rewrites all
+of them to the other load balancer in one ChangeResourceRecordSets batch.
+Route53 applies a batch atomically, so no resolver ever sees a mix of
+regions. The orchestrator then polls GetChange with exponential backoff
+until the change is INSYNC on every authoritative server. The time from
+submit to INSYNC is reported as the propagation time, together with the
+longest TTL that resolvers may still hold for the old answer.
+
+Alias records, which is every record the zone routes to a load balancer,
+use the load balancer's own 60 second TTL and have no TTL of their own to
+lower ahead of a cutover.
+
+Failover-routed records keep their set identifier and routing policy.
+While they point at the DR region the primary health check is removed from
+them, because it would otherwise fail them over again; failback puts it
+back.
+"""
+
+import random
+import time
+
+ROUTED_TYPES = ('A', 'AAAA', 'CNAME')
+ALIAS_TTL_SECONDS = 60
+DEFAULT_TIMEOUT_SECONDS = 300
+INITIAL_POLL_SECONDS = 1.0
+MAX_POLL_SECONDS = 10.0
+
+
+def normalize(name):
+    """Compare DNS names case-insensitively, without the trailing dot or ALB dualstack prefix"""
+    name = name.lower().rstrip('.')
+    return name[len('dualstack.'):] if name.startswith('dualstack.') else name
+
+
+def record_target(record):
+    if 'AliasTarget' in record:
+        return normalize(record['AliasTarget']['DNSName'])
+    values = record.get('ResourceRecords', [])
+    if record['Type'] == 'CNAME' and len(values) == 1:
+        return normalize(values[0]['Value'])
+    return None
+
+
+def records_targeting(route53_client, zone_id, load_balancer_dns, names=None):
+    """Record sets in the zone that route to load_balancer_dns, optionally limited to names"""
+    target = normalize(load_balancer_dns)
+    wanted = {normalize(name) for name in names} if names else None
+    records = []
+    paginator = route53_client.get_paginator('list_resource_record_sets')
+    for page in paginator.paginate(HostedZoneId=zone_id):
+        for record in page['ResourceRecordSets']:
+            if record['Type'] not in ROUTED_TYPES or record_target(record) != target:
+                continue
+            if wanted is None or normalize(record['Name']) in wanted:
+                records.append(record)
+    return records
+
+
+def cached_ttl(record):
+    """How long resolvers may keep serving this record's current answer"""
+    return ALIAS_TTL_SECONDS if 'AliasTarget' in record else record.get('TTL', 0)
+
+
+def retarget(record, dns_name, alias_zone_id, health_check_id=None):
+    updated = {key: value for key, value in record.items() if key != 'HealthCheckId'}
+    if 'AliasTarget' in record:
+        updated['AliasTarget'] = dict(record['AliasTarget'], DNSName=dns_name, HostedZoneId=alias_zone_id)
+    else:
+        updated['ResourceRecords'] = [{'Value': dns_name}]
+    if health_check_id:
+        updated['HealthCheckId'] = health_check_id
+    return updated
+
+
+def submit(route53_client, zone_id, records, comment):
+    response = route53_client.change_resource_record_sets(
+        HostedZoneId=zone_id,
+        ChangeBatch={
+            'Comment': comment,
+            'Changes': [{'Action': 'UPSERT', 'ResourceRecordSet': record} for record in records],
+        }
+    )
+    return response['ChangeInfo']['Id']
+
+
+def wait_insync(route53_client, change_id, started, timeout_seconds=DEFAULT_TIMEOUT_SECONDS):
+    """Poll GetChange with jittered exponential backoff; seconds are measured from started"""
+    delay = INITIAL_POLL_SECONDS
+    polls = 0
+    while True:
+        polls += 1
+        status = route53_client.get_change(Id=change_id)['ChangeInfo']['Status']
+        elapsed = time.monotonic() - started
+        if status == 'INSYNC':
+            return {'insync': True, 'seconds': round(elapsed, 1), 'polls': polls}
+        if elapsed + delay > timeout_seconds:
+            return {'insync': False, 'seconds': round(elapsed, 1), 'polls': polls}
+        time.sleep(delay * random.uniform(0.8, 1.2))
+        delay = min(delay * 2, MAX_POLL_SECONDS)
+
+
+def switch_records(route53_client, zone_id, source, target, primary_health_check_id=None,
+                   to_primary=False, names=None, timeout_seconds=DEFAULT_TIMEOUT_SECONDS):
+    """
+    Move every record routed to source onto target in one atomic change and wait until it is INSYNC.
+
+    source and target are (load balancer DNS name, load balancer hosted zone id).
+    to_primary restores primary_health_check_id on failover-routed records; otherwise
+    that health check is removed.
+    """
+    records = records_targeting(route53_client, zone_id, source[0], names)
+    if not records:
+        if records_targeting(route53_client, zone_id, target[0], names):
+            return {'status': 'SUCCESS', 'details': f'Records already route to {target[0]}',
+                    'records': [], 'propagation_seconds': 0, 'client_cache_seconds': 0}
+        return {'status': 'FAILED', 'details': f'No records in {zone_id} route to {source[0]}'}
+
+    changes = []
+    for record in records:
+        health_check_id = record.get('HealthCheckId')
+        if to_primary:
+            if not health_check_id and 'SetIdentifier' in record:
+                health_check_id = primary_health_check_id
+        elif health_check_id == primary_health_check_id:
+            health_check_id = None
+        changes.append(retarget(record, target[0], target[1], health_check_id))
+
+    started = time.monotonic()
+    change_id = submit(route53_client, zone_id, changes, f'DR cutover to {target[0]}')
+    sync = wait_insync(route53_client, change_id, started, timeout_seconds)
+
+    names = sorted({record['Name'] for record in records})
+    client_cache = max(cached_ttl(record) for record in records)
+    result = {
+        'records': names,
+        'change_id': change_id,
+        'propagation_seconds': sync['seconds'],
+        'client_cache_seconds': client_cache,
+        'polls': sync['polls'],
+    }
+    if sync['insync']:
+        result.update(status='SUCCESS',
+                      details=f"{len(changes)} records moved to {target[0]} in one change, INSYNC after "
+                              f"{sync['seconds']}s (resolvers may cache the old answer up to {client_cache}s)")
+    else:
+        result.update(status='PARTIAL',
+                      details=f"Change {change_id} for {len(changes)} records submitted but not INSYNC "
+                              f"after {sync['seconds']}s")
+    return result
+
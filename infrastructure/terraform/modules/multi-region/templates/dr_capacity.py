@@ -0,0 +1,253 @@
+"""
+DR capacity planner for the orchestrator.
+
+Sizes the DR ECS service from what the primary region actually served
+recently instead of a fixed task count. Task count, CPU and ALB request
+rate are read from CloudWatch in a single GetMetricData call; the required
+task count is the larger of the CPU-based and request-based estimates plus
+headroom, clamped to the configured bounds. Before scaling, the Fargate
+vCPU quota and the free IP addresses of the service subnets in the DR
+region are checked so the scale-up can be done in one update.
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_LOOKBACK_SECONDS = 3 * 3600
+DEFAULT_PERIOD_SECONDS = 60
+
+# Fargate On-Demand vCPU resource count
+FARGATE_SERVICE_CODE = 'fargate'
+FARGATE_VCPU_QUOTA_CODE = 'L-3032A538'
+FARGATE_USAGE_DIMENSIONS = [
+    {'Name': 'Service', 'Value': 'Fargate'},
+    {'Name': 'Type', 'Value': 'Resource'},
+    {'Name': 'Resource', 'Value': 'vCPU'},
+    {'Name': 'Class', 'Value': 'OnDemand'},
+]
+
+# Last successful plan per (cluster, service), reused when the primary
+# region's metrics can no longer be read mid-outage
+_last_plan = {}
+
+
+def metric_query(query_id, namespace, metric_name, dimensions, stat, period):
+    return {
+        'Id': query_id,
+        'MetricStat': {
+            'Metric': {
+                'Namespace': namespace,
+                'MetricName': metric_name,
+                'Dimensions': [{'Name': name, 'Value': value} for name, value in dimensions],
+            },
+            'Period': period,
+            'Stat': stat,
+        },
+        'ReturnData': True,
+    }
+
+
+def get_metric_series(cloudwatch_client, queries, start_time, end_time):
+    """Run one GetMetricData request (following NextToken) and return {id: [values]}"""
+    series = {query['Id']: [] for query in queries}
+    kwargs = {
+        'MetricDataQueries': queries,
+        'StartTime': start_time,
+        'EndTime': end_time,
+        'ScanBy': 'TimestampDescending',
+    }
+    while True:
+        response = cloudwatch_client.get_metric_data(**kwargs)
+        for result in response.get('MetricDataResults', []):
+            series[result['Id']].extend(result.get('Values', []))
+        if not response.get('NextToken'):
+            return series
+        kwargs['NextToken'] = response['NextToken']
+
+
+def read_primary_load(cloudwatch_client, cluster_name, service_name, load_balancer=None,
+                      lookback_seconds=DEFAULT_LOOKBACK_SECONDS, period=DEFAULT_PERIOD_SECONDS):
+    """Peak running tasks, CPU utilization and request rate of the primary service"""
+    service_dimensions = [('ClusterName', cluster_name), ('ServiceName', service_name)]
+    queries = [
+        metric_query('tasks', 'ECS/ContainerInsights', 'RunningTaskCount',
+                     service_dimensions, 'Maximum', period),
+        metric_query('cpu', 'AWS/ECS', 'CPUUtilization', service_dimensions, 'Average', period),
+    ]
+    if load_balancer:
+        queries.append(metric_query('requests', 'AWS/ApplicationELB', 'RequestCount',
+                                    [('LoadBalancer', load_balancer)], 'Sum', period))
+
+    end_time = datetime.now(timezone.utc)
+    series = get_metric_series(cloudwatch_client, queries,
+                               end_time - timedelta(seconds=lookback_seconds), end_time)
+
+    requests = series.get('requests', [])
+    return {
+        'peak_tasks': max(series['tasks']) if series['tasks'] else None,
+        'peak_cpu_percent': round(max(series['cpu']), 2) if series['cpu'] else None,
+        'peak_requests_per_second': round(max(requests) / period, 2) if requests else None,
+        'datapoints': {key: len(values) for key, values in series.items()},
+        'lookback_seconds': lookback_seconds,
+    }
+
+
+def compute_required_tasks(load, target_cpu_percent=60, requests_per_task=0, headroom=0.3,
+                           min_tasks=1, max_tasks=50):
+    """
+    Turn observed peak load into a DR task count.
+
+    CPU estimate: the work done by peak_tasks at peak_cpu_percent, spread
+    over tasks running at target_cpu_percent. Request estimate: peak request
+    rate over the sustainable rate of one task. Headroom covers cold caches
+    and the retry burst that follows a cutover.
+    """
+    estimates = {}
+    if load.get('peak_tasks') and load.get('peak_cpu_percent') is not None:
+        estimates['cpu'] = math.ceil(load['peak_tasks'] * load['peak_cpu_percent'] / target_cpu_percent)
+    if requests_per_task and load.get('peak_requests_per_second') is not None:
+        estimates['requests'] = math.ceil(load['peak_requests_per_second'] / requests_per_task)
+
+    if not estimates:
+        return {'required_tasks': min_tasks, 'basis': 'minimum', 'estimates': estimates}
+
+    basis = max(estimates, key=estimates.get)
+    required = math.ceil(estimates[basis] * (1 + headroom))
+    return {
+        'required_tasks': max(min_tasks, min(max_tasks, required)),
+        'basis': basis,
+        'estimates': estimates,
+        'headroom': headroom,
+        'capped': required > max_tasks,
+    }
+
+
+def plan_capacity(cloudwatch_client, cluster_name, service_name, load_balancer=None,
+                  target_cpu_percent=60, requests_per_task=0, headroom=0.3,
+                  min_tasks=1, max_tasks=50, lookback_seconds=DEFAULT_LOOKBACK_SECONDS):
+    """Read primary load and compute the DR task count, falling back to the last plan"""
+    cache_key = (cluster_name, service_name)
+    try:
+        load = read_primary_load(cloudwatch_client, cluster_name, service_name,
+                                 load_balancer, lookback_seconds)
+    except Exception as e:
+        print(f"Could not read primary load for {service_name}: {e}")
+        previous = _last_plan.get(cache_key)
+        if previous is not None:
+            return dict(previous, source='cached')
+        return {'required_tasks': min_tasks, 'basis': 'minimum', 'estimates': {},
+                'load': None, 'source': 'fallback', 'error': str(e)}
+
+    plan = compute_required_tasks(load, target_cpu_percent, requests_per_task,
+                                  headroom, min_tasks, max_tasks)
+    plan['load'] = load
+    plan['planned_at'] = datetime.now(timezone.utc).isoformat()
+    if plan['basis'] != 'minimum':
+        _last_plan[cache_key] = plan
+    return dict(plan, source='cloudwatch')
+
+
+def _task_vcpu(ecs_client, task_definition):
+    definition = ecs_client.describe_task_definition(taskDefinition=task_definition)['taskDefinition']
+    # Task-level cpu is in CPU units (1024 = 1 vCPU)
+    return int(definition.get('cpu') or 0) / 1024.0
+
+
+def _uses_fargate(service):
+    if service.get('launchType') == 'FARGATE':
+        return True
+    return any(item.get('capacityProvider', '').startswith('FARGATE')
+               for item in service.get('capacityProviderStrategy', []))
+
+
+def _fargate_vcpu_headroom(quotas_client, cloudwatch_client):
+    """Fargate vCPU quota and current usage in the DR region"""
+    quota = quotas_client.get_service_quota(
+        ServiceCode=FARGATE_SERVICE_CODE, QuotaCode=FARGATE_VCPU_QUOTA_CODE
+    )['Quota']['Value']
+
+    usage = 0.0
+    if cloudwatch_client is not None:
+        end_time = datetime.now(timezone.utc)
+        query = {
+            'Id': 'vcpu',
+            'MetricStat': {
+                'Metric': {'Namespace': 'AWS/Usage', 'MetricName': 'ResourceCount',
+                           'Dimensions': FARGATE_USAGE_DIMENSIONS},
+                'Period': 60,
+                'Stat': 'Maximum',
+            },
+            'ReturnData': True,
+        }
+        values = get_metric_series(cloudwatch_client, [query],
+                                   end_time - timedelta(minutes=15), end_time)['vcpu']
+        if values:
+            usage = values[0]
+    return quota, usage
+
+
+def _free_subnet_ips(ec2_client, subnet_ids):
+    subnets = ec2_client.describe_subnets(SubnetIds=subnet_ids)['Subnets']
+    return {subnet['SubnetId']: subnet['AvailableIpAddressCount'] for subnet in subnets}
+
+
+def check_capacity(ecs_client, quotas_client, ec2_client, cluster_name, service_name,
+                   required_tasks, cloudwatch_client=None):
+    """
+    Check that the DR region can run required_tasks for the service.
+
+    Returns a DR check result with the largest task count the region can
+    actually hold ('feasible_tasks'), so a failover can still scale as far
+    as possible when it cannot reach the full plan.
+    """
+    services = ecs_client.describe_services(cluster=cluster_name, services=[service_name])['services']
+    if not services:
+        return {'status': 'FAIL', 'details': f'ECS service {service_name} not found', 'feasible_tasks': 0}
+
+    service = services[0]
+    running = max(service.get('runningCount', 0), service.get('desiredCount', 0))
+    additional = max(0, required_tasks - running)
+    limits = {}
+    result = {
+        'required_tasks': required_tasks,
+        'current_tasks': running,
+        'additional_tasks': additional,
+    }
+
+    if _uses_fargate(service):
+        task_vcpu = _task_vcpu(ecs_client, service['taskDefinition'])
+        quota, usage = _fargate_vcpu_headroom(quotas_client, cloudwatch_client)
+        available_vcpu = max(0.0, quota - usage)
+        result['fargate_vcpu'] = {'quota': quota, 'in_use': usage, 'per_task': task_vcpu}
+        if task_vcpu:
+            limits['quota'] = running + int(available_vcpu // task_vcpu)
+
+    subnet_ids = (service.get('networkConfiguration', {})
+                  .get('awsvpcConfiguration', {})
+                  .get('subnets', []))
+    if subnet_ids:
+        # awsvpc tasks each take one ENI, i.e. one address, in a service subnet
+        free_ips = _free_subnet_ips(ec2_client, subnet_ids)
+        result['subnet_free_ips'] = free_ips
+        limits['subnets'] = running + sum(free_ips.values())
+
+    feasible = min([required_tasks] + list(limits.values()))
+    result['feasible_tasks'] = feasible
+    result['limits'] = limits
+
+    if feasible >= required_tasks:
+        result['status'] = 'PASS'
+        result['details'] = f'DR region can run {required_tasks} tasks ({additional} more than now)'
+    else:
+        blocking = ', '.join(name for name, limit in sorted(limits.items()) if limit < required_tasks)
+        result['status'] = 'FAIL'
+        result['details'] = (
+            f'DR region can run {feasible} of {required_tasks} required tasks (limited by {blocking})'
+        )
+    return result
+
+
+def scale_service(ecs_client, cluster_name, service_name, desired_count):
+    """Set the service's desired count in a single UpdateService call"""
+    ecs_client.update_service(cluster=cluster_name, service=service_name, desiredCount=desired_count)
+    return desired_count
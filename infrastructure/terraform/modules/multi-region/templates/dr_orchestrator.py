@@ -1,31 +1,72 @@
 import json
-import boto3
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import time
 
+from db_backups import check_backups_cached
+from db_failover import fail_over_clusters
+from dns_cutover import switch_records
+from drill_history import make_record, open_store, trend
+from dr_capacity import check_capacity, get_metric_series, metric_query, plan_capacity, scale_service
+from notifier import Notifier
+from ops_runtime import (
+    LazyClient,
+    aws_client,
+    env,
+    env_int,
+    env_json,
+    env_list,
+    invocation_started,
+    require_env,
+    response,
+)
+from s3_replication import verify_replication
+from warm_standby import (
+    ACTIVE,
+    DEGRADED,
+    HEALTHY,
+    NO_DATA,
+    PILOT_LIGHT,
+    UNHEALTHY,
+    UNKNOWN,
+    WARM,
+    classify_health,
+    decide,
+    describe_service,
+    get_mode,
+    prewarm,
+    read_primary_signals,
+    release_capacity_reservation,
+    set_mode,
+)
+
+# Notification queue of the current invocation
+_notifier = None
+
+# Seconds kept after the last wait for notifications and the history record
+WRAP_UP_SECONDS = 60
+
 def handler(event, context):
     """
     Disaster Recovery Orchestrator for 1001 Stories
     Handles automatic failover and recovery procedures
     """
 
-    # Initialize AWS clients
-    ecs_client = boto3.client('ecs')
-    rds_client = boto3.client('rds')
-    route53_client = boto3.client('route53')
-    sns_client = boto3.client('sns')
-    cloudwatch_client = boto3.client('cloudwatch')
-
-    # Environment variables
-    primary_region = os.environ['PRIMARY_REGION']
-    backup_region = os.environ['BACKUP_REGION']
-    dr_cluster_name = os.environ['DR_CLUSTER_NAME']
-    dr_service_name = os.environ['DR_SERVICE_NAME']
-    db_cluster_identifier = os.environ['DATABASE_CLUSTER_IDENTIFIER']
+    invocation_started()
+    require_env('PRIMARY_REGION', 'BACKUP_REGION', 'DR_CLUSTER_NAME', 'DR_SERVICE_NAME',
+                'DATABASE_CLUSTER_IDENTIFIER', 'SNS_TOPIC_ARN', 'RTO_TARGET_SECONDS', 'RPO_TARGET_SECONDS')
     sns_topic_arn = os.environ['SNS_TOPIC_ARN']
-    rto_target = int(os.environ['RTO_TARGET_SECONDS'])
-    rpo_target = int(os.environ['RPO_TARGET_SECONDS'])
+
+    # AWS clients are created on first use, so each action only loads the
+    # service models it calls (the DR ECS cluster lives in the backup region)
+    ecs_client = LazyClient('ecs', os.environ['BACKUP_REGION'])
+    rds_client = LazyClient('rds')
+    route53_client = LazyClient('route53')
+    sns_client = LazyClient('sns')
+    cloudwatch_client = LazyClient('cloudwatch')
+    s3_client = LazyClient('s3')
+
+    start_notifications(sns_client)
 
     try:
         # Determine the type of DR event
@@ -36,13 +77,19 @@ def handler(event, context):
             return handle_automated_failover(event, context, ecs_client, rds_client, route53_client, sns_client, cloudwatch_client)
         elif event.get('action') == 'failover':
             # Manual failover trigger
-            return handle_manual_failover(event, context, ecs_client, rds_client, route53_client, sns_client)
+            return handle_manual_failover(event, context, ecs_client, rds_client, route53_client, sns_client, cloudwatch_client)
         elif event.get('action') == 'failback':
             # Failback to primary region
             return handle_failback(event, context, ecs_client, rds_client, route53_client, sns_client)
+        elif event.get('action') == 'standby':
+            # Scheduled pilot light / warm standby evaluation
+            return handle_standby_check(event, context, ecs_client, sns_client, cloudwatch_client)
         elif event.get('action') == 'test':
             # DR test
-            return handle_dr_test(event, context, ecs_client, rds_client, sns_client)
+            return handle_dr_test(event, context, ecs_client, rds_client, sns_client, s3_client, cloudwatch_client)
+        elif event.get('action') == 'trend':
+            # RTO/RPO trend over the stored drill and failover history
+            return handle_trend(event, context, sns_client, s3_client)
         else:
             # Status check
             return handle_status_check(event, context, ecs_client, rds_client, sns_client)
@@ -51,16 +98,17 @@ def handler(event, context):
         error_message = f"Disaster Recovery Orchestrator Error: {str(e)}"
         send_notification(sns_client, sns_topic_arn, error_message, "CRITICAL")
 
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'status': 'error',
-                'message': error_message,
-                'timestamp': datetime.utcnow().isoformat()
-            })
-        }
+        return response(500, {
+            'status': 'error',
+            'message': error_message,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+
+    finally:
+        flush_notifications()
 
-def handle_automated_failover(event, context, ecs_client, rds_client, route53_client, sns_client, cloudwatch_client):
+def handle_automated_failover(event, context, ecs_client, rds_client, route53_client, sns_client, cloudwatch_client,
+                              initiated_by='CloudWatch alarm'):
     """Handle automated failover triggered by CloudWatch alarm"""
 
     start_time = datetime.utcnow()
@@ -68,10 +116,25 @@ def handle_automated_failover(event, context, ecs_client, rds_client, route53_cl
     # Verify primary region is actually down
     primary_health = check_primary_region_health(cloudwatch_client)
 
-    if primary_health['status'] != 'UNHEALTHY':
-        message = "False alarm: Primary region appears healthy. Failover cancelled."
+    if primary_health['status'] == NO_DATA:
+        message = (f"Failover alarm fired but primary health has no data ({primary_health['details']}). "
+                   f"Failover cancelled; check the primary region and fail over manually if it is down.\n"
+                   f"Initiated by: {initiated_by}")
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'], message, "CRITICAL")
+        return response(200, {'status': 'cancelled', 'reason': 'no_health_data'})
+
+    if primary_health['status'] == UNKNOWN:
+        message = (f"Failover alarm fired but primary health could not be read ({primary_health['details']}). "
+                   f"Failover cancelled; check the primary region and fail over manually if it is down.\n"
+                   f"Initiated by: {initiated_by}")
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'], message, "CRITICAL")
+        return response(200, {'status': 'cancelled', 'reason': 'health_unknown'})
+
+    if primary_health['status'] != UNHEALTHY:
+        message = (f"False alarm: Primary region is {primary_health['status']}, not down "
+                   f"({primary_health['details']}). Failover cancelled.\nInitiated by: {initiated_by}")
         send_notification(sns_client, os.environ['SNS_TOPIC_ARN'], message, "WARNING")
-        return {'statusCode': 200, 'body': json.dumps({'status': 'cancelled', 'reason': 'primary_healthy'})}
+        return response(200, {'status': 'cancelled', 'reason': 'primary_healthy'})
 
     # Execute failover sequence
     failover_steps = [
@@ -83,6 +146,15 @@ def handle_automated_failover(event, context, ecs_client, rds_client, route53_cl
     ]
 
     current_step = 0
+    # Seconds spent in each step, reported as the breakdown of the RTO
+    step_seconds = {}
+    step_started = time.monotonic()
+
+    def finish_step(name):
+        nonlocal step_started
+        now = time.monotonic()
+        step_seconds[name] = round(now - step_started, 1)
+        step_started = now
 
     try:
         # Step 1: Verify DR region readiness
@@ -90,30 +162,49 @@ def handle_automated_failover(event, context, ecs_client, rds_client, route53_cl
         dr_readiness = verify_dr_readiness(ecs_client, rds_client)
         if not dr_readiness['ready']:
             raise Exception(f"DR region not ready: {dr_readiness['reason']}")
+        if dr_readiness.get('warnings'):
+            send_notification(sns_client, os.environ['SNS_TOPIC_ARN'],
+                              "Failing over with warnings:\n" + "\n".join(dr_readiness['warnings']), "WARNING")
+        finish_step('readiness')
 
         # Step 2: Promote database
         current_step = 2
-        db_promotion = promote_database(rds_client)
+        db_promotion = promote_database(step_timeout(context, env_int('DATABASE_FAILOVER_TIMEOUT_SECONDS', 420)))
+        if db_promotion['status'] != 'SUCCESS':
+            raise Exception(f"Database failover failed: {db_promotion['details']}")
+        finish_step('database')
 
         # Step 3: Scale up application
         current_step = 3
-        app_scaling = scale_up_application(ecs_client)
+        app_scaling = scale_up_application(ecs_client, cloudwatch_client)
+        finish_step('application')
 
         # Step 4: Update DNS
         current_step = 4
-        dns_update = update_dns_routing(route53_client, 'failover')
+        dns_update = update_dns_routing(route53_client, 'failover',
+                                        step_timeout(context, env_int('DNS_CHANGE_TIMEOUT_SECONDS', 300)))
+        if dns_update['status'] == 'FAILED':
+            raise Exception(f"DNS cutover failed: {dns_update['details']}")
+        finish_step('dns')
 
         # Step 5: Verify services
         current_step = 5
-        service_verification = verify_service_health()
+        service_verification = verify_service_health(step_timeout(context, env_int('HEALTH_PROBE_WAIT_SECONDS', 300)))
+        if service_verification['status'] != 'SUCCESS':
+            raise Exception(f"DR endpoints do not meet the SLO: {service_verification['details']}")
+        finish_step('verification')
 
         end_time = datetime.utcnow()
         failover_duration = (end_time - start_time).total_seconds()
+        rto_breakdown = dict(step_seconds,
+                             dns_propagation=dns_update.get('propagation_seconds'),
+                             client_dns_cache=dns_update.get('client_cache_seconds'))
 
         # Send success notification
         success_message = f"""
 DISASTER RECOVERY COMPLETED SUCCESSFULLY
 
+Initiated by: {initiated_by}
 Failover Duration: {failover_duration} seconds
 RTO Target: {os.environ['RTO_TARGET_SECONDS']} seconds
 RTO Status: {'✅ MET' if failover_duration <= int(os.environ['RTO_TARGET_SECONDS']) else '❌ EXCEEDED'}
@@ -121,8 +212,10 @@ RTO Status: {'✅ MET' if failover_duration <= int(os.environ['RTO_TARGET_SECOND
 Services Status:
 - Database: {db_promotion['status']}
 - Application: {app_scaling['status']}
-- DNS Routing: {dns_update['status']}
-- Health Check: {service_verification['status']}
+- DNS Routing: {dns_update['status']} ({dns_update['details']})
+- Health Check: {service_verification['status']} ({service_verification['details']})
+
+RTO Breakdown (seconds): {', '.join(f'{step} {seconds}' for step, seconds in rto_breakdown.items())}
 
 Next Steps:
 1. Monitor service performance in DR region
@@ -131,28 +224,36 @@ Next Steps:
         """
 
         send_notification(sns_client, os.environ['SNS_TOPIC_ARN'], success_message, "SUCCESS")
-
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'status': 'success',
-                'failover_duration_seconds': failover_duration,
-                'rto_met': failover_duration <= int(os.environ['RTO_TARGET_SECONDS']),
-                'services': {
-                    'database': db_promotion,
-                    'application': app_scaling,
-                    'dns': dns_update,
-                    'health_check': service_verification
-                },
-                'timestamp': end_time.isoformat()
-            })
-        }
+        record_history(make_record(
+            'failover', 'success',
+            steps=rto_breakdown,
+            rto_seconds=round(failover_duration, 1),
+            rpo_seconds=primary_health.get('replication_lag_seconds'),
+            probe=probe_summary(service_verification),
+            replication_lag_seconds=primary_health.get('replication_lag_seconds'),
+            details=initiated_by
+        ))
+
+        return response(200, {
+            'status': 'success',
+            'failover_duration_seconds': failover_duration,
+            'rto_met': failover_duration <= int(os.environ['RTO_TARGET_SECONDS']),
+            'rto_breakdown': rto_breakdown,
+            'services': {
+                'database': db_promotion,
+                'application': app_scaling,
+                'dns': dns_update,
+                'health_check': service_verification
+            },
+            'timestamp': end_time.isoformat()
+        })
 
     except Exception as e:
         # Send failure notification with current step
         failure_message = f"""
 DISASTER RECOVERY FAILED
 
+Initiated by: {initiated_by}
 Failed at Step {current_step}: {failover_steps[current_step-1]}
 Error: {str(e)}
 
@@ -161,65 +262,111 @@ Contact on-call engineer immediately.
         """
 
         send_notification(sns_client, os.environ['SNS_TOPIC_ARN'], failure_message, "CRITICAL")
+        record_history(make_record(
+            'failover', 'failed',
+            steps=step_seconds,
+            replication_lag_seconds=primary_health.get('replication_lag_seconds'),
+            details=f"step {current_step}: {str(e)}"
+        ))
+
+        return response(500, {
+            'status': 'failed',
+            'failed_step': current_step,
+            'failed_operation': failover_steps[current_step-1],
+            'error': str(e),
+            'step_seconds': step_seconds
+        })
 
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'status': 'failed',
-                'failed_step': current_step,
-                'failed_operation': failover_steps[current_step-1],
-                'error': str(e)
-            })
-        }
-
-def handle_manual_failover(event, context, ecs_client, rds_client, route53_client, sns_client):
+def handle_manual_failover(event, context, ecs_client, rds_client, route53_client, sns_client, cloudwatch_client=None):
     """Handle manual failover request"""
 
     confirmation_token = event.get('confirmation_token')
     if not confirmation_token or confirmation_token != "CONFIRM_MANUAL_FAILOVER":
-        return {
-            'statusCode': 400,
-            'body': json.dumps({
-                'status': 'error',
-                'message': 'Manual failover requires confirmation token: CONFIRM_MANUAL_FAILOVER'
-            })
-        }
-
-    message = "Manual disaster recovery failover initiated by administrator."
-    send_notification(sns_client, os.environ['SNS_TOPIC_ARN'], message, "WARNING")
+        return response(400, {
+            'status': 'error',
+            'message': 'Manual failover requires confirmation token: CONFIRM_MANUAL_FAILOVER'
+        })
 
-    # Execute same failover logic as automated
-    return handle_automated_failover(event, context, ecs_client, rds_client, route53_client, sns_client, None)
+    # Execute same failover logic as automated; its outcome notification
+    # records the manual trigger instead of a separate "initiated" page
+    return handle_automated_failover(event, context, ecs_client, rds_client, route53_client, sns_client,
+                                     cloudwatch_client, initiated_by='administrator (manual failover)')
 
 def handle_failback(event, context, ecs_client, rds_client, route53_client, sns_client):
-    """Handle failback to primary region"""
+    """Handle failback to primary region; refused unless the primary is HEALTHY or the event has "force": true"""
+
+    # Verify primary region is healthy; degraded, unreadable or silent health is not a go
+    primary_health = check_primary_region_health()
+    if primary_health['status'] != HEALTHY and event.get('force') is not True:
+        return response(409, {
+            'status': 'error',
+            'message': f"Primary region is {primary_health['status']}: {primary_health['details']}. "
+                       f"Fail back only once it is HEALTHY, or set \"force\": true to override"
+        })
+    if primary_health['status'] != HEALTHY:
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'],
+                          f"Forced failback with primary region {primary_health['status']}: "
+                          f"{primary_health['details']}", "WARNING")
+
+    started = time.monotonic()
+
+    # Move the database writer back without data loss, then the traffic
+    db_switchover = restore_primary_database(rds_client,
+                                             step_timeout(context, env_int('DATABASE_FAILOVER_TIMEOUT_SECONDS', 420)))
+    # Any cluster left behind (diverged, skipped) means DNS stays on the DR region
+    if db_switchover['status'] != 'SUCCESS':
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'],
+                          f"Failback database switchover failed: {db_switchover['details']}", "CRITICAL")
+        record_history(make_record('failback', 'failed', steps={'database': db_switchover.get('seconds')},
+                                   details=db_switchover['details']))
+        return response(500, {'status': 'failed', 'operation': 'failback', 'database': db_switchover})
 
-    # Verify primary region is healthy
-    # Scale down DR region
     # Update DNS back to primary
-    # Send notifications
+    dns_update = update_dns_routing(route53_client, 'failback',
+                                    step_timeout(context, env_int('DNS_CHANGE_TIMEOUT_SECONDS', 300)))
+    steps = {'database': db_switchover.get('seconds'), 'dns': dns_update.get('propagation_seconds')}
+    if dns_update['status'] == 'FAILED':
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'],
+                          f"Failback DNS update failed: {dns_update['details']}", "CRITICAL")
+        record_history(make_record('failback', 'failed', steps=steps, details=dns_update['details']))
+        return response(500, {'status': 'failed', 'operation': 'failback', 'dns': dns_update})
+    record_history(make_record('failback', 'success', steps=steps, rto_seconds=round(time.monotonic() - started, 1)))
+
+    # Hand the DR service back to the standby loop, which returns it to pilot
+    # light once the primary has stayed healthy for the recovery window
+    try:
+        service = describe_service(ecs_client, os.environ['DR_CLUSTER_NAME'], os.environ['DR_SERVICE_NAME'])
+        set_mode(ecs_client, service['serviceArn'], WARM, last_degraded=datetime.now(timezone.utc))
+    except Exception as e:
+        print(f"Could not return DR service to standby: {e}")
 
-    message = "Failback operation completed. Traffic restored to primary region."
+    message = (f"Failback operation completed. Traffic restored to primary region.\n"
+               f"Database: {db_switchover['details']}\nDNS: {dns_update['details']}")
     send_notification(sns_client, os.environ['SNS_TOPIC_ARN'], message, "SUCCESS")
 
-    return {
-        'statusCode': 200,
-        'body': json.dumps({
-            'status': 'success',
-            'operation': 'failback',
-            'timestamp': datetime.utcnow().isoformat()
-        })
-    }
+    return response(200, {
+        'status': 'success',
+        'operation': 'failback',
+        'database': db_switchover,
+        'dns': dns_update,
+        'timestamp': datetime.utcnow().isoformat()
+    })
 
-def handle_dr_test(event, context, ecs_client, rds_client, sns_client):
+def handle_dr_test(event, context, ecs_client, rds_client, sns_client, s3_client=None, cloudwatch_client=None):
     """Handle DR test without affecting production"""
 
-    test_results = {
-        'database_backup_status': check_database_backups(rds_client),
-        'dr_capacity_available': check_dr_capacity(ecs_client),
-        'cross_region_replication': check_s3_replication(),
-        'automation_scripts': test_automation_scripts()
+    checks = {
+        'database_backup_status': lambda: check_database_backups(rds_client),
+        'dr_capacity_available': lambda: check_dr_capacity(ecs_client, cloudwatch_client),
+        'cross_region_replication': lambda: check_s3_replication(s3_client),
+        'automation_scripts': test_automation_scripts
     }
+    test_results = {}
+    step_seconds = {}
+    for name, check in checks.items():
+        started = time.monotonic()
+        test_results[name] = check()
+        step_seconds[name] = round(time.monotonic() - started, 2)
 
     test_passed = all(result['status'] == 'PASS' for result in test_results.values())
 
@@ -236,15 +383,48 @@ Automation: {test_results['automation_scripts']['status']}
 
     send_notification(sns_client, os.environ['SNS_TOPIC_ARN'], message, "INFO")
 
-    return {
-        'statusCode': 200,
-        'body': json.dumps({
-            'status': 'success',
-            'test_passed': test_passed,
-            'test_results': test_results,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-    }
+    # The drill's RPO is the data a failover would lose now: replication lag
+    # for the global database, otherwise the age of the newest restore point.
+    # Its RTO is the time the rehearsed path took, the sum of the check steps
+    lag = check_replication_lag(rds_client, cloudwatch_client)['lag_seconds']
+    restore_point = test_results['database_backup_status'].get('restore_point') or {}
+    record_history(make_record(
+        'drill', 'passed' if test_passed else 'failed',
+        steps=step_seconds,
+        rto_seconds=round(sum(step_seconds.values()), 1),
+        rpo_seconds=lag if lag is not None else restore_point.get('age_seconds'),
+        replication_lag_seconds=lag,
+        details=', '.join(name for name, result in test_results.items() if result['status'] != 'PASS')
+    ))
+
+    return response(200, {
+        'status': 'success',
+        'test_passed': test_passed,
+        'test_results': test_results,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+def handle_trend(event, context, sns_client, s3_client=None):
+    """Rolling RTO/RPO percentiles over the drill and failover history"""
+    if not env('DR_HISTORY_LOCATION'):
+        return response(400, {'status': 'error', 'message': 'DR_HISTORY_LOCATION not configured'})
+
+    since = datetime.now(timezone.utc) - timedelta(days=int(event.get('days', env_int('DR_HISTORY_TREND_DAYS', 180))))
+    records = open_store(os.environ['DR_HISTORY_LOCATION'], s3_client).read(since)
+    if event.get('kind'):
+        records = [record for record in records if record['kind'] == event['kind']]
+    report = trend(records, int(os.environ['RTO_TARGET_SECONDS']), int(os.environ['RPO_TARGET_SECONDS']),
+                   window=int(event.get('window', env_int('DR_HISTORY_TREND_WINDOW', 10))))
+
+    if report['regressions']:
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'],
+                          "DR recovery times regressed:\n" + "\n".join(report['regressions']), "WARNING")
+
+    return response(200, {
+        'status': 'success',
+        'trend': report,
+        'timestamp': datetime.utcnow().isoformat()
+    })
 
 def handle_status_check(event, context, ecs_client, rds_client, sns_client):
     """Handle DR status check"""
@@ -256,19 +436,102 @@ def handle_status_check(event, context, ecs_client, rds_client, sns_client):
         'replication_lag': check_replication_lag(rds_client)
     }
 
-    return {
-        'statusCode': 200,
-        'body': json.dumps({
-            'status': 'success',
-            'dr_status': status,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-    }
+    return response(200, {
+        'status': 'success',
+        'dr_status': status,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+def handle_standby_check(event, context, ecs_client, sns_client, cloudwatch_client=None):
+    """Move the DR service between pilot light and warm standby based on primary health"""
+
+    health = check_primary_region_health(cloudwatch_client)
+    cluster_name = os.environ['DR_CLUSTER_NAME']
+    service_name = os.environ['DR_SERVICE_NAME']
+    service = describe_service(ecs_client, cluster_name, service_name)
+    state = get_mode(ecs_client, service['serviceArn'])
+
+    now = datetime.now(timezone.utc)
+    degraded = health['status'] in (DEGRADED, UNHEALTHY)
+    action = decide(state['mode'], health['status'], state['last_degraded'], now,
+                    int(os.environ.get('WARM_STANDBY_RECOVERY_SECONDS', '900')))
+    result = {'mode': state['mode'], 'action': action, 'primary_health': health}
+
+    if health['status'] == NO_DATA:
+        # Without health data neither warm standby nor automated failover can trigger
+        print(f"Primary health has no data: {health['details']}")
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'],
+                          f"Primary region health cannot be evaluated: {health['details']}. "
+                          f"Warm standby and automated failover are blind until the health check reports again.",
+                          "CRITICAL")
+
+    if action == 'enter_warm':
+        desired = max(service['desiredCount'], int(os.environ.get('WARM_STANDBY_MIN_TASKS', '2')))
+        scale_service(ecs_client, cluster_name, service_name, desired)
+        set_mode(ecs_client, service['serviceArn'], WARM, last_degraded=now)
+        result.update(mode=WARM, desired_count=desired)
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'],
+                          f"Primary region degraded ({health['details']}). DR region moved to warm standby with {desired} tasks.",
+                          "WARNING")
+    elif action == 'stay_warm' and degraded:
+        set_mode(ecs_client, service['serviceArn'], WARM, last_degraded=now)
+    elif action == 'exit_warm':
+        desired = int(os.environ.get('PILOT_LIGHT_TASKS', '0'))
+        scale_service(ecs_client, cluster_name, service_name, desired)
+        if int(os.environ.get('WARM_STANDBY_CAPACITY_UNITS', '0')) and service.get('loadBalancers'):
+            release_capacity_reservation(aws_client('elbv2', os.environ['BACKUP_REGION']),
+                                         service['loadBalancers'][0]['targetGroupArn'])
+        set_mode(ecs_client, service['serviceArn'], PILOT_LIGHT)
+        result.update(mode=PILOT_LIGHT, desired_count=desired)
+        send_notification(sns_client, os.environ['SNS_TOPIC_ARN'],
+                          "Primary region recovered. DR region returned to pilot light.", "INFO")
+
+    if action in ('enter_warm', 'stay_warm') and service.get('loadBalancers'):
+        try:
+            result['prewarm'] = prewarm(
+                aws_client('elbv2', os.environ['BACKUP_REGION']),
+                service['loadBalancers'][0]['targetGroupArn'],
+                os.environ.get('DR_LOAD_BALANCER_DNS'),
+                os.environ.get('DOMAIN_NAME'),
+                [path for path in os.environ.get('WARM_STANDBY_PATHS', '/api/health').split(',') if path],
+                capacity_units=int(os.environ.get('WARM_STANDBY_CAPACITY_UNITS', '0'))
+            )
+        except Exception as e:
+            result['prewarm'] = {'warmed': False, 'error': str(e)}
+
+    return response(200, {
+        'status': 'success',
+        'standby': result,
+        'timestamp': now.isoformat()
+    })
 
 def check_primary_region_health(cloudwatch_client=None):
-    """Check health of primary region"""
-    # Implement health check logic
-    return {'status': 'HEALTHY', 'details': 'All services operational'}
+    """Classify primary region health from Route53, ALB and replication lag signals"""
+    if cloudwatch_client is None:
+        cloudwatch_client = aws_client('cloudwatch', os.environ['PRIMARY_REGION'])
+
+    try:
+        signals = read_primary_signals(
+            cloudwatch_client,
+            os.environ['PRIMARY_HEALTH_CHECK_ID'],
+            load_balancer=os.environ.get('PRIMARY_LOAD_BALANCER')
+        )
+        lag = check_replication_lag(None)['lag_seconds']
+        status, reasons = classify_health(
+            signals,
+            replication_lag_seconds=lag,
+            max_error_rate=float(os.environ.get('HEALTH_MAX_ERROR_RATE', '0.02')),
+            max_latency_seconds=float(os.environ.get('HEALTH_MAX_LATENCY_SECONDS', '2.0')),
+            max_lag_seconds=float(os.environ.get('REPLICATION_LAG_DEGRADED_SECONDS', '300'))
+        )
+        return {
+            'status': status,
+            'details': '; '.join(reasons) or 'All services operational',
+            'signals': signals,
+            'replication_lag_seconds': lag
+        }
+    except Exception as e:
+        return {'status': UNKNOWN, 'details': f'Could not read primary health: {str(e)}'}
 
 def verify_dr_readiness(ecs_client, rds_client):
     """Verify disaster recovery region is ready"""
@@ -285,93 +548,308 @@ def verify_dr_readiness(ecs_client, rds_client):
         if cluster['status'] != 'ACTIVE':
             return {'ready': False, 'reason': f'ECS cluster status: {cluster["status"]}'}
 
-        # Check database backup availability
+        # Check database backup availability; only a missing restore point
+        # blocks failover, a stale one is the best recovery left
         backup_check = check_database_backups(rds_client)
+        if backup_check['status'] == 'FAIL':
+            return {'ready': False, 'reason': f"Database backups not available: {backup_check['details']}"}
         if backup_check['status'] != 'PASS':
-            return {'ready': False, 'reason': 'Database backups not available'}
+            return {'ready': True, 'reason': 'DR region is ready', 'warnings': [backup_check['details']]}
 
         return {'ready': True, 'reason': 'DR region is ready'}
 
     except Exception as e:
         return {'ready': False, 'reason': f'Error checking DR readiness: {str(e)}'}
 
-def promote_database(rds_client):
-    """Promote read replica to primary database"""
+def database_write_check():
+    """Write check for a newly promoted cluster, or None when no database credentials are configured"""
+    secret_id = env('DATABASE_SECRET_ID')
+    if not secret_id:
+        return None
+    # Imported on use: only failover and failback connect to the database
+    from pg_check import default_ssl_context, write_check
+
+    def check(cluster):
+        # The secret is read in the cluster's own region, which is up when the primary is not
+        region = cluster['DBClusterArn'].split(':')[3]
+        secret = json.loads(aws_client('secretsmanager', region).get_secret_value(SecretId=secret_id)['SecretString'])
+        return write_check(
+            cluster['Endpoint'],
+            cluster['Port'],
+            secret['username'],
+            secret['password'],
+            secret.get('dbname') or cluster.get('DatabaseName') or 'postgres',
+            ssl_context=default_ssl_context(env('DATABASE_CA_BUNDLE'))
+        )
+    return check
+
+def step_timeout(context, configured_seconds):
+    """A step's wait, cut short so the invocation still finishes before the Lambda timeout"""
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return configured_seconds
+    return max(0, min(configured_seconds, context.get_remaining_time_in_millis() / 1000 - WRAP_UP_SECONDS))
+
+def promote_database(timeout_seconds=420):
+    """Make the DR database clusters writers, in parallel, and confirm they accept writes"""
     try:
-        # Implementation would promote read replica
-        # This is a placeholder for the actual promotion logic
-        return {'status': 'SUCCESS', 'details': 'Database promoted successfully'}
+        backup_rds_client = get_backup_rds_client()
+        # Extra clusters (e.g. the analytics replica) map primary identifier -> DR identifier
+        identifiers = [os.environ['DR_DATABASE_CLUSTER_IDENTIFIER']] + list(env_json('ADDITIONAL_DATABASE_CLUSTERS', {}).values())
+        return fail_over_clusters(
+            [(backup_rds_client, identifier) for identifier in identifiers],
+            timeout_seconds=timeout_seconds,
+            write_check=database_write_check()
+        )
     except Exception as e:
         return {'status': 'FAILED', 'details': str(e)}
 
-def scale_up_application(ecs_client):
-    """Scale up application in DR region"""
+def restore_primary_database(rds_client, timeout_seconds=420):
+    """Switch the writer role back to the primary region clusters without data loss"""
     try:
-        response = ecs_client.update_service(
-            cluster=os.environ['DR_CLUSTER_NAME'],
-            service=os.environ['DR_SERVICE_NAME'],
-            desiredCount=5  # Scale to minimum production capacity
+        # Each primary cluster is checked against its DR counterpart, which must be a replica again
+        backup_rds_client = get_backup_rds_client()
+        pairs = [(os.environ['DATABASE_CLUSTER_IDENTIFIER'], os.environ['DR_DATABASE_CLUSTER_IDENTIFIER'])]
+        pairs += list(env_json('ADDITIONAL_DATABASE_CLUSTERS', {}).items())
+        return fail_over_clusters(
+            [(rds_client, primary, (backup_rds_client, dr)) for primary, dr in pairs],
+            planned=True,
+            timeout_seconds=timeout_seconds,
+            write_check=database_write_check()
         )
+    except Exception as e:
+        return {'status': 'FAILED', 'details': str(e)}
 
-        return {'status': 'SUCCESS', 'details': 'Application scaled up'}
+def scale_up_application(ecs_client, cloudwatch_client=None):
+    """Scale the DR service in one step to the task count the primary load requires"""
+    try:
+        plan = plan_dr_capacity(cloudwatch_client)
+        capacity = check_dr_region_capacity(ecs_client, plan['required_tasks'])
+
+        # Never scale below what is already running (e.g. a warm standby)
+        desired = max(capacity['feasible_tasks'], capacity['current_tasks'])
+        scale_service(ecs_client, os.environ['DR_CLUSTER_NAME'], os.environ['DR_SERVICE_NAME'], desired)
+        try:
+            # Keep the standby loop from scaling an active DR service back down
+            service = describe_service(ecs_client, os.environ['DR_CLUSTER_NAME'], os.environ['DR_SERVICE_NAME'])
+            set_mode(ecs_client, service['serviceArn'], ACTIVE)
+        except Exception as e:
+            print(f"Could not mark DR service active: {e}")
+
+        status = 'SUCCESS' if desired >= plan['required_tasks'] else 'PARTIAL'
+        return {
+            'status': status,
+            'details': f"Scaled to {desired} tasks (planned {plan['required_tasks']} from {plan['source']}); {capacity['details']}",
+            'desired_count': desired,
+            'plan': plan,
+            'capacity': capacity
+        }
     except Exception as e:
         return {'status': 'FAILED', 'details': str(e)}
 
-def update_dns_routing(route53_client, action):
-    """Update Route53 DNS routing"""
+def update_dns_routing(route53_client, action, timeout_seconds=300):
+    """Point the public records at the DR load balancer (failover) or back at the primary (failback)"""
     try:
-        # Implementation would update Route53 records
-        # This is a placeholder for actual DNS update logic
-        return {'status': 'SUCCESS', 'details': f'DNS updated for {action}'}
+        primary = (os.environ['PRIMARY_LOAD_BALANCER_DNS'], os.environ['PRIMARY_LOAD_BALANCER_ZONE_ID'])
+        dr = (os.environ['DR_LOAD_BALANCER_DNS'], os.environ['DR_LOAD_BALANCER_ZONE_ID'])
+        source, target = (primary, dr) if action == 'failover' else (dr, primary)
+        return switch_records(
+            route53_client,
+            os.environ['HOSTED_ZONE_ID'],
+            source,
+            target,
+            primary_health_check_id=env('PRIMARY_HEALTH_CHECK_ID'),
+            to_primary=action == 'failback',
+            names=env_list('DNS_CUTOVER_NAMES') or None,
+            timeout_seconds=timeout_seconds
+        )
     except Exception as e:
         return {'status': 'FAILED', 'details': str(e)}
 
-def verify_service_health():
-    """Verify services are healthy after failover"""
-    # Implementation would check service endpoints
-    return {'status': 'SUCCESS', 'details': 'All services responding'}
+def verify_service_health(wait_seconds=300):
+    """Probe the critical endpoints through the DR load balancer until they meet the SLO"""
+    # Imported on use: asyncio adds ~30 ms to every cold start and only failover needs it
+    from service_probe import DEFAULT_CONCURRENCY, DEFAULT_PATHS, DEFAULT_REQUESTS_PER_PATH, verify_endpoints
+
+    # HEALTH_PROBE_BASE_URL points the probe elsewhere, e.g. at a local stand-in server
+    base_url = env('HEALTH_PROBE_BASE_URL') or (f"https://{os.environ['DOMAIN_NAME']}" if env('DOMAIN_NAME') else None)
+    if not base_url:
+        return {'status': 'FAILED', 'details': 'DOMAIN_NAME not configured; service health unverified'}
+
+    # Freshly scaled tasks may need a few rounds before they serve within SLO
+    deadline = time.time() + wait_seconds
+    interval = env_int('HEALTH_PROBE_INTERVAL_SECONDS', 15)
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            result = verify_endpoints(
+                base_url,
+                env_list('HEALTH_PROBE_PATHS', DEFAULT_PATHS),
+                requests_per_path=env_int('HEALTH_PROBE_REQUESTS', DEFAULT_REQUESTS_PER_PATH),
+                concurrency=env_int('HEALTH_PROBE_CONCURRENCY', DEFAULT_CONCURRENCY),
+                slo=env_json('HEALTH_PROBE_SLO', {}),
+                path_slos=env_json('HEALTH_PROBE_PATH_SLOS', {}),
+                connect_host=env('DR_LOAD_BALANCER_DNS')
+            )
+        except Exception as e:
+            result = {'status': 'FAILED', 'details': f'Endpoint probe error: {str(e)}'}
+        if result['status'] == 'SUCCESS' or time.time() + interval >= deadline:
+            break
+        time.sleep(interval)
+
+    result['attempts'] = attempts
+    return result
+
+def get_backup_rds_client():
+    """RDS client for BACKUP_REGION"""
+    if not os.environ.get('BACKUP_REGION'):
+        return None
+    return aws_client('rds', os.environ['BACKUP_REGION'])
 
 def check_database_backups(rds_client):
-    """Check database backup status"""
+    """Check that a restore point exists in some region and whether it is within the RPO target"""
     try:
-        # Check for recent backups
-        return {'status': 'PASS', 'details': 'Recent backups available'}
+        return check_backups_cached(
+            rds_client,
+            get_backup_rds_client(),
+            os.environ['DATABASE_CLUSTER_IDENTIFIER'],
+            int(os.environ['RPO_TARGET_SECONDS']),
+            backup_region=os.environ.get('BACKUP_REGION'),
+            ttl_seconds=int(os.environ.get('BACKUP_CHECK_TTL_SECONDS', '300')),
+            replica_identifier=env('DR_DATABASE_CLUSTER_IDENTIFIER'),
+            replica_lag=lambda: check_replication_lag(rds_client)['lag_seconds']
+        )
     except Exception as e:
         return {'status': 'FAIL', 'details': str(e)}
 
-def check_dr_capacity(ecs_client):
-    """Check DR region capacity"""
-    return {'status': 'PASS', 'details': 'Sufficient capacity available'}
+def plan_dr_capacity(cloudwatch_client=None):
+    """Required DR task count derived from recent primary-region load"""
+    if cloudwatch_client is None:
+        cloudwatch_client = aws_client('cloudwatch', os.environ['PRIMARY_REGION'])
+
+    return plan_capacity(
+        cloudwatch_client,
+        os.environ['PRIMARY_CLUSTER_NAME'],
+        os.environ['PRIMARY_SERVICE_NAME'],
+        load_balancer=os.environ.get('PRIMARY_LOAD_BALANCER'),
+        target_cpu_percent=float(os.environ.get('DR_TARGET_CPU_PERCENT', '60')),
+        requests_per_task=float(os.environ.get('DR_REQUESTS_PER_TASK', '0')),
+        headroom=float(os.environ.get('DR_CAPACITY_HEADROOM', '0.3')),
+        min_tasks=int(os.environ.get('DR_MIN_TASKS', '5')),
+        max_tasks=int(os.environ.get('DR_MAX_TASKS', '50'))
+    )
+
+def check_dr_region_capacity(ecs_client, required_tasks):
+    """Check Fargate quota and subnet addresses in BACKUP_REGION for required_tasks"""
+    backup_region = os.environ['BACKUP_REGION']
+    return check_capacity(
+        ecs_client,
+        aws_client('service-quotas', backup_region),
+        aws_client('ec2', backup_region),
+        os.environ['DR_CLUSTER_NAME'],
+        os.environ['DR_SERVICE_NAME'],
+        required_tasks,
+        cloudwatch_client=aws_client('cloudwatch', backup_region)
+    )
+
+def check_dr_capacity(ecs_client, cloudwatch_client=None):
+    """Check the DR region can run the task count the primary load requires"""
+    try:
+        plan = plan_dr_capacity(cloudwatch_client)
+        capacity = check_dr_region_capacity(ecs_client, plan['required_tasks'])
+        return dict(capacity, plan=plan)
+    except Exception as e:
+        return {'status': 'FAIL', 'details': str(e)}
+
+def check_s3_replication(s3_client=None):
+    """Check S3 cross-region replication by diffing source and replica inventories"""
+    source_manifest = os.environ.get('REPLICATION_SOURCE_INVENTORY')
+    replica_manifest = os.environ.get('REPLICATION_REPLICA_INVENTORY')
 
-def check_s3_replication():
-    """Check S3 cross-region replication"""
-    return {'status': 'PASS', 'details': 'Replication up to date'}
+    if not source_manifest or not replica_manifest:
+        return {'status': 'FAIL', 'details': 'S3 inventory locations not configured; replication unverified'}
+
+    try:
+        return verify_replication(
+            source_manifest,
+            replica_manifest,
+            s3_client=s3_client,
+            # Objects younger than the RPO may legitimately still be in flight
+            grace_seconds=int(os.environ.get('RPO_TARGET_SECONDS', '900')),
+        )
+    except Exception as e:
+        return {'status': 'FAIL', 'details': f'Inventory comparison failed: {str(e)}'}
 
 def test_automation_scripts():
     """Test automation scripts"""
     return {'status': 'PASS', 'details': 'All scripts functional'}
 
-def check_replication_lag(rds_client):
-    """Check database replication lag"""
-    return {'lag_seconds': 5, 'status': 'ACCEPTABLE'}
+def check_replication_lag(rds_client, cloudwatch_client=None):
+    """Check Aurora global database replication lag to the DR cluster"""
+    dr_cluster = os.environ.get('DR_DATABASE_CLUSTER_IDENTIFIER')
+    if not dr_cluster:
+        return {'lag_seconds': None, 'status': 'UNKNOWN', 'details': 'DR database cluster not configured'}
 
-def send_notification(sns_client, topic_arn, message, severity):
-    """Send SNS notification"""
-    subject = f"1001 Stories DR Alert - {severity}"
+    if cloudwatch_client is None:
+        cloudwatch_client = aws_client('cloudwatch', os.environ['BACKUP_REGION'])
 
-    formatted_message = f"""
-{message}
+    try:
+        end_time = datetime.now(timezone.utc)
+        query = metric_query('lag', 'AWS/RDS', 'AuroraGlobalDBReplicationLag',
+                             [('DBClusterIdentifier', dr_cluster)], 'Maximum', 60)
+        values = get_metric_series(cloudwatch_client, [query], end_time - timedelta(minutes=10), end_time)['lag']
+        if not values:
+            return {'lag_seconds': None, 'status': 'UNKNOWN', 'details': 'No replication lag datapoints'}
+
+        # The metric is reported in milliseconds; values are newest first
+        lag = values[0] / 1000.0
+        threshold = float(os.environ.get('REPLICATION_LAG_DEGRADED_SECONDS', '300'))
+        return {'lag_seconds': lag, 'status': 'ACCEPTABLE' if lag <= threshold else 'HIGH'}
+    except Exception as e:
+        return {'lag_seconds': None, 'status': 'UNKNOWN', 'details': str(e)}
 
-Timestamp: {datetime.utcnow().isoformat()}
-Severity: {severity}
-System: 1001 Stories Disaster Recovery
-    """
+def probe_summary(service_verification):
+    """Overall probe latencies of a health verification, for the history record"""
+    overall = service_verification.get('overall') or {}
+    return {name: overall.get(name) for name in ('p50_ms', 'p95_ms', 'p99_ms', 'error_rate') if name in overall}
 
+def record_history(record):
+    """Append a record to the DR history store; history must never fail a recovery"""
+    if not env('DR_HISTORY_LOCATION'):
+        return None
     try:
-        sns_client.publish(
-            TopicArn=topic_arn,
-            Message=formatted_message,
-            Subject=subject
-        )
+        return open_store(os.environ['DR_HISTORY_LOCATION'], aws_client('s3')).append(record)
     except Exception as e:
-        print(f"Failed to send notification: {e}")
\ No newline at end of file
+        print(f"Could not record DR history: {e}")
+        return None
+
+def start_notifications(sns_client):
+    """Open the notification queue for this invocation"""
+    global _notifier
+    _notifier = Notifier(
+        sns_client,
+        os.environ['SNS_TOPIC_ARN'],
+        topic_routes=env_json('NOTIFICATION_TOPICS', {}),
+        dedupe_window_seconds=env_int('NOTIFICATION_DEDUPE_SECONDS', 300)
+    )
+    return _notifier
+
+def flush_notifications():
+    """Publish queued notifications in batches and close the queue"""
+    global _notifier
+    if _notifier is None:
+        return None
+    notifier, _notifier = _notifier, None
+    stats = notifier.flush()
+    print(f"Notifications: {json.dumps(stats)}")
+    return stats
+
+def send_notification(sns_client, topic_arn, message, severity):
+    """Queue an SNS notification; it is published when the invocation flushes"""
+    if _notifier is None:
+        # Outside a handler invocation: deliver right away
+        notifier = Notifier(sns_client, topic_arn)
+        notifier.notify(message, severity)
+        notifier.flush()
+        return
+    _notifier.notify(message, severity, topic_arn)
@@ -0,0 +1,184 @@
+"""
+DR drill and failover history for the DR orchestrator.
+
+Every drill, failover and failback is kept as one compact record: outcome,
+per-step timings, the measured RTO and RPO, probe latencies and replication
+lag. Records are only ever appended, to one of two stores:
+
+  s3://bucket/prefix/   one JSON lines object per record under a dt=YYYY-MM-DD/
+                        partition, so S3 needs no read-modify-write and Athena
+                        can query the prefix as a table
+  path/to/history.db    a local SQLite file with the same records, for running
+                        the orchestrator or the trend report off AWS
+
+A drill does not move the writer or DNS, so its RTO is the time its
+rehearsed checks took; filter by kind to keep drill RTOs apart from those
+of real failovers and failbacks.
+
+trend() reads the records back and computes rolling RTO and RPO percentiles
+over the last few events. It flags a regression when the recent p90 exceeds
+the configured target or when the recent median is clearly slower than the
+window before it. Per-step medians show which step got slower.
+"""
+
+import json
+import math
+import os
+import sqlite3
+import uuid
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+DEFAULT_WINDOW = 10
+DEFAULT_TOLERANCE = 0.2
+
+
+def make_record(kind, outcome, steps=None, rto_seconds=None, rpo_seconds=None, probe=None,
+                replication_lag_seconds=None, details=None, timestamp=None):
+    """Compact history record; fields without a measurement are left out"""
+    record = {
+        'timestamp': (timestamp or datetime.now(timezone.utc)).isoformat(),
+        'kind': kind,
+        'outcome': outcome,
+        'steps': steps,
+        'rto_seconds': rto_seconds,
+        'rpo_seconds': rpo_seconds,
+        'probe': probe,
+        'replication_lag_seconds': replication_lag_seconds,
+        'details': details,
+    }
+    return {key: value for key, value in record.items() if value not in (None, {}, '')}
+
+
+class S3HistoryStore:
+    def __init__(self, bucket, prefix, s3_client):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix.strip('/') else ''
+        self.s3_client = s3_client
+
+    def append(self, record):
+        timestamp = datetime.fromisoformat(record['timestamp'])
+        key = (f"{self.prefix}dt={timestamp:%Y-%m-%d}/"
+               f"{timestamp:%Y%m%dT%H%M%S}Z-{record['kind']}-{uuid.uuid4().hex[:8]}.jsonl")
+        self.s3_client.put_object(Bucket=self.bucket, Key=key, ContentType='application/x-ndjson',
+                                  Body=(json.dumps(record, sort_keys=True, default=str) + '\n').encode())
+        return f's3://{self.bucket}/{key}'
+
+    def read(self, since=None):
+        """Records at or after since, oldest first"""
+        start_after = f"{self.prefix}dt={since - timedelta(days=1):%Y-%m-%d}/~" if since else None
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=self.bucket, Prefix=self.prefix,
+                                   **({'StartAfter': start_after} if start_after else {}))
+        records = []
+        for page in pages:
+            for item in page.get('Contents', []):
+                body = self.s3_client.get_object(Bucket=self.bucket, Key=item['Key'])['Body'].read()
+                records.extend(json.loads(line) for line in body.decode().splitlines() if line.strip())
+        return _since(records, since)
+
+
+class SqliteHistoryStore:
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute('CREATE TABLE IF NOT EXISTS history (timestamp TEXT, kind TEXT, record TEXT)')
+        return connection
+
+    def append(self, record):
+        with self._connect() as connection:
+            connection.execute('INSERT INTO history VALUES (?, ?, ?)',
+                               (record['timestamp'], record['kind'], json.dumps(record, sort_keys=True, default=str)))
+        return self.path
+
+    def read(self, since=None):
+        with self._connect() as connection:
+            rows = connection.execute('SELECT record FROM history ORDER BY timestamp').fetchall()
+        return _since([json.loads(row[0]) for row in rows], since)
+
+
+def _since(records, since):
+    records = [record for record in records
+               if since is None or datetime.fromisoformat(record['timestamp']) >= since]
+    return sorted(records, key=lambda record: record['timestamp'])
+
+
+def open_store(location, s3_client=None):
+    """s3://bucket/prefix/ or a local SQLite path"""
+    parsed = urlparse(location)
+    if parsed.scheme == 's3':
+        return S3HistoryStore(parsed.netloc, parsed.path, s3_client)
+    directory = os.path.dirname(os.path.abspath(location))
+    os.makedirs(directory, exist_ok=True)
+    return SqliteHistoryStore(location)
+
+
+def percentile(values, share):
+    """Nearest-rank percentile; None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(share * len(ordered)) - 1)]
+
+
+def _summary(values):
+    return {'count': len(values), 'p50': percentile(values, 0.5), 'p90': percentile(values, 0.9),
+            'max': max(values) if values else None}
+
+
+def _metric_trend(records, field, target, window, tolerance):
+    measured = [record for record in records if record.get(field) is not None]
+    values = [record[field] for record in measured]
+    recent, previous = values[-window:], values[-2 * window:-window]
+    result = {
+        'recent': _summary(recent),
+        'previous': _summary(previous),
+        'target': target,
+        # Rolling p50/p90 over the window ending at each event
+        'series': [{'timestamp': record['timestamp'], 'value': record[field],
+                    'p50': percentile(values[max(0, i + 1 - window):i + 1], 0.5),
+                    'p90': percentile(values[max(0, i + 1 - window):i + 1], 0.9)}
+                   for i, record in enumerate(measured)],
+        'regressions': [],
+    }
+    if recent and target is not None and result['recent']['p90'] > target:
+        result['regressions'].append(f"{field} p90 {result['recent']['p90']:.0f}s exceeds target {target:.0f}s")
+    if recent and previous and result['recent']['p50'] > result['previous']['p50'] * (1 + tolerance):
+        result['regressions'].append(f"{field} median {result['recent']['p50']:.0f}s up from "
+                                     f"{result['previous']['p50']:.0f}s")
+    return result
+
+
+def _step_trend(records, window):
+    """Median seconds per step, recent window vs the one before"""
+    timed = [record for record in records if record.get('steps')]
+    recent, previous = timed[-window:], timed[-2 * window:-window]
+    steps = sorted({step for record in timed for step in record['steps']})
+
+    def median(chunk, step):
+        return percentile([record['steps'][step] for record in chunk
+                           if isinstance(record['steps'].get(step), (int, float))], 0.5)
+
+    return {step: {'recent_p50': median(recent, step), 'previous_p50': median(previous, step)} for step in steps}
+
+
+def trend(records, rto_target, rpo_target, window=DEFAULT_WINDOW, tolerance=DEFAULT_TOLERANCE):
+    """Rolling RTO/RPO percentiles over the last window events and the regressions they show"""
+    rto = _metric_trend(records, 'rto_seconds', rto_target, window, tolerance)
+    rpo = _metric_trend(records, 'rpo_seconds', rpo_target, window, tolerance)
+    outcomes = {}
+    for record in records[-window:]:
+        outcomes[record['outcome']] = outcomes.get(record['outcome'], 0) + 1
+    regressions = rto['regressions'] + rpo['regressions']
+    return {
+        'status': 'REGRESSED' if regressions else 'OK',
+        'events': len(records),
+        'window': window,
+        'recent_outcomes': outcomes,
+        'rto': rto,
+        'rpo': rpo,
+        'steps': _step_trend(records, window),
+        'regressions': regressions,
+    }
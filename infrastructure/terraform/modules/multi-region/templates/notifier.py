@@ -0,0 +1,154 @@
+"""
+Batched, deduplicated SNS notifications for the DR orchestrator.
+
+Handlers enqueue messages instead of publishing inline. Identical messages
+queued in the same invocation are coalesced into one with a repeat count,
+and a message already delivered within the dedupe window (tracked per
+Lambda container) is suppressed, so a flapping alarm pages once. Messages
+are routed to a topic by severity and published with SNS PublishBatch (up
+to 10 entries per call) when the invocation flushes. CRITICAL messages
+start a flush on a background thread right away so pages are not held back
+by a long failover, without blocking the failover itself.
+"""
+
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+PUBLISH_BATCH_SIZE = 10
+SUBJECT_LIMIT = 100
+DEFAULT_DEDUPE_WINDOW_SECONDS = 300
+IMMEDIATE_SEVERITIES = ('CRITICAL',)
+
+# {dedupe_key: sent_at} for messages delivered by this container
+_recently_sent = {}
+
+
+def dedupe_key(topic_arn, severity, message):
+    normalized = ' '.join(message.split())
+    return hashlib.sha256(f'{topic_arn}|{severity}|{normalized}'.encode('utf-8')).hexdigest()
+
+
+def format_message(message, severity, repeats=1):
+    repeated = f'\nRepeated: {repeats} times in this invocation' if repeats > 1 else ''
+    return f"""
+{message.strip()}
+{repeated}
+Timestamp: {datetime.utcnow().isoformat()}
+Severity: {severity}
+System: 1001 Stories Disaster Recovery
+    """
+
+
+class Notifier:
+    """Per-invocation notification queue; call flush() before the handler returns"""
+
+    def __init__(self, sns_client, default_topic_arn, topic_routes=None,
+                 dedupe_window_seconds=DEFAULT_DEDUPE_WINDOW_SECONDS,
+                 subject_prefix='1001 Stories DR Alert'):
+        self.sns_client = sns_client
+        self.default_topic_arn = default_topic_arn
+        self.topic_routes = topic_routes or {}
+        self.dedupe_window_seconds = dedupe_window_seconds
+        self.subject_prefix = subject_prefix
+        self.stats = {'queued': 0, 'coalesced': 0, 'suppressed': 0, 'published': 0, 'failed': 0}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = []
+
+    def topic_for(self, severity, topic_arn=None):
+        return self.topic_routes.get(severity) or topic_arn or self.default_topic_arn
+
+    def notify(self, message, severity, topic_arn=None):
+        """Queue a message; never raises and never calls SNS on the caller's thread"""
+        topic_arn = self.topic_for(severity, topic_arn)
+        key = dedupe_key(topic_arn, severity, message)
+
+        with self._lock:
+            sent_at = _recently_sent.get(key)
+            if sent_at is not None and time.time() - sent_at < self.dedupe_window_seconds:
+                self.stats['suppressed'] += 1
+                return False
+            if key in self._pending:
+                self._pending[key]['repeats'] += 1
+                self.stats['coalesced'] += 1
+                return False
+            self._pending[key] = {
+                'topic_arn': topic_arn,
+                'severity': severity,
+                'message': message,
+                'repeats': 1,
+            }
+            self.stats['queued'] += 1
+
+        if severity in IMMEDIATE_SEVERITIES:
+            self._flush_in_background()
+        return True
+
+    def _flush_in_background(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._futures.append(self._executor.submit(self._publish_pending))
+
+    def _take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _publish_pending(self):
+        by_topic = {}
+        for key, item in self._take_pending().items():
+            by_topic.setdefault(item['topic_arn'], []).append((key, item))
+
+        for topic_arn, items in by_topic.items():
+            for start in range(0, len(items), PUBLISH_BATCH_SIZE):
+                self._publish_batch(topic_arn, items[start:start + PUBLISH_BATCH_SIZE])
+
+    def _publish_batch(self, topic_arn, items):
+        entries = []
+        for index, (_, item) in enumerate(items):
+            entries.append({
+                'Id': str(index),
+                'Subject': f"{self.subject_prefix} - {item['severity']}"[:SUBJECT_LIMIT],
+                'Message': format_message(item['message'], item['severity'], item['repeats']),
+            })
+
+        try:
+            response = self.sns_client.publish_batch(TopicArn=topic_arn, PublishBatchRequestEntries=entries)
+        except Exception as e:
+            print(f"Failed to send {len(entries)} notifications to {topic_arn}: {e}")
+            with self._lock:
+                self.stats['failed'] += len(entries)
+            return
+
+        failed_ids = set()
+        for failure in response.get('Failed', []):
+            failed_ids.add(failure['Id'])
+            print(f"Failed to send notification: {failure.get('Code')} {failure.get('Message')}")
+
+        now = time.time()
+        with self._lock:
+            for index, (key, _) in enumerate(items):
+                if str(index) in failed_ids:
+                    self.stats['failed'] += 1
+                else:
+                    _recently_sent[key] = now
+                    self.stats['published'] += 1
+            # Keep the container-level history bounded to the dedupe window
+            for key, sent_at in list(_recently_sent.items()):
+                if now - sent_at >= self.dedupe_window_seconds:
+                    del _recently_sent[key]
+
+    def flush(self):
+        """Publish everything still queued and wait for background flushes"""
+        if self._futures:
+            wait(self._futures)
+            self._futures = []
+        self._publish_pending()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        return dict(self.stats)
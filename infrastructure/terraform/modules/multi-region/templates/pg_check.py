@@ -0,0 +1,193 @@
+"""
+PostgreSQL write check for the DR orchestrator.
+
+After a promotion the cluster API reports the new writer before every
+client can actually write to it. This module opens a real connection to the
+writer endpoint and runs txid_current(), which has to assign a transaction
+id. A standby or a read-only cluster rejects it, while a writable primary
+answers without any table being touched.
+
+It speaks just enough of the PostgreSQL frontend/backend protocol
+(SSLRequest, startup, cleartext/MD5/SCRAM-SHA-256 authentication and one
+simple query) that the Lambda package needs no database driver. The
+connection is always TLS with a verified certificate and host name, since
+the check sends the database password; a server that refuses TLS fails the
+check.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import socket
+import ssl
+import struct
+import time
+
+PROTOCOL_VERSION = 196608
+SSL_REQUEST_CODE = 80877103
+WRITE_CHECK_QUERY = 'SELECT pg_is_in_recovery(), txid_current()'
+DEFAULT_TIMEOUT_SECONDS = 10.0
+
+
+class WriteCheckError(Exception):
+    pass
+
+
+def _message(kind, payload=b''):
+    return kind + struct.pack('!I', len(payload) + 4) + payload
+
+
+def _cstring(value):
+    return value.encode() + b'\0'
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise WriteCheckError('server closed the connection')
+        data += chunk
+    return data
+
+
+def _read_message(sock):
+    kind = _recv_exact(sock, 1)
+    size = struct.unpack('!I', _recv_exact(sock, 4))[0]
+    return kind, _recv_exact(sock, size - 4)
+
+
+def _error_text(payload):
+    """Severity, code and message of an ErrorResponse"""
+    fields = {}
+    for field in payload.split(b'\0'):
+        if field:
+            fields[field[:1]] = field[1:].decode(errors='replace')
+    return f"{fields.get(b'S', 'ERROR')} {fields.get(b'C', '')}: {fields.get(b'M', 'unknown error')}"
+
+
+def scram_client_final(password, client_first_bare, server_first):
+    """SCRAM-SHA-256 client-final message and the server signature it must answer with (RFC 7677)"""
+    attributes = dict(part.split('=', 1) for part in server_first.split(','))
+    salted = hashlib.pbkdf2_hmac('sha256', password.encode(), base64.b64decode(attributes['s']), int(attributes['i']))
+    client_key = hmac.new(salted, b'Client Key', hashlib.sha256).digest()
+    stored_key = hashlib.sha256(client_key).digest()
+    without_proof = f"c=biws,r={attributes['r']}"
+    auth_message = f'{client_first_bare},{server_first},{without_proof}'.encode()
+    signature = hmac.new(stored_key, auth_message, hashlib.sha256).digest()
+    proof = bytes(a ^ b for a, b in zip(client_key, signature))
+    server_key = hmac.new(salted, b'Server Key', hashlib.sha256).digest()
+    server_signature = base64.b64encode(hmac.new(server_key, auth_message, hashlib.sha256).digest()).decode()
+    return f'{without_proof},p={base64.b64encode(proof).decode()}', server_signature
+
+
+def _authenticate(sock, user, password):
+    """Answer the server's authentication requests until it is ready for a query"""
+    scram = None
+    while True:
+        kind, payload = _read_message(sock)
+        if kind == b'E':
+            raise WriteCheckError(_error_text(payload))
+        if kind == b'Z':
+            return
+        if kind != b'R':
+            # ParameterStatus, BackendKeyData and notices until the server is ready
+            continue
+        code = struct.unpack('!I', payload[:4])[0]
+        if code == 0:
+            continue
+        if code == 3:
+            sock.sendall(_message(b'p', _cstring(password)))
+        elif code == 5:
+            inner = hashlib.md5((password + user).encode()).hexdigest()
+            digest = 'md5' + hashlib.md5(inner.encode() + payload[4:8]).hexdigest()
+            sock.sendall(_message(b'p', _cstring(digest)))
+        elif code == 10:
+            if b'SCRAM-SHA-256\0' not in payload[4:]:
+                raise WriteCheckError('server offers no supported SASL mechanism')
+            nonce = base64.b64encode(os.urandom(18)).decode()
+            client_first = f'n,,n=,r={nonce}'.encode()
+            scram = {'client_first_bare': f'n=,r={nonce}', 'nonce': nonce}
+            sock.sendall(_message(b'p', _cstring('SCRAM-SHA-256') + struct.pack('!I', len(client_first)) + client_first))
+        elif code == 11 and scram:
+            server_first = payload[4:].decode()
+            if not server_first.startswith(f"r={scram['nonce']}"):
+                raise WriteCheckError('SCRAM nonce mismatch')
+            final, scram['server_signature'] = scram_client_final(password, scram['client_first_bare'], server_first)
+            sock.sendall(_message(b'p', final.encode()))
+        elif code == 12 and scram:
+            if payload[4:].decode() != f"v={scram['server_signature']}":
+                raise WriteCheckError('SCRAM server signature mismatch')
+        else:
+            raise WriteCheckError(f'unsupported authentication request {code}')
+
+
+def _query_row(sock, query):
+    """First row of a simple query as text values"""
+    sock.sendall(_message(b'Q', _cstring(query)))
+    row = error = None
+    while True:
+        kind, payload = _read_message(sock)
+        if kind == b'D' and row is None:
+            count = struct.unpack('!H', payload[:2])[0]
+            row, offset = [], 2
+            for _ in range(count):
+                size = struct.unpack('!i', payload[offset:offset + 4])[0]
+                offset += 4
+                row.append(None if size < 0 else payload[offset:offset + size].decode())
+                offset += max(size, 0)
+        elif kind == b'E':
+            error = _error_text(payload)
+        elif kind == b'Z':
+            if error:
+                raise WriteCheckError(error)
+            return row
+
+
+def _open(host, port, timeout, ssl_context):
+    sock = socket.create_connection((host, port), timeout=timeout)
+    try:
+        sock.sendall(struct.pack('!II', 8, SSL_REQUEST_CODE))
+        answer = _recv_exact(sock, 1)
+        if answer != b'S':
+            # The password is never sent over an unencrypted connection
+            raise WriteCheckError('server refused TLS')
+        return ssl_context.wrap_socket(sock, server_hostname=host)
+    except Exception:
+        sock.close()
+        raise
+
+
+def default_ssl_context(ca_bundle=None):
+    """Verify the server certificate and host name against ca_bundle (the RDS CA bundle) or the system store"""
+    if ca_bundle and not os.path.exists(ca_bundle):
+        raise WriteCheckError(f'CA bundle {ca_bundle} not found')
+    return ssl.create_default_context(cafile=ca_bundle or None)
+
+
+def write_check(host, port, user, password, database, timeout=DEFAULT_TIMEOUT_SECONDS, ssl_context=None):
+    """Connect to host and confirm it accepts writes; returns a result dict, never raises"""
+    started = time.monotonic()
+    try:
+        sock = _open(host, port, timeout, ssl_context or default_ssl_context())
+        try:
+            sock.sendall(_message(b'', struct.pack('!I', PROTOCOL_VERSION)
+                                  + _cstring('user') + _cstring(user)
+                                  + _cstring('database') + _cstring(database)
+                                  + _cstring('application_name') + _cstring('dr-write-check') + b'\0'))
+            _authenticate(sock, user, password)
+            in_recovery, txid = _query_row(sock, WRITE_CHECK_QUERY)
+            sock.sendall(_message(b'X'))
+        finally:
+            sock.close()
+    except Exception as e:
+        return {'writable': False, 'details': f'{type(e).__name__}: {e}',
+                'seconds': round(time.monotonic() - started, 2)}
+
+    writable = in_recovery == 'f'
+    return {
+        'writable': writable,
+        'details': f'{host} assigned transaction {txid}' if writable else f'{host} is in recovery',
+        'seconds': round(time.monotonic() - started, 2),
+    }
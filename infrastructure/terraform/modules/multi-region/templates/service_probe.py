@@ -0,0 +1,281 @@
+"""
+Post-failover endpoint verification for the DR orchestrator.
+
+Sends many concurrent GET requests to each critical endpoint and measures
+time to the last byte of every response. The requests run on asyncio
+streams over a pool of keep-alive connections, so a few hundred requests
+take about as long as the slowest handful. Against the DR load balancer
+the connection goes to the load balancer while TLS SNI and Host carry the
+public hostname, the same way the warm standby warms it.
+
+An endpoint passes when it meets the SLO. Its error rate (any status
+outside 2xx/3xx, timeouts and connection errors) must stay under the
+limit, and the p95 and p99 latencies of its successful requests must stay
+within their targets. Any response at all is not enough. Paths can
+override the SLO; a book PDF, for example, is allowed more time than a
+JSON endpoint.
+
+The prober works against any base URL, including a local stand-in server:
+  python3 service_probe.py http://127.0.0.1:8000 --path /api/health --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import ssl
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ('/api/health', '/api/i18n/en', '/api/books')
+DEFAULT_SLO = {'max_error_rate': 0.01, 'p95_ms': 1000.0, 'p99_ms': 2500.0}
+DEFAULT_REQUESTS_PER_PATH = 50
+DEFAULT_CONCURRENCY = 32
+DEFAULT_TIMEOUT_SECONDS = 5.0
+READ_CHUNK_BYTES = 64 * 1024
+USER_AGENT = 'dr-service-probe'
+
+
+class ProbeError(Exception):
+    pass
+
+
+def percentile(values, share):
+    """Nearest-rank percentile; None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(share * len(ordered)) - 1)]
+
+
+class Target:
+    """Where requests go: base URL, plus an optional host to connect to instead of its hostname"""
+
+    def __init__(self, base_url, connect_host=None, timeout=DEFAULT_TIMEOUT_SECONDS):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ProbeError(f'Unsupported base URL: {base_url}')
+        self.secure = parts.scheme == 'https'
+        self.hostname = parts.hostname
+        self.port = parts.port or (443 if self.secure else 80)
+        self.host_header = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.connect_host = connect_host or parts.hostname
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context() if self.secure else None
+
+    def request_bytes(self, path):
+        return (f'GET {self.prefix}{path} HTTP/1.1\r\n'
+                f'Host: {self.host_header}\r\n'
+                f'User-Agent: {USER_AGENT}\r\n'
+                'Accept: */*\r\n'
+                'Connection: keep-alive\r\n\r\n').encode('latin-1')
+
+    async def connect(self):
+        return await asyncio.open_connection(
+            self.connect_host, self.port, ssl=self.ssl_context,
+            server_hostname=self.hostname if self.secure else None)
+
+
+async def _discard(reader, size):
+    while size > 0:
+        chunk = await reader.read(min(READ_CHUNK_BYTES, size))
+        if not chunk:
+            raise ConnectionError('connection closed mid-body')
+        size -= len(chunk)
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response, discarding the body; returns (status, body bytes, reusable)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed before response')
+    try:
+        status = int(status_line.split(b' ', 2)[1])
+    except (IndexError, ValueError):
+        raise ProbeError(f'malformed status line {status_line[:40]!r}')
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    reusable = headers.get('connection') != 'close'
+    size = 0
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            chunk_size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if chunk_size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                break
+            await _discard(reader, chunk_size + 2)
+            size += chunk_size
+    elif 'content-length' in headers:
+        size = int(headers['content-length'])
+        await _discard(reader, size)
+    elif status not in (204, 304):
+        # Body delimited by the server closing the connection
+        while True:
+            chunk = await reader.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+        reusable = False
+    return status, size, reusable
+
+
+async def _worker(target, queue, samples):
+    reader = writer = None
+    while True:
+        try:
+            path = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+
+        started = time.perf_counter()
+        sample = {'path': path, 'status': None, 'bytes': 0, 'error': None}
+        for attempt in (1, 2):
+            reused = writer is not None
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.wait_for(target.connect(), target.timeout)
+                writer.write(target.request_bytes(path))
+                await writer.drain()
+                remaining = target.timeout - (time.perf_counter() - started)
+                status, size, reusable = await asyncio.wait_for(read_response(reader), max(remaining, 0.001))
+                sample.update(status=status, bytes=size,
+                              error=None if 200 <= status < 400 else f'HTTP {status}')
+            except Exception as e:
+                reusable = False
+                # A kept-alive connection the server already closed is retried once on a new one
+                retry = reused and attempt == 1 and isinstance(e, (ConnectionError, asyncio.IncompleteReadError))
+                if not retry:
+                    sample['error'] = 'timeout' if isinstance(e, asyncio.TimeoutError) else f'{type(e).__name__}: {e}'
+            else:
+                retry = False
+            if not reusable and writer is not None:
+                writer.close()
+                reader = writer = None
+            if not retry:
+                break
+
+        sample['ms'] = (time.perf_counter() - started) * 1000
+        samples.append(sample)
+
+    if writer is not None:
+        writer.close()
+
+
+async def probe(target, paths, requests_per_path=DEFAULT_REQUESTS_PER_PATH, concurrency=DEFAULT_CONCURRENCY):
+    """Send requests_per_path GETs to every path with up to concurrency connections; returns samples"""
+    queue = asyncio.Queue()
+    # Interleaved so every endpoint is under load at the same time
+    for _ in range(requests_per_path):
+        for path in paths:
+            queue.put_nowait(path)
+    samples = []
+    workers = min(concurrency, queue.qsize())
+    await asyncio.gather(*(_worker(target, queue, samples) for _ in range(workers)))
+    return samples
+
+
+def endpoint_stats(samples, slo):
+    latencies = [sample['ms'] for sample in samples if sample['error'] is None]
+    errors = Counter(sample['error'] for sample in samples if sample['error'] is not None)
+    error_rate = sum(errors.values()) / len(samples) if samples else 1.0
+    stats = {
+        'requests': len(samples),
+        'errors': sum(errors.values()),
+        'error_rate': round(error_rate, 4),
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'bytes': sum(sample['bytes'] for sample in samples),
+        'top_errors': dict(errors.most_common(3)),
+    }
+    for name in ('p50_ms', 'p95_ms', 'p99_ms'):
+        if stats[name] is not None:
+            stats[name] = round(stats[name], 1)
+
+    violations = []
+    if error_rate > slo['max_error_rate']:
+        violations.append(f"error rate {error_rate:.1%} > {slo['max_error_rate']:.1%}")
+    for name in ('p95_ms', 'p99_ms'):
+        if stats[name] is None:
+            violations.append(f"no successful requests for {name[:3]}")
+        elif stats[name] > slo[name]:
+            violations.append(f"{name[:3]} {stats[name]:.0f}ms > {slo[name]:.0f}ms")
+    stats['slo_met'] = not violations
+    stats['violations'] = violations
+    return stats
+
+
+def _format_ms(value):
+    return 'n/a' if value is None else f'{value:.0f}ms'
+
+
+def summarize(samples, paths, slo, elapsed_seconds, path_slos=None):
+    path_slos = path_slos or {}
+    endpoints = {path: endpoint_stats([sample for sample in samples if sample['path'] == path],
+                                      dict(slo, **path_slos.get(path, {})))
+                 for path in paths}
+    failing = {path: stats['violations'] for path, stats in endpoints.items() if not stats['slo_met']}
+    overall = endpoint_stats(samples, slo)
+    overall.pop('slo_met')
+    overall.pop('violations')
+    details = (f"{len(samples)} requests to {len(paths)} endpoints in {elapsed_seconds:.1f}s: "
+               f"p95 {_format_ms(overall['p95_ms'])}, p99 {_format_ms(overall['p99_ms'])}, "
+               f"error rate {overall['error_rate']:.1%}")
+    if failing:
+        details += '; SLO missed by ' + '; '.join(f"{path} ({', '.join(reasons)})" for path, reasons in failing.items())
+    return {
+        'status': 'FAILED' if failing else 'SUCCESS',
+        'details': details,
+        'slo': slo,
+        'path_slos': path_slos,
+        'overall': overall,
+        'endpoints': endpoints,
+    }
+
+
+def verify_endpoints(base_url, paths=DEFAULT_PATHS, requests_per_path=DEFAULT_REQUESTS_PER_PATH,
+                     concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT_SECONDS, slo=None,
+                     connect_host=None, path_slos=None):
+    """Probe every path under base_url and check each against the SLO (or its path_slos entry)"""
+    slo = dict(DEFAULT_SLO, **(slo or {}))
+    target = Target(base_url, connect_host=connect_host, timeout=timeout)
+    started = time.perf_counter()
+    samples = asyncio.run(probe(target, list(paths), requests_per_path, concurrency))
+    return summarize(samples, list(paths), slo, time.perf_counter() - started, path_slos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Probe endpoints concurrently and check a latency/error SLO')
+    parser.add_argument('base_url')
+    parser.add_argument('--path', action='append', dest='paths', help='endpoint path (repeatable)')
+    parser.add_argument('--connect', help='host to connect to instead of the URL hostname (e.g. an ALB)')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS_PER_PATH, help='requests per path')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT_SECONDS)
+    parser.add_argument('--max-error-rate', type=float, default=DEFAULT_SLO['max_error_rate'])
+    parser.add_argument('--p95-ms', type=float, default=DEFAULT_SLO['p95_ms'])
+    parser.add_argument('--p99-ms', type=float, default=DEFAULT_SLO['p99_ms'])
+    args = parser.parse_args(argv)
+
+    result = verify_endpoints(
+        args.base_url, args.paths or DEFAULT_PATHS, args.requests, args.concurrency, args.timeout,
+        slo={'max_error_rate': args.max_error_rate, 'p95_ms': args.p95_ms, 'p99_ms': args.p99_ms},
+        connect_host=args.connect,
+    )
+    print(json.dumps(result, indent=2))
+    return 0 if result['status'] == 'SUCCESS' else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
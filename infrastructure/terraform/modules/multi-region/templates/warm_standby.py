@@ -0,0 +1,220 @@
+"""
+Pilot light / warm standby control for the DR region.
+
+Primary health is classified from the Route53 health check and the primary
+ALB's error rate and latency (one GetMetricData call), together with the
+database replication lag. When the primary degrades, before the failover
+alarm fires, the DR ECS service is pre-scaled to a small warm minimum and,
+once its targets are healthy, the DR load balancer is warmed with real
+requests (and optionally an LCU capacity reservation). After the primary
+has stayed healthy for the recovery window the service returns to pilot
+light.
+
+The current mode is stored as tags on the DR ECS service so it survives
+Lambda container recycling:
+
+  dr:mode            pilot-light | warm | active (failed over; left alone)
+  dr:last-degraded   ISO timestamp of the last degraded evaluation
+"""
+
+import http.client
+import socket
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from dr_capacity import get_metric_series, metric_query
+
+MODE_TAG = 'dr:mode'
+LAST_DEGRADED_TAG = 'dr:last-degraded'
+PILOT_LIGHT = 'pilot-light'
+WARM = 'warm'
+ACTIVE = 'active'
+
+HEALTHY = 'HEALTHY'
+DEGRADED = 'DEGRADED'
+UNHEALTHY = 'UNHEALTHY'
+UNKNOWN = 'UNKNOWN'
+# The health check published no datapoints: the monitoring is broken, not the primary
+NO_DATA = 'NO_DATA'
+
+SIGNAL_LOOKBACK_SECONDS = 600
+SIGNAL_PERIOD_SECONDS = 60
+WARM_REQUEST_TIMEOUT_SECONDS = 5
+
+
+def read_primary_signals(cloudwatch_client, health_check_id, load_balancer=None,
+                         lookback_seconds=SIGNAL_LOOKBACK_SECONDS, period=SIGNAL_PERIOD_SECONDS):
+    """Latest health check percentage, 5xx rate and p95 latency of the primary region"""
+    queries = [
+        metric_query('healthy', 'AWS/Route53', 'HealthCheckPercentageHealthy',
+                     [('HealthCheckId', health_check_id)], 'Average', period),
+    ]
+    if load_balancer:
+        dimensions = [('LoadBalancer', load_balancer)]
+        queries += [
+            metric_query('requests', 'AWS/ApplicationELB', 'RequestCount', dimensions, 'Sum', period),
+            metric_query('elb5xx', 'AWS/ApplicationELB', 'HTTPCode_ELB_5XX_Count', dimensions, 'Sum', period),
+            metric_query('target5xx', 'AWS/ApplicationELB', 'HTTPCode_Target_5XX_Count', dimensions, 'Sum', period),
+            metric_query('latency', 'AWS/ApplicationELB', 'TargetResponseTime', dimensions, 'p95', period),
+        ]
+
+    end_time = datetime.now(timezone.utc)
+    series = get_metric_series(cloudwatch_client, queries,
+                               end_time - timedelta(seconds=lookback_seconds), end_time)
+
+    def latest(query_id):
+        # Series are returned newest first
+        values = series.get(query_id) or []
+        return values[0] if values else None
+
+    # Error rate over the last few periods, so one bad minute on low traffic does not count alone
+    window = 3
+    requests = sum((series.get('requests') or [])[:window])
+    errors = sum((series.get('elb5xx') or [])[:window]) + sum((series.get('target5xx') or [])[:window])
+    return {
+        'percent_healthy': latest('healthy'),
+        'error_rate': round(errors / requests, 4) if requests else None,
+        'p95_latency_seconds': latest('latency'),
+        'requests': requests,
+    }
+
+
+def classify_health(signals, replication_lag_seconds=None, max_error_rate=0.02,
+                    max_latency_seconds=2.0, max_lag_seconds=300, degraded_percent_healthy=90):
+    """Return (status, reasons) for the primary region"""
+    percent_healthy = signals.get('percent_healthy')
+    if percent_healthy is None:
+        return NO_DATA, ['no Route53 HealthCheckPercentageHealthy datapoints']
+
+    # Same threshold as the multi-region health alarm that triggers failover
+    if percent_healthy < 1:
+        return UNHEALTHY, [f'health check {percent_healthy:.0f}% healthy']
+
+    reasons = []
+    if percent_healthy < degraded_percent_healthy:
+        reasons.append(f'health check {percent_healthy:.0f}% healthy')
+    if signals.get('error_rate') is not None and signals['error_rate'] > max_error_rate:
+        reasons.append(f"5xx rate {signals['error_rate']:.1%}")
+    if signals.get('p95_latency_seconds') is not None and signals['p95_latency_seconds'] > max_latency_seconds:
+        reasons.append(f"p95 latency {signals['p95_latency_seconds']:.2f}s")
+    if replication_lag_seconds is not None and replication_lag_seconds > max_lag_seconds:
+        reasons.append(f'replication lag {replication_lag_seconds:.0f}s')
+
+    return (DEGRADED if reasons else HEALTHY), reasons
+
+
+def describe_service(ecs_client, cluster_name, service_name):
+    services = ecs_client.describe_services(cluster=cluster_name, services=[service_name])['services']
+    if not services:
+        raise Exception(f'ECS service {service_name} not found')
+    return services[0]
+
+
+def get_mode(ecs_client, service_arn):
+    tags = ecs_client.list_tags_for_resource(resourceArn=service_arn).get('tags', [])
+    tags = {tag['key']: tag['value'] for tag in tags}
+    last_degraded = tags.get(LAST_DEGRADED_TAG)
+    return {
+        'mode': tags.get(MODE_TAG, PILOT_LIGHT),
+        'last_degraded': datetime.fromisoformat(last_degraded) if last_degraded else None,
+    }
+
+
+def set_mode(ecs_client, service_arn, mode, last_degraded=None):
+    tags = [{'key': MODE_TAG, 'value': mode}]
+    if last_degraded is not None:
+        tags.append({'key': LAST_DEGRADED_TAG, 'value': last_degraded.isoformat()})
+    ecs_client.tag_resource(resourceArn=service_arn, tags=tags)
+
+
+def decide(mode, health, last_degraded, now, recovery_seconds):
+    """Transition for the current mode and health: enter_warm, stay_warm, exit_warm or none"""
+    if mode == ACTIVE:
+        return 'none'
+    if health in (DEGRADED, UNHEALTHY):
+        return 'stay_warm' if mode == WARM else 'enter_warm'
+    if mode == WARM:
+        if health == HEALTHY and (last_degraded is None or
+                                  (now - last_degraded).total_seconds() >= recovery_seconds):
+            return 'exit_warm'
+        return 'stay_warm'
+    return 'none'
+
+
+class _LoadBalancerConnection(http.client.HTTPSConnection):
+    """HTTPS to one load balancer while sending and verifying the public hostname (SNI)"""
+
+    def __init__(self, load_balancer_dns, server_hostname, timeout):
+        self._tls_context = ssl.create_default_context()
+        super().__init__(load_balancer_dns, timeout=timeout, context=self._tls_context)
+        self._server_hostname = server_hostname
+
+    def connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        self.sock = self._tls_context.wrap_socket(sock, server_hostname=self._server_hostname)
+
+
+def _warm_request(load_balancer_dns, domain_name, path):
+    connection = _LoadBalancerConnection(load_balancer_dns, domain_name, WARM_REQUEST_TIMEOUT_SECONDS)
+    try:
+        connection.request('GET', path, headers={'Host': domain_name, 'User-Agent': 'dr-warm-standby'})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except Exception as e:
+        return f'error: {e}'
+    finally:
+        connection.close()
+
+
+def healthy_targets(elbv2_client, target_group_arn):
+    descriptions = elbv2_client.describe_target_health(TargetGroupArn=target_group_arn)['TargetHealthDescriptions']
+    return sum(1 for item in descriptions if item['TargetHealth']['State'] == 'healthy')
+
+
+def prewarm(elbv2_client, target_group_arn, load_balancer_dns, domain_name, paths,
+            rounds=3, capacity_units=0):
+    """
+    Warm the DR load balancer and the application caches behind it.
+
+    Requests are only sent once the target group has healthy targets; until
+    then the result reports the wait so the next evaluation tries again.
+    """
+    result = {'target_group': target_group_arn}
+    if capacity_units:
+        load_balancer_arn = elbv2_client.describe_target_groups(
+            TargetGroupArns=[target_group_arn]
+        )['TargetGroups'][0]['LoadBalancerArns'][0]
+        current = elbv2_client.describe_capacity_reservation(LoadBalancerArn=load_balancer_arn)
+        # Evaluated every minute while warm; only a different target is a change
+        if current.get('MinimumLoadBalancerCapacity', {}).get('CapacityUnits') != capacity_units:
+            elbv2_client.modify_capacity_reservation(
+                LoadBalancerArn=load_balancer_arn,
+                MinimumLoadBalancerCapacity={'CapacityUnits': capacity_units},
+            )
+            result['capacity_reservation_changed'] = True
+        result['capacity_units'] = capacity_units
+
+    healthy = healthy_targets(elbv2_client, target_group_arn)
+    result['healthy_targets'] = healthy
+    if not healthy or not load_balancer_dns or not domain_name or not paths:
+        result['warmed'] = False
+        return result
+
+    # Enough rounds to reach every task behind the round-robin target group
+    requests = [path for _ in range(rounds * healthy) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(16, len(requests))) as executor:
+        statuses = list(executor.map(lambda path: _warm_request(load_balancer_dns, domain_name, path), requests))
+
+    result['warmed'] = True
+    result['requests'] = len(statuses)
+    result['ok'] = sum(1 for status in statuses if isinstance(status, int) and status < 500)
+    return result
+
+
+def release_capacity_reservation(elbv2_client, target_group_arn):
+    load_balancer_arn = elbv2_client.describe_target_groups(
+        TargetGroupArns=[target_group_arn]
+    )['TargetGroups'][0]['LoadBalancerArns'][0]
+    elbv2_client.modify_capacity_reservation(LoadBalancerArn=load_balancer_arn, ResetCapacityReservation=True)
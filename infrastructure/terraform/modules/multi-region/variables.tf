@@ -36,6 +36,152 @@ variable "primary_region_capacity" {
   }
 }
 
+variable "dr_capacity_headroom" {
+  description = "Extra capacity added on top of the primary region's observed peak when sizing the DR service (0.3 = 30%)"
+  type        = number
+  default     = 0.3
+}
+
+variable "dr_target_cpu_percent" {
+  description = "Average CPU utilization the DR service is sized to run at"
+  type        = number
+  default     = 60
+}
+
+variable "dr_requests_per_task" {
+  description = "Sustainable requests per second of one task; 0 sizes the DR service from CPU only"
+  type        = number
+  default     = 0
+}
+
+variable "enable_warm_standby" {
+  description = "Pre-scale the DR region to a warm standby while the primary region is degraded"
+  type        = bool
+  default     = true
+}
+
+variable "warm_standby_min_tasks" {
+  description = "DR task count kept running while in warm standby"
+  type        = number
+  default     = 2
+}
+
+variable "warm_standby_recovery_minutes" {
+  description = "Minutes the primary must stay healthy before the DR region returns to pilot light"
+  type        = number
+  default     = 15
+}
+
+variable "warm_standby_capacity_units" {
+  description = "ALB capacity units reserved on the DR load balancer during warm standby (0 disables the reservation)"
+  type        = number
+  default     = 0
+}
+
+variable "warm_standby_paths" {
+  description = "Paths requested through the DR load balancer to warm application caches"
+  type        = list(string)
+  default     = ["/api/health", "/api/i18n/en", "/api/books"]
+}
+
+variable "health_probe_paths" {
+  description = "Endpoints probed through the DR load balancer after a failover"
+  type        = list(string)
+  default     = ["/api/health", "/api/i18n/en", "/api/books"]
+}
+
+variable "health_probe_pdf_path" {
+  description = "Book PDF probed after a failover (e.g. /api/books/<id>/pdf); empty skips it"
+  type        = string
+  default     = ""
+}
+
+variable "health_probe_requests" {
+  description = "Requests sent to each probed endpoint per verification round"
+  type        = number
+  default     = 50
+}
+
+variable "health_probe_concurrency" {
+  description = "Concurrent connections used by the post-failover probe"
+  type        = number
+  default     = 32
+}
+
+variable "health_probe_slo" {
+  description = "SLO every probed endpoint must meet before a failover counts as successful"
+  type = object({
+    max_error_rate = number
+    p95_ms         = number
+    p99_ms         = number
+  })
+  default = {
+    max_error_rate = 0.01
+    p95_ms         = 1000
+    p99_ms         = 2500
+  }
+}
+
+variable "health_probe_pdf_slo" {
+  description = "Latency SLO for the book PDF endpoint, which returns a much larger body"
+  type = object({
+    p95_ms = number
+    p99_ms = number
+  })
+  default = {
+    p95_ms = 5000
+    p99_ms = 10000
+  }
+}
+
+variable "health_probe_wait_minutes" {
+  description = "How long the orchestrator keeps re-probing the DR endpoints before the failover is reported as failed; with the database and DNS waits it has to fit the orchestrator's 900 second timeout"
+  type        = number
+  default     = 3
+}
+
+variable "dns_cutover_names" {
+  description = "Record names the DR cutover moves between load balancers (empty: every record routed to the primary load balancer)"
+  type        = list(string)
+  default     = []
+}
+
+variable "dns_change_timeout_seconds" {
+  description = "How long the orchestrator waits for a Route53 cutover change to reach INSYNC (usually under a minute)"
+  type        = number
+  default     = 180
+}
+
+variable "additional_database_clusters" {
+  description = "Further clusters failed over with the application database, as primary cluster identifier => DR cluster identifier (e.g. the analytics replica)"
+  type        = map(string)
+  default     = {}
+}
+
+variable "database_failover_timeout_seconds" {
+  description = "How long the orchestrator waits for each database cluster to become the writer"
+  type        = number
+  default     = 420
+}
+
+variable "database_secret_id" {
+  description = "Secrets Manager secret (replicated to the DR region) with the database username and password for the post-failover write check; empty skips the check. The orchestrator must be able to reach the cluster endpoints"
+  type        = string
+  default     = ""
+}
+
+variable "database_ca_bundle_url" {
+  description = "RDS CA bundle packaged with the orchestrator; the write check verifies the cluster certificate against it and never connects without TLS"
+  type        = string
+  default     = "https://truststore.pki.rds.amazonaws.com/global/global-bundle.pem"
+}
+
+variable "dr_history_location" {
+  description = "Append-only store for DR drill and failover records (s3://bucket/prefix/); empty disables the history and the trend action"
+  type        = string
+  default     = ""
+}
+
 variable "secondary_region_capacity" {
   description = "Capacity configuration for secondary regions"
   type = object({
@@ -127,6 +273,18 @@ variable "replication_storage_class" {
   }
 }
 
+variable "replication_inventory_source" {
+  description = "S3 Inventory location (s3://bucket/prefix/ or manifest.json) of the primary content bucket, used to verify replication"
+  type        = string
+  default     = ""
+}
+
+variable "replication_inventory_replica" {
+  description = "S3 Inventory location of the DR region replica bucket"
+  type        = string
+  default     = ""
+}
+
 variable "dr_storage_class" {
   description = "Storage class for disaster recovery region"
   type        = string
@@ -190,6 +348,12 @@ variable "disaster_recovery_alerts" {
   default     = []
 }
 
+variable "notification_dedupe_seconds" {
+  description = "Window in which identical DR notifications are sent only once"
+  type        = number
+  default     = 300
+}
+
 variable "enable_detailed_monitoring" {
   description = "Enable detailed CloudWatch monitoring"
   type        = bool
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import csv
+import os
+import sys
 
-input_file = '/Users/jihunkong/1001project/1001-stories/locales/translations.csv'
-output_file = '/Users/jihunkong/1001project/1001-stories/locales/translations.csv'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'i18n'))
+from catalog import TRANSLATIONS_CSV, TranslationTable  # noqa: E402
 
 # Achievement translation keys (6 achievements × 2 fields each = 12 keys)
 achievements_translations = [
@@ -31,24 +32,13 @@ achievements_translations = [
     ["achievements.consistentContributor.description", "Achievement description", "Active in the last 30 days", "지난 30일 동안 활동", "Activo en los últimos 30 días", "نشط في آخر 30 يوماً", "पिछले 30 दिनों में सक्रिय", "Actif au cours des 30 derniers jours", "Aktiv in den letzten 30 Tagen", "過去30日間アクティブ", "Ativo nos últimos 30 dias", "Активен за последние 30 дней", "Attivo negli ultimi 30 giorni", "过去30天内活跃"],
 ]
 
-# Read existing CSV
-existing_rows = []
-with open(input_file, 'r', encoding='utf-8') as f:
-    reader = csv.reader(f)
-    existing_rows = list(reader)
+# Upsert into the CSV (resolved relative to the repo, see scripts/i18n/config.json)
+table = TranslationTable.load()
+existing_keys = len(table)
+print(f"Current CSV has {existing_keys} keys")
 
-print(f"Current CSV has {len(existing_rows)} rows")
+table.add_rows(achievements_translations)
+table.save()
 
-# Write back with new translations
-with open(output_file, 'w', encoding='utf-8', newline='') as f:
-    writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-
-    # Write existing rows
-    writer.writerows(existing_rows)
-
-    # Append new translations
-    writer.writerows(achievements_translations)
-
-new_total = len(existing_rows) + len(achievements_translations)
-print(f"Successfully added {len(achievements_translations)} achievement translation keys to {output_file}")
-print(f"Total rows: {new_total}")
+print(f"Successfully added {len(achievements_translations)} achievement translation keys to {TRANSLATIONS_CSV}")
+print(f"Total keys: {len(table)} ({len(table) - existing_keys} new)")
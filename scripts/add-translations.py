@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'i18n'))
+from catalog import TRANSLATIONS_CSV, TranslationTable  # noqa: E402
 
 # Define all new translation entries
 # Format: [key, context, en, ko, es, ar, hi, fr, de, ja, pt, ru, it, zh]
@@ -165,24 +169,13 @@ all_translations = (
     notification_translations
 )
 
-# Read existing CSV
-input_file = '/Users/jihunkong/1001project/1001-stories/locales/translations.csv'
-output_file = '/Users/jihunkong/1001project/1001-stories/locales/translations.csv'
-
-existing_rows = []
-with open(input_file, 'r', encoding='utf-8') as f:
-    reader = csv.reader(f)
-    existing_rows = list(reader)
-
-# Append new translations
-with open(output_file, 'w', encoding='utf-8', newline='') as f:
-    writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-
-    # Write existing rows
-    writer.writerows(existing_rows)
+# Upsert into the CSV (resolved relative to the repo, see scripts/i18n/config.json)
+table = TranslationTable.load()
+existing_keys = len(table)
+print(f"Current CSV has {existing_keys} keys")
 
-    # Write new rows
-    writer.writerows(all_translations)
+table.add_rows(all_translations)
+table.save()
 
-print(f"Successfully added {len(all_translations)} translation keys to {output_file}")
-print(f"Total rows: {len(existing_rows) + len(all_translations)}")
+print(f"Successfully added {len(all_translations)} translation keys to {TRANSLATIONS_CSV}")
+print(f"Total keys: {len(table)} ({len(table) - existing_keys} new)")
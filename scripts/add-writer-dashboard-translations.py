@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import csv
+import os
+import sys
 
-input_file = '/Users/jihunkong/1001project/1001-stories/locales/translations.csv'
-output_file = '/Users/jihunkong/1001project/1001-stories/locales/translations.csv'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'i18n'))
+from catalog import TRANSLATIONS_CSV, TranslationTable  # noqa: E402
 
 # Writer Dashboard translation keys
 writer_dashboard_translations = [
@@ -67,24 +68,13 @@ writer_dashboard_translations = [
     ["submission.readTime", "Submission info", "Estimated read time", "예상 읽기 시간", "Tiempo de lectura estimado", "وقت القراءة المقدر", "अनुमानित पढ़ने का समय", "Temps de lecture estimé", "Geschätzte Lesezeit", "推定読み時間", "Tempo estimado de leitura", "Расчетное время чтения", "Tempo di lettura stimato", "预计阅读时间"],
 ]
 
-# Read existing CSV
-existing_rows = []
-with open(input_file, 'r', encoding='utf-8') as f:
-    reader = csv.reader(f)
-    existing_rows = list(reader)
+# Upsert into the CSV (resolved relative to the repo, see scripts/i18n/config.json)
+table = TranslationTable.load()
+existing_keys = len(table)
+print(f"Current CSV has {existing_keys} keys")
 
-print(f"Current CSV has {len(existing_rows)} rows")
+table.add_rows(writer_dashboard_translations)
+table.save()
 
-# Write back with new translations
-with open(output_file, 'w', encoding='utf-8', newline='') as f:
-    writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-
-    # Write existing rows
-    writer.writerows(existing_rows)
-
-    # Append new translations
-    writer.writerows(writer_dashboard_translations)
-
-new_total = len(existing_rows) + len(writer_dashboard_translations)
-print(f"Successfully added {len(writer_dashboard_translations)} translation keys to {output_file}")
-print(f"Total rows: {new_total}")
+print(f"Successfully added {len(writer_dashboard_translations)} translation keys to {TRANSLATIONS_CSV}")
+print(f"Total keys: {len(table)} ({len(table) - existing_keys} new)")
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Render the compliance PDFs in public/documents.
+
+  python3 scripts/documents                 render every document
+  python3 scripts/documents privacy-policy-ko --out /tmp/docs
+  python3 scripts/documents --list
+"""
+
+import os
+import sys
+
+# Sibling modules are imported as top-level modules, also when this directory
+# is executed as `python3 scripts/documents`
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from build import main  # noqa: E402
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+Build the compliance PDFs in public/documents from their source files.
+
+Each document is defined by scripts/documents/content/<name>.yaml (or
+.json) and written to <name>-<year>.pdf; `year` comes from the source and
+defaults to the current year. Documents with `locales` take their text from
+locales/translations.csv (see localize.py) and build one target per locale:
+<name>-<year>-<locale>.pdf, except for the default locale.
+
+A target is only rendered again when its input hash changes: the localized
+document, the renderer modules and the font files its locale is drawn
+with. Changed targets render in a process pool; each worker registers a
+locale's fonts once and keeps its shaped text runs cached.
+
+Next to every PDF the build keeps a content-addressed copy
+(<name>-<year>.<hash>.pdf) and records both in public/documents/manifest.json.
+The hashed copies never change, so they can be served with an immutable
+Cache-Control header.
+
+Building is a manual release step: nothing runs it in CI or the Docker
+build, so public/documents only gets hashed copies and a manifest once the
+build is run and its output deployed. Pages that want the immutable URLs
+have to read them from manifest.json.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import reportlab
+
+from fonts import FontError, font_files, register_fonts
+from layout import load_source, render_document
+from localize import document_locales, localized_document, missing_keys, translation_table
+from text import uharfbuzz
+
+DOCUMENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(DOCUMENTS_DIR, '..', '..'))
+CONTENT_DIR = os.path.join(DOCUMENTS_DIR, 'content')
+OUTPUT_DIR = os.path.join(REPO_ROOT, 'public', 'documents')
+SOURCE_EXTENSIONS = ('.yaml', '.yml', '.json')
+RENDERER_MODULES = ('layout.py', 'fonts.py', 'text.py')
+DEFAULT_OUTPUT = '{name}-{year}{suffix}.pdf'
+MANIFEST_FILE = 'manifest.json'
+HASH_LENGTH = 12
+
+_digests = {}
+
+
+def find_sources(names=None, content_dir=CONTENT_DIR):
+    """Map document name -> source path, optionally limited to names"""
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(content_dir, '*'))):
+        name, extension = os.path.splitext(os.path.basename(path))
+        if extension in SOURCE_EXTENSIONS:
+            sources[name] = path
+    if names:
+        unknown = [name for name in names if name not in sources]
+        if unknown:
+            raise SystemExit(f"Unknown document(s): {', '.join(unknown)}")
+        sources = {name: sources[name] for name in names}
+    return sources
+
+
+def file_digest(path, digest=None):
+    digest = digest or hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest
+
+
+def output_filename(name, document, locale, default_locale):
+    year = document.get('year', date.today().year)
+    suffix = '' if locale == default_locale else f'-{locale}'
+    return document.get('output', DEFAULT_OUTPUT).format(name=name, year=year, locale=locale, suffix=suffix)
+
+
+def document_targets(name, document, languages=None):
+    """(target, locale, filename) for each locale the document is built in"""
+    locales = document_locales(document)
+    for locale in locales:
+        if languages and locale not in languages:
+            continue
+        target = name if locale == locales[0] else f'{name}.{locale}'
+        yield target, locale, output_filename(name, document, locale, locales[0])
+
+
+def immutable_filename(filename, content_hash):
+    stem, extension = os.path.splitext(filename)
+    return f"{stem}.{content_hash[:HASH_LENGTH]}{extension}"
+
+
+def renderer_digest(locale):
+    """Digest of the inputs every document in locale shares: renderer code, libraries and fonts"""
+    if locale not in _digests:
+        shaper = getattr(uharfbuzz, '__version__', 'none') if uharfbuzz else 'none'
+        digest = hashlib.sha256(f"reportlab {reportlab.Version} uharfbuzz {shaper}\n".encode('utf-8'))
+        for module in RENDERER_MODULES:
+            file_digest(os.path.join(DOCUMENTS_DIR, module), digest)
+        for path in font_files(locale):
+            digest.update(os.path.basename(path).encode('utf-8'))
+            file_digest(path, digest)
+        _digests[locale] = digest
+    return _digests[locale]
+
+
+def input_hash(shared, document, filename):
+    digest = shared.copy()
+    digest.update(filename.encode('utf-8'))
+    digest.update(json.dumps(document, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('documents', {})
+
+
+def write_manifest(output_dir, documents):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'documents': documents}, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+
+def is_current(entry, output_dir, source_hash):
+    """True when the manifest entry was built from source_hash and both outputs are intact"""
+    if not entry or entry.get('input') != source_hash:
+        return False
+    output_path = os.path.join(output_dir, entry['file'])
+    if not (os.path.exists(output_path) and os.path.exists(os.path.join(output_dir, entry['immutable']))):
+        return False
+    return file_digest(output_path).hexdigest() == entry['sha256']
+
+
+def publish(output_dir, filename, locale, source_hash, pages):
+    """Write the content-addressed copy of a rendered PDF and return its manifest entry"""
+    output_path = os.path.join(output_dir, filename)
+    content_hash = file_digest(output_path).hexdigest()
+    immutable = immutable_filename(filename, content_hash)
+
+    stem, extension = os.path.splitext(filename)
+    stale = re.compile(re.escape(stem) + r'\.[0-9a-f]{%d}' % HASH_LENGTH + re.escape(extension) + '$')
+    for old in os.listdir(output_dir):
+        if old != immutable and stale.match(old):
+            os.remove(os.path.join(output_dir, old))
+    shutil.copyfile(output_path, os.path.join(output_dir, immutable))
+
+    return {
+        'file': filename,
+        'locale': locale,
+        'immutable': immutable,
+        'sha256': content_hash,
+        'input': source_hash,
+        'bytes': os.path.getsize(output_path),
+        'pages': pages,
+    }
+
+
+def render(target, document, output_path):
+    """Render one localized document; runs in a worker process"""
+    pages = render_document(document, output_path, register_fonts(document['locale']))
+    return target, pages
+
+
+def build(sources, output_dir=OUTPUT_DIR, jobs=None, force=False, prune=False, languages=None):
+    """Render the changed targets in sources; returns (rendered, skipped, errors)"""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    table = translation_table()
+
+    planned = set()
+    pending = {}
+    skipped = []
+    errors = {}
+    for name, source_path in sources.items():
+        document = load_source(source_path)
+        missing = missing_keys(document, table)
+        if missing:
+            print(f"Warning: {name}: keys missing from translations.csv: {', '.join(missing)}")
+        for target, locale, filename in document_targets(name, document, languages):
+            planned.add(target)
+            try:
+                shared = renderer_digest(locale)
+            except FontError as e:
+                errors[target] = str(e)
+                continue
+            localized = localized_document(document, locale, table)
+            source_hash = input_hash(shared, localized, filename)
+            if not force and is_current(manifest.get(target), output_dir, source_hash):
+                skipped.append(target)
+            else:
+                pending[target] = (localized, filename, source_hash)
+
+    tasks = [(target, localized, os.path.join(output_dir, filename))
+             for target, (localized, filename, _) in pending.items()]
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    results = {}
+    if jobs > 1:
+        # One failing document must not discard the others or the manifest update
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(render, *task): task[0] for task in tasks}
+            for future in as_completed(futures):
+                try:
+                    target, pages = future.result()
+                    results[target] = pages
+                except Exception as e:
+                    errors[futures[future]] = f'{type(e).__name__}: {e}'
+    else:
+        for task in tasks:
+            try:
+                target, pages = render(*task)
+                results[target] = pages
+            except Exception as e:
+                errors[task[0]] = f'{type(e).__name__}: {e}'
+
+    rendered = [target for target in pending if target in results]
+    for target in rendered:
+        localized, filename, source_hash = pending[target]
+        manifest[target] = publish(output_dir, filename, localized['locale'], source_hash, results[target])
+
+    if prune:
+        manifest = {target: entry for target, entry in manifest.items() if target in planned}
+    if rendered or prune:
+        write_manifest(output_dir, manifest)
+    return rendered, skipped, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='scripts/documents', description='Build compliance PDFs')
+    parser.add_argument('names', nargs='*', help='documents to build (default: all)')
+    parser.add_argument('--out', default=OUTPUT_DIR, help='output directory (default: public/documents)')
+    parser.add_argument('--jobs', '-j', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='render even when inputs are unchanged')
+    parser.add_argument('--lang', action='append', help='only build this locale (repeatable)')
+    parser.add_argument('--list', action='store_true', help='list the available documents')
+    args = parser.parse_args(argv)
+
+    sources = find_sources(args.names)
+    if args.list:
+        for name, path in sources.items():
+            for target, locale, filename in document_targets(name, load_source(path), args.lang):
+                print(f"{target:36} {locale:4} {os.path.relpath(path, REPO_ROOT):56} {filename}")
+        return 0
+
+    started = time.time()
+    rendered, skipped, errors = build(sources, args.out, jobs=args.jobs, force=args.force,
+                                      prune=not (args.names or args.lang), languages=args.lang)
+    manifest = load_manifest(args.out)
+    for target in rendered:
+        entry = manifest[target]
+        print(f"PDF created: {os.path.relpath(os.path.join(args.out, entry['file']), REPO_ROOT)} "
+              f"({entry['pages']} pages, {entry['immutable']})")
+    for target, error in errors.items():
+        print(f"Error: {target}: {error}")
+    print(f"Rendered {len(rendered)}, unchanged {len(skipped)}, failed {len(errors)} documents "
+          f"in {time.time() - started:.2f}s")
+    return 1 if errors else 0
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Font resolution and registration for the document renderer.
+
+The usual macOS and Linux font directories (plus any in DOCUMENT_FONT_DIRS,
+separated by os.pathsep) are scanned once and indexed: family, style and
+per-script coverage of every face reportlab can embed. The index is cached
+in $XDG_CACHE_HOME/1001stories/font-index.json and a font file is only
+parsed again when its size or mtime changes, so later runs just list
+directories.
+
+Each locale gets a font chain: the best face for every script the locale
+writes (Hangul, kana and Han, Devanagari, Arabic, Cyrillic) plus Latin for
+URLs and names. The text layer picks the first face in the chain that has a
+glyph for each character.
+
+reportlab embeds TrueType fonts as subsets holding only the glyphs a
+document uses. Faces with PostScript (CFF) outlines, such as the
+NotoSansCJK .otf/.ttc files, cannot be embedded and are left out of the
+index; on Debian/Ubuntu install fonts-nanum, fonts-ipaexfont,
+fonts-wqy-zenhei, fonts-lohit-deva and fonts-dejavu for all 12 locales.
+"""
+
+import json
+import os
+import re
+import struct
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFile
+
+FONT_DIRS = [
+    '/System/Library/Fonts',
+    '/Library/Fonts',
+    '~/Library/Fonts',
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    '~/.local/share/fonts',
+    '~/.fonts',
+]
+FONT_EXTENSIONS = ('.ttf', '.ttc')
+INDEX_VERSION = 3
+
+# Code points sampled per script, and the share of them a face must have
+SCRIPTS = {
+    'latin': ([(0x41, 0x5A), (0x61, 0x7A)], 1.0),
+    'latin-1': ([(0xC0, 0xD6), (0xD8, 0xF6), (0xF8, 0xFF)], 1.0),
+    'cyrillic': ([(0x410, 0x44F)], 1.0),
+    'arabic': ([(0x621, 0x63A), (0x641, 0x64A)], 1.0),
+    'devanagari': ([(0x905, 0x939), (0x93E, 0x94D)], 0.95),
+    # KS X 1001 has 2,350 of the 11,172 syllables; fonts below that miss common text
+    'hangul': ([(0xAC00, 0xD7A3)], 0.2),
+    'kana': ([(0x3041, 0x3093), (0x30A1, 0x30F6)], 0.95),
+    # GB 2312 and JIS X 0208 level 1 together are roughly a quarter of the block
+    'han': ([(0x4E00, 0x9FFF)], 0.25),
+}
+
+LOCALE_SCRIPTS = {
+    'ko': ('hangul',),
+    'ja': ('kana', 'han'),
+    'zh': ('han',),
+    'hi': ('devanagari',),
+    'ar': ('arabic',),
+    'ru': ('cyrillic',),
+    'es': ('latin-1',),
+    'fr': ('latin-1',),
+    'de': ('latin-1',),
+    'pt': ('latin-1',),
+    'it': ('latin-1',),
+}
+
+# Preferred families per script, best first; any other covering face follows
+PREFERRED_FAMILIES = {
+    'hangul': ['Apple SD Gothic Neo', 'AppleGothic', 'NanumGothic', 'Noto Sans KR',
+               'Malgun Gothic', 'UnDotum', 'Baekmuk Gulim'],
+    'kana': ['Hiragino Sans', 'Hiragino Kaku Gothic ProN', 'Noto Sans JP', 'IPAexGothic',
+             'IPAGothic', 'TakaoGothic', 'VL Gothic'],
+    'han': ['PingFang SC', 'Noto Sans SC', 'WenQuanYi Zen Hei', 'WenQuanYi Micro Hei',
+            'Droid Sans Fallback', 'SimHei'],
+    'devanagari': ['Kohinoor Devanagari', 'Devanagari Sangam MN', 'Noto Sans Devanagari',
+                   'Lohit Devanagari', 'Mukta'],
+    'arabic': ['Geeza Pro', 'Noto Sans Arabic', 'Noto Naskh Arabic', 'DejaVu Sans'],
+    'cyrillic': ['Helvetica Neue', 'Noto Sans', 'DejaVu Sans', 'Liberation Sans'],
+    'latin': ['Helvetica Neue', 'Noto Sans', 'DejaVu Sans', 'Liberation Sans'],
+    'latin-1': ['Helvetica Neue', 'Noto Sans', 'DejaVu Sans', 'Liberation Sans'],
+}
+# reportlab sets this PDF flag for faces with usWeightClass >= 600
+FORCE_BOLD_FLAG = 1 << 18
+
+_index = None
+_resolved = {}
+_face_names = {}
+
+
+class FontError(Exception):
+    pass
+
+
+def font_dirs():
+    extra = [d for d in os.environ.get('DOCUMENT_FONT_DIRS', '').split(os.pathsep) if d]
+    return [os.path.expanduser(d) for d in extra + FONT_DIRS]
+
+
+def index_path():
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(cache_home, '1001stories', 'font-index.json')
+
+
+def locale_scripts(locale):
+    return LOCALE_SCRIPTS.get(locale, ()) + ('latin',)
+
+
+def _face_count(path):
+    with open(path, 'rb') as f:
+        header = f.read(12)
+    if header[:4] == b'ttcf':
+        return struct.unpack('>I', header[8:12])[0]
+    return 1
+
+
+def _coverage(char_to_glyph):
+    return {script: sum(1 for start, end in ranges for code in range(start, end + 1) if code in char_to_glyph)
+            for script, (ranges, _) in SCRIPTS.items()}
+
+
+def _read_faces(path):
+    """Describe the embeddable faces in a font file; CFF and broken faces are skipped"""
+    faces = []
+    for index in range(_face_count(path)):
+        try:
+            font = TTFontFile(path, subfontIndex=index, validate=0)
+        except Exception:
+            continue
+        style = font.styleName.decode('latin-1')
+        # Legacy family names carry the weight ("Shobhika Bold" / "Regular")
+        family = re.sub(r'\s+(Regular|Bold|Book|Roman)$', '', font.familyName.decode('latin-1'))
+        faces.append({
+            'index': index,
+            'family': family,
+            'style': style,
+            'bold': bool(font.flags & FORCE_BOLD_FLAG) or _is_bold(style),
+            'scripts': _coverage(font.charToGlyph),
+        })
+    return faces
+
+
+def _load_index():
+    try:
+        with open(index_path(), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == INDEX_VERSION:
+            return data['files']
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def _save_index(files):
+    path = index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'files': files}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def font_index():
+    """Map font path -> {size, mtime, faces}, refreshing changed files in the cached index"""
+    global _index
+    if _index is not None:
+        return _index
+
+    cached = _load_index()
+    files = {}
+    for directory in font_dirs():
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if not name.lower().endswith(FONT_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entry = cached.get(path)
+                if not entry or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+                    entry = {'size': stat.st_size, 'mtime': stat.st_mtime, 'faces': _read_faces(path)}
+                files[path] = entry
+
+    if files != cached:
+        try:
+            _save_index(files)
+        except OSError as e:
+            print(f"Warning: could not write font index {index_path()}: {e}")
+    _index = files
+    return _index
+
+
+def _is_bold(style):
+    return style.lower() in ('bold', 'bold regular')
+
+
+def covers(face, script):
+    ranges, share = SCRIPTS[script]
+    total = sum(end - start + 1 for start, end in ranges)
+    return face['scripts'].get(script, 0) >= share * total
+
+
+def script_faces(script):
+    """Regular faces that cover script, best first"""
+    preferred = PREFERRED_FAMILIES.get(script, [])
+
+    def rank(face):
+        family = face['family']
+        return (preferred.index(family) if family in preferred else len(preferred),
+                family, face['path'], face['index'])
+
+    faces = [dict(face, path=path)
+             for path, entry in font_index().items()
+             for face in entry['faces']
+             if not face['bold'] and covers(face, script)]
+    return sorted(faces, key=rank)
+
+
+def _bold_face(regular):
+    for path, entry in sorted(font_index().items()):
+        for face in entry['faces']:
+            if face['family'] == regular['family'] and face['bold']:
+                return dict(face, path=path)
+    return regular
+
+
+def resolve_fonts(locale='ko'):
+    """Return {'regular': [face, ...], 'bold': [face, ...]}, the font chain for locale"""
+    if locale in _resolved:
+        return _resolved[locale]
+
+    chain = []
+    for script in locale_scripts(locale):
+        if any(covers(face, script) for face in chain):
+            continue
+        candidates = script_faces(script)
+        if not candidates:
+            raise FontError(f"No embeddable TrueType font for {script} ({locale}) found in "
+                            f"{', '.join(font_dirs())}. Install one or set DOCUMENT_FONT_DIRS.")
+        chain.append(candidates[0])
+
+    _resolved[locale] = {'regular': chain, 'bold': [_bold_face(face) for face in chain]}
+    return _resolved[locale]
+
+
+def font_files(locale='ko'):
+    """Font files the renderer draws locale with, for build input hashing"""
+    return sorted({face['path'] for faces in resolve_fonts(locale).values() for face in faces})
+
+
+def _register(face):
+    key = (face['path'], face['index'])
+    if key not in _face_names:
+        name = re.sub(r'[^A-Za-z0-9]+', '', f"{face['family']}-{face['style']}") + f"-{face['index']}"
+        pdfmetrics.registerFont(TTFont(name, face['path'], subfontIndex=face['index']))
+        _face_names[key] = name
+    return _face_names[key]
+
+
+def register_fonts(locale='ko'):
+    """Return {'regular': [name, ...], 'bold': [name, ...]}, registering fonts on first use"""
+    return {role: [_register(face) for face in faces] for role, faces in resolve_fonts(locale).items()}
+
+
+if __name__ == '__main__':
+    import sys
+
+    for locale in sys.argv[1:] or ['ko']:
+        try:
+            chain = resolve_fonts(locale)
+        except FontError as e:
+            print(f"{locale}: {e}")
+            continue
+        for regular, bold in zip(chain['regular'], chain['bold']):
+            print(f"{locale}: {regular['family']:24} {regular['path']}#{regular['index']}  bold: {bold['path']}")
+    print(f"Index: {index_path()}")
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Small flow layout engine for the compliance PDFs in public/documents.
+
+A document is a list of declarative blocks (title, heading, paragraph,
+bullets, table, box, spacer, page_break) loaded from a YAML or JSON file.
+Every string is measured with the font metrics before it is placed: text
+wraps at word boundaries (falling back to character breaks for long URLs
+and paths), table cells wrap inside their column, rows and boxes move to
+the next page when they do not fit, and table headers repeat after a page
+break. Nothing is truncated.
+
+Text goes through text.TextSetter, so a line may mix fonts from the
+locale's font chain. Right-to-left documents (Arabic) align text to the
+right and mirror tables, bullets and box accents.
+"""
+
+import json
+import os
+import re
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4, LETTER
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+from text import TextSetter
+
+PAGE_SIZES = {'A4': A4, 'LETTER': LETTER}
+RTL_LOCALES = ('ar',)
+
+DEFAULT_THEME = {
+    'page_size': 'A4',
+    'margin_left': 20,
+    'margin_right': 20,
+    'margin_top': 25,
+    'margin_bottom': 22,
+    'font_size': 9.5,
+    'leading': 1.45,
+    'title_size': 20,
+    'subtitle_size': 12,
+    'heading_sizes': [14, 11.5],
+    'footer_size': 8,
+    'cell_padding': 2.2,
+    'paragraph_spacing': 3,
+    'block_spacing': 6,
+    'colors': {
+        'text': '#222222',
+        'muted': '#666666',
+        'accent': '#1f4e79',
+        'rule': '#b0b7c3',
+        'header_fill': '#e6ebf2',
+        'label_fill': '#f3f5f8',
+        'box_fill': '#f5f7fa',
+        'pass': '#2e7d32',
+        'fail': '#c62828',
+        'warn': '#ef6c00',
+    },
+}
+
+
+class LayoutError(Exception):
+    pass
+
+
+def load_source(path):
+    """Load a document definition from .yaml/.yml or .json"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if not isinstance(data, dict) or 'blocks' not in data:
+        raise LayoutError(f"{path}: a document needs a 'blocks' list")
+    data.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+    return data
+
+
+def merge_theme(overrides):
+    theme = dict(DEFAULT_THEME)
+    theme['colors'] = dict(DEFAULT_THEME['colors'])
+    for key, value in (overrides or {}).items():
+        if key == 'colors':
+            theme['colors'].update(value)
+        else:
+            theme[key] = value
+    return theme
+
+
+def wrap_text(text, measure, max_width):
+    """Split text into lines that fit max_width; explicit newlines are kept"""
+    lines = []
+    for paragraph in str(text).split('\n'):
+        words = paragraph.split(' ')
+        line = ''
+        for word in words:
+            candidate = f'{line} {word}' if line else word
+            if measure(candidate) <= max_width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # A single word wider than the line (URL, compound, CJK sentence) breaks
+            # after '/' or '-' where it can, and by character otherwise
+            line = ''
+            for piece in re.findall(r'[^/-]+[/-]*|[/-]+', word):
+                if measure(line + piece) <= max_width:
+                    line += piece
+                    continue
+                if line:
+                    lines.append(line)
+                    line = ''
+                for char in piece:
+                    if line and measure(line + char) > max_width:
+                        lines.append(line)
+                        line = char
+                    else:
+                        line += char
+        lines.append(line)
+    return lines
+
+
+def cell_text(value):
+    """Table cells are plain values or {text, color} mappings"""
+    if isinstance(value, dict):
+        return str(value.get('text', ''))
+    return '' if value is None else str(value)
+
+
+class PageWriter:
+    """Cursor over a canvas that starts new pages as content needs them"""
+
+    def __init__(self, path, document, fonts, theme, rtl=False):
+        self.document = document
+        self.theme = theme
+        self.rtl = rtl
+        self.text = TextSetter(fonts, rtl=rtl)
+        self.width, self.height = PAGE_SIZES[theme['page_size']]
+        self.left = theme['margin_left'] * mm
+        self.right = self.width - theme['margin_right'] * mm
+        self.top = self.height - theme['margin_top'] * mm
+        self.bottom = theme['margin_bottom'] * mm
+        self.content_width = self.right - self.left
+        self.page = 1
+        self.y = self.top
+
+        # invariant: no timestamps or random IDs, so equal inputs give equal bytes
+        self.canvas = canvas.Canvas(path, pagesize=(self.width, self.height), invariant=1,
+                                    lang=document.get('locale'))
+        meta = document.get('meta', {})
+        self.canvas.setTitle(meta.get('title', document.get('title', '')))
+        self.canvas.setAuthor(meta.get('author', ''))
+        self.canvas.setSubject(meta.get('subject', ''))
+
+    def color(self, name):
+        return HexColor(self.theme['colors'].get(name, name))
+
+    def leading(self, size):
+        return size * self.theme['leading']
+
+    def remaining(self):
+        return self.y - self.bottom
+
+    def ensure(self, height):
+        """Start a new page unless height still fits (a full page always accepts)"""
+        if height > self.remaining() and self.y < self.top:
+            self.new_page()
+
+    def new_page(self):
+        self.draw_footer()
+        self.canvas.showPage()
+        self.page += 1
+        self.y = self.top
+
+    def wrap(self, text, bold, size, max_width):
+        return wrap_text(text, lambda line: self.text.width(line, bold, size), max_width)
+
+    def draw_text(self, x, baseline, text, bold, size, max_width, align=None):
+        """Draw one line in the box [x, x + max_width]; the default alignment follows the direction"""
+        align = align or ('right' if self.rtl else 'left')
+        self.text.draw(self.canvas, x, baseline, text, bold, size, align, max_width)
+
+    def draw_footer(self):
+        footer = self.document.get('footer')
+        if not footer:
+            return
+        size = self.theme['footer_size']
+        self.canvas.setFillColor(self.color('muted'))
+        text = footer.format(page=self.page, title=self.document.get('title', ''))
+        self.draw_text(0, self.bottom / 2 + size, text, False, size, self.width, 'center')
+        self.draw_text(0, self.bottom / 2 - 2, str(self.page), False, size, self.width, 'center')
+
+    def draw_lines(self, lines, x, bold, size, color='text', align=None, max_width=None):
+        self.canvas.setFillColor(self.color(color))
+        leading = self.leading(size)
+        for line in lines:
+            self.ensure(leading)
+            self.draw_text(x, self.y - size, line, bold, size, max_width or self.content_width, align)
+            self.y -= leading
+
+    def finish(self):
+        self.draw_footer()
+        self.canvas.save()
+
+
+def render_title(writer, block):
+    theme = writer.theme
+    writer.y -= 8 * mm
+    for key, size, color, bold in (('text', theme['title_size'], 'accent', True),
+                                   ('subtitle', theme['subtitle_size'], 'text', False)):
+        if block.get(key):
+            lines = writer.wrap(block[key], bold, size, writer.content_width)
+            writer.draw_lines(lines, writer.left, bold, size, color, align='center')
+            writer.y -= 1.5 * mm
+    for line in block.get('lines', []):
+        lines = writer.wrap(line, False, theme['font_size'], writer.content_width)
+        writer.draw_lines(lines, writer.left, False, theme['font_size'], 'muted', align='center')
+    writer.y -= 4 * mm
+
+
+def render_heading(writer, block):
+    level = block.get('level', 1)
+    size = writer.theme['heading_sizes'][min(level, len(writer.theme['heading_sizes'])) - 1]
+    lines = writer.wrap(block['text'], True, size, writer.content_width)
+    # Keep the heading with at least two lines of what follows
+    writer.ensure(len(lines) * writer.leading(size) + 3 * writer.leading(writer.theme['font_size']))
+    writer.y -= 2 * mm if level == 1 else 1 * mm
+    writer.draw_lines(lines, writer.left, True, size, 'accent' if level == 1 else 'text')
+    if level == 1:
+        writer.canvas.setStrokeColor(writer.color('rule'))
+        writer.canvas.setLineWidth(0.6)
+        writer.canvas.line(writer.left, writer.y + 1, writer.right, writer.y + 1)
+    writer.y -= 2 * mm
+
+
+def render_paragraph(writer, block):
+    size = block.get('size', writer.theme['font_size'])
+    bold = bool(block.get('bold'))
+    text = block['text']
+    # A list of lines keeps each one a separate (translatable) value
+    if isinstance(text, list):
+        text = '\n'.join(text)
+    lines = writer.wrap(text, bold, size, writer.content_width)
+    writer.draw_lines(lines, writer.left, bold, size, block.get('color', 'text'))
+    writer.y -= writer.theme['paragraph_spacing']
+
+
+def render_bullets(writer, block):
+    size = block.get('size', writer.theme['font_size'])
+    marker = block.get('marker', '•')
+    indent = 5 * mm
+    # The marker sits on the reading side: left for LTR, right for RTL
+    text_x = writer.left if writer.rtl else writer.left + indent
+    for item in block['items']:
+        lines = writer.wrap(item, False, size, writer.content_width - indent)
+        writer.ensure(writer.leading(size))
+        writer.canvas.setFillColor(writer.color('text'))
+        writer.draw_text(writer.left + 1 * mm, writer.y - size, marker, False, size,
+                         writer.content_width - 2 * mm)
+        writer.draw_lines(lines, text_x, False, size, max_width=writer.content_width - indent)
+    writer.y -= writer.theme['paragraph_spacing']
+
+
+def _column_widths(writer, columns, count):
+    weights = [column.get('width', 1) for column in columns] if columns else [1] * count
+    total = float(sum(weights))
+    return [writer.content_width * weight / total for weight in weights]
+
+
+def _column_lefts(writer, widths):
+    """Left edge of every column; RTL tables run from the right margin"""
+    lefts = []
+    x = writer.left
+    for width in widths:
+        lefts.append(writer.left + writer.right - x - width if writer.rtl else x)
+        x += width
+    return lefts
+
+
+def _cell_color(block, column, value):
+    if isinstance(value, dict) and value.get('color'):
+        return value['color']
+    colors = dict(block.get('highlight', {}))
+    colors.update(column.get('highlight', {}) if column else {})
+    text = cell_text(value)
+    for prefix, color in colors.items():
+        if text.startswith(prefix):
+            return color
+    return 'text'
+
+
+def render_table(writer, block):
+    rows = block.get('rows', [])
+    columns = block.get('columns', [])
+    count = len(columns) if columns else max(len(row) for row in rows)
+    for row in rows:
+        if len(row) > count:
+            raise LayoutError(f"table row has {len(row)} cells for {count} columns: {row!r}")
+    widths = _column_widths(writer, columns, count)
+    lefts = _column_lefts(writer, widths)
+    size = block.get('size', writer.theme['font_size'])
+    leading = writer.leading(size)
+    padding = writer.theme['cell_padding'] * mm
+    label_column = block.get('label_column', False)
+
+    def layout(cells, bold=False):
+        wrapped = []
+        for index in range(count):
+            value = cells[index] if index < len(cells) else None
+            cell_bold = bold or (label_column and index == 0)
+            wrapped.append((value, cell_bold, writer.wrap(cell_text(value), cell_bold, size,
+                                                          widths[index] - 2 * padding)))
+        height = max(len(lines) for _, _, lines in wrapped) * leading + 2 * padding
+        return wrapped, height
+
+    def draw_row(wrapped, height, fill=None):
+        top = writer.y
+        for index, (value, bold, lines) in enumerate(wrapped):
+            x = lefts[index]
+            cell_fill = fill or ('label_fill' if label_column and index == 0 else None)
+            if cell_fill:
+                writer.canvas.setFillColor(writer.color(cell_fill))
+                writer.canvas.rect(x, top - height, widths[index], height, stroke=0, fill=1)
+            column = columns[index] if index < len(columns) else None
+            writer.canvas.setFillColor(writer.color(_cell_color(block, column, value)))
+            baseline = top - padding - size
+            for line in lines:
+                writer.draw_text(x + padding, baseline, line, bold, size, widths[index] - 2 * padding)
+                baseline -= leading
+
+        writer.canvas.setStrokeColor(writer.color('rule'))
+        writer.canvas.setLineWidth(0.4)
+        writer.canvas.rect(writer.left, top - height, writer.content_width, height, stroke=1, fill=0)
+        for x in sorted(lefts)[1:]:
+            writer.canvas.line(x, top, x, top - height)
+        writer.y -= height
+
+    header = None
+    if columns and block.get('header', True):
+        header = layout([column.get('title', '') for column in columns], bold=True)
+
+    if header:
+        first = layout(rows[0]) if rows else (None, 0)
+        writer.ensure(header[1] + first[1])
+        draw_row(*header, fill='header_fill')
+
+    for row in rows:
+        wrapped, height = layout(row)
+        if height > writer.remaining():
+            writer.new_page()
+            if header:
+                draw_row(*header, fill='header_fill')
+        draw_row(wrapped, height)
+    writer.y -= writer.theme['block_spacing']
+
+
+def render_box(writer, block):
+    """Shaded box with an optional title; split across pages line by line if needed"""
+    size = block.get('size', writer.theme['font_size'])
+    leading = writer.leading(size)
+    padding = 3 * mm
+    inner = writer.content_width - 2 * padding
+    entries = []
+    if block.get('title'):
+        entries += [(line, True) for line in writer.wrap(block['title'], True, size, inner)]
+    for text in block.get('lines', [block['text']] if 'text' in block else []):
+        entries += [(line, False) for line in writer.wrap(text, False, size, inner)]
+
+    writer.ensure(min(len(entries) * leading + 2 * padding, writer.top - writer.bottom))
+    writer.y -= 1 * mm
+    accent_x = writer.right - 1.2 * mm if writer.rtl else writer.left
+    index = 0
+    while index < len(entries):
+        fitting = max(1, int((writer.remaining() - 2 * padding) // leading))
+        chunk = entries[index:index + fitting]
+        height = len(chunk) * leading + 2 * padding
+        writer.canvas.setFillColor(writer.color('box_fill'))
+        writer.canvas.setStrokeColor(writer.color('rule'))
+        writer.canvas.setLineWidth(0.4)
+        writer.canvas.rect(writer.left, writer.y - height, writer.content_width, height, stroke=1, fill=1)
+        writer.canvas.setFillColor(writer.color(block.get('accent', 'accent')))
+        writer.canvas.rect(accent_x, writer.y - height, 1.2 * mm, height, stroke=0, fill=1)
+
+        baseline = writer.y - padding - size
+        writer.canvas.setFillColor(writer.color('text'))
+        for line, bold in chunk:
+            writer.draw_text(writer.left + padding, baseline, line, bold, size, inner)
+            baseline -= leading
+        writer.y -= height
+        index += len(chunk)
+        if index < len(entries):
+            writer.new_page()
+    writer.y -= writer.theme['block_spacing']
+
+
+def render_spacer(writer, block):
+    writer.y -= block.get('height', 5) * mm
+
+
+def render_page_break(writer, block):
+    writer.new_page()
+
+
+BLOCK_RENDERERS = {
+    'title': render_title,
+    'heading': render_heading,
+    'paragraph': render_paragraph,
+    'bullets': render_bullets,
+    'table': render_table,
+    'box': render_box,
+    'spacer': render_spacer,
+    'page_break': render_page_break,
+}
+
+
+def render_document(document, path, fonts):
+    """Render a loaded document definition to path; returns the page count
+
+    fonts maps 'regular' and 'bold' to font chains (fonts.register_fonts).
+    """
+    theme = merge_theme(document.get('theme'))
+    writer = PageWriter(path, document, fonts, theme, rtl=document.get('locale') in RTL_LOCALES)
+    for number, block in enumerate(document['blocks'], 1):
+        renderer = BLOCK_RENDERERS.get(block.get('type'))
+        if renderer is None:
+            raise LayoutError(f"{document['name']}: block {number} has unknown type {block.get('type')!r}")
+        renderer(writer, block)
+    writer.finish()
+    return writer.page
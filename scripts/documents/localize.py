@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Translation-key substitution for document sources.
+
+Any value in a document may be {t: key}, optionally with more fields such
+as {t: key, color: pass} for a table cell. It is replaced by the key's text
+in locales/translations.csv for the locale being rendered, falling back to
+English and then to the key, the same resolution csv-loader.ts uses. A
+mapping with extra fields becomes {text: ..., <fields>}.
+
+A document lists its locales with `locales: [en, ko, ...]` or
+`locales: all`; documents without it render once in `locale` (default ko).
+
+`{date}` in any text is replaced by the document's `date` (YYYY-MM-DD,
+default the build date) written in its `date_format`, usually
+{t: documents.dateFormat}: a pattern of {yyyy}, {mm}/{m} and {dd}/{d}.
+A document states its date once, for every locale and every line.
+"""
+
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'i18n'))
+
+from catalog import LANGUAGES, TRANSLATIONS_CSV, TranslationTable  # noqa: E402
+
+DEFAULT_LOCALE = 'ko'
+DEFAULT_DATE_FORMAT = '{yyyy}-{mm}-{dd}'
+DATE_PLACEHOLDER = '{date}'
+
+_table = None
+
+
+def translation_table(path=TRANSLATIONS_CSV):
+    global _table
+    if _table is None:
+        _table = TranslationTable.load(path)
+    return _table
+
+
+def is_reference(value):
+    return isinstance(value, dict) and 't' in value
+
+
+def document_locales(document):
+    """Locales a document is rendered in, default locale first"""
+    locales = document.get('locales')
+    if not locales:
+        return [document.get('locale', DEFAULT_LOCALE)]
+    if locales == 'all':
+        locales = LANGUAGES
+    default = document.get('default_locale', locales[0])
+    return [default] + [locale for locale in locales if locale != default]
+
+
+def translation_keys(value):
+    """Every key referenced anywhere in value"""
+    if is_reference(value):
+        return {value['t']}
+    if isinstance(value, dict):
+        return set().union(*(translation_keys(item) for item in value.values()))
+    if isinstance(value, list):
+        return set().union(*(translation_keys(item) for item in value))
+    return set()
+
+
+def localize(value, locale, table):
+    """Copy of value with every {t: key} resolved for locale"""
+    if is_reference(value):
+        text = table.resolved(value['t'], locale) if value['t'] in table else value['t']
+        extra = {key: item for key, item in value.items() if key != 't'}
+        return dict(extra, text=text) if extra else text
+    if isinstance(value, dict):
+        return {key: localize(item, locale, table) for key, item in value.items()}
+    if isinstance(value, list):
+        return [localize(item, locale, table) for item in value]
+    return value
+
+
+def format_date(value, pattern=DEFAULT_DATE_FORMAT):
+    """value (a date or YYYY-MM-DD) written in pattern"""
+    if not isinstance(value, date):
+        value = date.fromisoformat(str(value))
+    return pattern.format(yyyy=value.year, mm=f'{value.month:02d}', dd=f'{value.day:02d}',
+                          m=value.month, d=value.day)
+
+
+def fill_date(value, text):
+    """Copy of value with {date} replaced by text in every string"""
+    if isinstance(value, str):
+        return value.replace(DATE_PLACEHOLDER, text)
+    if isinstance(value, dict):
+        return {key: fill_date(item, text) for key, item in value.items()}
+    if isinstance(value, list):
+        return [fill_date(item, text) for item in value]
+    return value
+
+
+def missing_keys(document, table=None):
+    table = table or translation_table()
+    return sorted(key for key in translation_keys(document) if key not in table)
+
+
+def localized_document(document, locale, table=None):
+    """The document as rendered in locale, with locale set for the layout"""
+    localized = localize(document, locale, table or translation_table())
+    written = format_date(document.get('date') or date.today(), localized.get('date_format', DEFAULT_DATE_FORMAT))
+    localized = fill_date(localized, written)
+    localized['locale'] = locale
+    return localized
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Script-aware text runs for the document renderer.
+
+A string is split into runs that each use one font of the locale's font
+chain (the first font with a glyph for the character) and one direction.
+Runs in complex scripts (Arabic, Devanagari and the other Indic scripts)
+are shaped with HarfBuzz through reportlab when uharfbuzz is installed.
+
+Direction handling is a reduced form of the Unicode bidi algorithm that is
+enough for single-line labels and wrapped paragraphs: letters are strong
+LTR or RTL, neutrals between two runs of the same direction join them and
+take the line direction otherwise, and runs are placed in visual order per
+line. HarfBuzz returns the glyphs of a right-to-left run in visual order.
+
+Runs and shaped strings are cached per process, since wrapping measures
+the same words many times and the same labels repeat across documents.
+"""
+
+import functools
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import ShapedStr, shapeStr
+
+try:
+    import uharfbuzz
+except ImportError:
+    uharfbuzz = None
+
+RTL_RANGES = ((0x0590, 0x08FF), (0xFB1D, 0xFDFF), (0xFE70, 0xFEFF))
+# Scripts whose glyphs need contextual shaping or reordering
+COMPLEX_RANGES = RTL_RANGES + ((0x0900, 0x0DFF), (0x0E00, 0x0EFF))
+
+_warned = set()
+
+
+def _in_ranges(char, ranges):
+    code = ord(char)
+    return any(start <= code <= end for start, end in ranges)
+
+
+def is_complex(text):
+    return any(_in_ranges(char, COMPLEX_RANGES) for char in text)
+
+
+def char_direction(char):
+    """'rtl' or 'ltr' for strong characters, None for neutrals (spaces, punctuation)"""
+    if _in_ranges(char, RTL_RANGES):
+        return 'rtl'
+    if char.isalnum():
+        return 'ltr'
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _char_to_glyph(font_name):
+    return pdfmetrics.getFont(font_name).face.charToGlyph
+
+
+def _font_for(char, chain, current):
+    """First font in chain with a glyph for char; neutrals stay in the current font"""
+    if current and ord(char) in _char_to_glyph(current) and char_direction(char) is None:
+        return current
+    for name in chain:
+        if ord(char) in _char_to_glyph(name):
+            return name
+    return chain[0]
+
+
+def _resolve_directions(text, base):
+    """Direction per character; neutrals between equal neighbours join them, else take base"""
+    strong = [char_direction(char) for char in text]
+    resolved = list(strong)
+    index = 0
+    while index < len(text):
+        if strong[index] is not None:
+            index += 1
+            continue
+        end = index
+        while end < len(text) and strong[end] is None:
+            end += 1
+        before = strong[index - 1] if index > 0 else base
+        after = strong[end] if end < len(text) else base
+        direction = before if before == after else base
+        resolved[index:end] = [direction] * (end - index)
+        index = end
+    return resolved
+
+
+@functools.lru_cache(maxsize=None)
+def split_runs(text, chain, base='ltr'):
+    """Split text into logical (font, direction, text) runs"""
+    runs = []
+    directions = _resolve_directions(text, base)
+    font = None
+    for char, direction in zip(text, directions):
+        font = _font_for(char, chain, font)
+        if runs and runs[-1][0] == font and runs[-1][1] == direction:
+            runs[-1][2].append(char)
+        else:
+            runs.append((font, direction, [char]))
+    return tuple((font, direction, ''.join(chars)) for font, direction, chars in runs)
+
+
+@functools.lru_cache(maxsize=None)
+def shape(text, font_name, size):
+    """Shape a single-font run if it needs it; returns (drawable string, width)"""
+    if is_complex(text):
+        font = pdfmetrics.getFont(font_name)
+        if getattr(font, 'shapable', False):
+            shaped = shapeStr(text, font_name, size)
+            if isinstance(shaped, ShapedStr):
+                return shaped, sum(data.x_advance for data in shaped.__shapeData__) * size / 1000
+        else:
+            if font_name not in _warned:
+                _warned.add(font_name)
+                print(f"Warning: uharfbuzz is not installed; complex script text in {font_name} is not shaped")
+            if char_direction(text.strip()[:1] or ' ') == 'rtl':
+                text = text[::-1]
+    return text, pdfmetrics.stringWidth(text, font_name, size)
+
+
+def visual_runs(runs, base):
+    """Reorder logical runs for display: RTL groups reverse, and so does the whole line if base is RTL"""
+    groups = []
+    for run in runs:
+        if groups and groups[-1][0][1] == run[1]:
+            groups[-1].append(run)
+        else:
+            groups.append([run])
+    ordered = [list(reversed(group)) if group[0][1] == 'rtl' else group for group in groups]
+    if base == 'rtl':
+        ordered.reverse()
+    return [run for group in ordered for run in group]
+
+
+class TextSetter:
+    """Measures and draws strings with a locale's font chain and base direction"""
+
+    def __init__(self, fonts, rtl=False):
+        self.fonts = {role: tuple(names) for role, names in fonts.items()}
+        self.base = 'rtl' if rtl else 'ltr'
+
+    def chain(self, bold=False):
+        return self.fonts['bold' if bold else 'regular']
+
+    def runs(self, text, bold, size):
+        return [(font, *shape(chunk, font, size))
+                for font, _, chunk in visual_runs(split_runs(text, self.chain(bold), self.base), self.base)]
+
+    def width(self, text, bold, size):
+        return sum(width for _, _, width in self.runs(str(text), bold, size))
+
+    def draw(self, canvas, x, y, text, bold, size, align='left', max_width=0):
+        """Draw text at baseline y; align is relative to the box [x, x + max_width]"""
+        runs = self.runs(str(text), bold, size)
+        total = sum(width for _, _, width in runs)
+        if align == 'center':
+            x += (max_width - total) / 2
+        elif align == 'right':
+            x += max_width - total
+        for font, chunk, width in runs:
+            canvas.setFont(font, size)
+            canvas.drawString(x, y, chunk)
+            x += width
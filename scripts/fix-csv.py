@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import csv
+import os
+import sys
 
-input_file = '/Users/jihunkong/1001project/1001-stories/locales/translations.csv'
-output_file = '/Users/jihunkong/1001project/1001-stories/locales/translations-fixed.csv'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'i18n'))
+from catalog import TRANSLATIONS_CSV  # noqa: E402
+
+input_file = TRANSLATIONS_CSV
+output_file = os.path.join(os.path.dirname(TRANSLATIONS_CSV), 'translations-fixed.csv')
 
 with open(input_file, 'r', encoding='utf-8') as infile, open(output_file, 'w', encoding='utf-8', newline='') as outfile:
     reader = csv.reader(infile)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the translation tooling.
+
+  python3 scripts/i18n <command> [options] [+ <command> [options] ...]
+
+translations.csv is loaded once per invocation; chained commands run in
+order against the same in-memory table and the CSV is written back once,
+only if every step succeeded and something changed. For example:
+
+  python3 scripts/i18n add new-keys.json + validate + generate
+  python3 scripts/i18n fill --backend dictionary:glossary.json + diff
+  python3 scripts/i18n --dry-run prune + diff
+
+Commands:
+  add       upsert rows from .json or .csv files
+  fill      fill empty cells through a translation backend
+  validate  check keys, header, placeholders and empty cells
+  generate  write locales/generated/<lang>.json and compact <lang>.cat
+  diff      show keys added/removed/changed versus the CSV on disk
+  prune     remove keys that nothing in app/ or components/ references
+  coverage  coverage and drift report across the i18n sources
+  scan      unused and missing key report
+  dedupe    exact and near-duplicate English sources
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+# Sibling modules are imported as top-level modules, also when this directory
+# is executed as `python3 scripts/i18n`
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import compact  # noqa: E402
+import coverage  # noqa: E402
+import dedupe  # noqa: E402
+import fill  # noqa: E402
+import generate  # noqa: E402
+import scan  # noqa: E402
+import validate  # noqa: E402
+from catalog import (  # noqa: E402
+    GENERATED_DIR,
+    LANGUAGES,
+    REPO_ROOT,
+    TRANSLATIONS_CSV,
+    TranslationTable,
+    diff_snapshots,
+    load_generated,
+    load_legacy,
+    load_tracking,
+)
+
+PIPELINE_SEPARATOR = '+'
+
+
+class Context:
+    """State shared by the commands of one invocation"""
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+        self.table = TranslationTable.load(csv_path)
+        self.original = self.table.snapshot()
+        self.dirty = False
+
+
+def read_rows(path):
+    """Read add-* style rows from a JSON list (rows or objects) or a CSV file"""
+    if path.endswith('.csv'):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            records = list(csv.DictReader(f))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+
+    rows = []
+    for record in records:
+        if isinstance(record, dict):
+            rows.append([record['key'], record.get('context', '')] +
+                        [record.get(lang, '') for lang in LANGUAGES])
+        else:
+            rows.append(record)
+    return rows
+
+
+def cmd_add(ctx, args):
+    before = len(ctx.table)
+    total = 0
+    for path in args.files:
+        rows = read_rows(path)
+        ctx.table.add_rows(rows)
+        total += len(rows)
+    ctx.dirty = True
+    print(f"add: upserted {total} rows ({len(ctx.table) - before} new keys)")
+    return 0
+
+
+def cmd_fill(ctx, args):
+    languages = args.lang or [lang for lang in ctx.table.languages if lang != fill.SOURCE_LANGUAGE]
+    stats = fill.fill(ctx.table, fill.load_backend(args.backend), languages,
+                      batch_size=args.batch_size, max_chars=args.max_chars,
+                      concurrency=args.concurrency)
+    filled = sum(row['filled'] for row in stats.values())
+    failed = sum(row['failed'] for row in stats.values())
+    ctx.dirty = ctx.dirty or filled > 0
+    print(f"fill: filled {filled} cells, {failed} failed")
+    return 1 if failed else 0
+
+
+def cmd_validate(ctx, args):
+    errors, warnings = validate.validate(ctx.table)
+    for message in errors:
+        print(f"  ERROR   {message}")
+    if args.warnings:
+        for message in warnings:
+            print(f"  WARNING {message}")
+    print(f"validate: {len(errors)} errors, {len(warnings)} warnings")
+    if errors or (args.strict and warnings):
+        return 1
+    return 0
+
+
+def cmd_generate(ctx, args):
+    written = generate.write_locales(ctx.table, args.out, args.lang)
+    if not args.no_catalog:
+        written += compact.write_catalogs(ctx.table, args.out, args.lang)
+    print(f"generate: wrote {len(written)} locale files to {os.path.relpath(args.out, REPO_ROOT)}")
+    return 0
+
+
+def cmd_diff(ctx, args):
+    if args.against:
+        before = TranslationTable.load(args.against).snapshot()
+    else:
+        before = ctx.original
+    added, removed, changed = diff_snapshots(before, ctx.table.snapshot())
+
+    for label, keys in (('+', added), ('-', removed), ('~', changed)):
+        for key in keys:
+            print(f"  {label} {key}")
+    print(f"diff: {len(added)} added, {len(removed)} removed, {len(changed)} changed")
+    return 0
+
+
+def cmd_prune(ctx, args):
+    index, _ = scan.build_index(jobs=args.jobs)
+    dead = scan.analyze(index, ctx.table)['dead']
+    if dead:
+        ctx.table.remove(dead)
+        ctx.dirty = True
+    print(f"prune: removed {len(dead)} unreferenced keys")
+    return 0
+
+
+def cmd_coverage(ctx, args):
+    languages = args.lang or LANGUAGES
+    generated = {lang: load_generated(lang) for lang in languages}
+    legacy = {lang: keys for lang, keys in ((lang, load_legacy(lang)) for lang in languages) if keys}
+    report = coverage.build_report(ctx.table, generated, legacy, load_tracking(), languages)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        coverage.print_report(report, list_keys=args.list)
+    return 0
+
+
+def cmd_scan(ctx, args):
+    index, stats = scan.build_index(jobs=args.jobs, use_cache=not args.no_cache)
+    result = scan.analyze(index, ctx.table)
+    print(f"scan: {stats['files']} files ({stats['parsed']} parsed), "
+          f"{len(result['dead'])} dead keys, {len(result['missing'])} missing keys")
+    if args.list:
+        for key in result['dead']:
+            print(f"  dead    {key}")
+        for key in result['missing']:
+            print(f"  missing {key}")
+    return 0
+
+
+def cmd_dedupe(ctx, args):
+    report = dedupe.find_duplicates(ctx.table, args.threshold, args.ngram)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        dedupe.print_report(report, list_all=args.list)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='scripts/i18n',
+        description='Translation tooling (chain commands with "+")',
+    )
+    parser.add_argument('--csv', default=TRANSLATIONS_CSV, help='translations CSV (default from config.json)')
+    parser.add_argument('--dry-run', action='store_true', help='never write translations.csv')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help='upsert rows from .json or .csv files')
+    add.add_argument('files', nargs='+')
+    add.set_defaults(run=cmd_add)
+
+    fill_cmd = commands.add_parser('fill', help='fill empty cells through a translation backend')
+    fill_cmd.add_argument('--backend', required=True)
+    fill_cmd.add_argument('--lang', nargs='+', choices=LANGUAGES)
+    fill_cmd.add_argument('--batch-size', type=int, default=50)
+    fill_cmd.add_argument('--max-chars', type=int, default=5000)
+    fill_cmd.add_argument('--concurrency', type=int, default=4)
+    fill_cmd.set_defaults(run=cmd_fill)
+
+    validate_cmd = commands.add_parser('validate', help='check the table for errors')
+    validate_cmd.add_argument('--warnings', action='store_true', help='print warnings too')
+    validate_cmd.add_argument('--strict', action='store_true', help='fail on warnings')
+    validate_cmd.set_defaults(run=cmd_validate)
+
+    generate_cmd = commands.add_parser('generate', help='write locales/generated/<lang>.json and .cat')
+    generate_cmd.add_argument('--out', default=GENERATED_DIR)
+    generate_cmd.add_argument('--lang', nargs='+', choices=LANGUAGES)
+    generate_cmd.add_argument('--no-catalog', action='store_true', help='skip the compact .cat catalogs')
+    generate_cmd.set_defaults(run=cmd_generate)
+
+    diff = commands.add_parser('diff', help='compare with the CSV as loaded, or --against a file')
+    diff.add_argument('--against')
+    diff.set_defaults(run=cmd_diff)
+
+    prune = commands.add_parser('prune', help='remove keys that no source file references')
+    prune.add_argument('--jobs', type=int)
+    prune.set_defaults(run=cmd_prune)
+
+    coverage_cmd = commands.add_parser('coverage', help='coverage and drift report')
+    coverage_cmd.add_argument('--json', action='store_true')
+    coverage_cmd.add_argument('--list', action='store_true')
+    coverage_cmd.add_argument('--lang', nargs='+', choices=LANGUAGES)
+    coverage_cmd.set_defaults(run=cmd_coverage)
+
+    scan_cmd = commands.add_parser('scan', help='unused and missing key report')
+    scan_cmd.add_argument('--jobs', type=int)
+    scan_cmd.add_argument('--no-cache', action='store_true')
+    scan_cmd.add_argument('--list', action='store_true')
+    scan_cmd.set_defaults(run=cmd_scan)
+
+    dedupe_cmd = commands.add_parser('dedupe', help='exact and near-duplicate English sources')
+    dedupe_cmd.add_argument('--threshold', type=float, default=dedupe.DEFAULT_THRESHOLD)
+    dedupe_cmd.add_argument('--ngram', type=int, default=dedupe.DEFAULT_NGRAM)
+    dedupe_cmd.add_argument('--json', action='store_true')
+    dedupe_cmd.add_argument('--list', action='store_true')
+    dedupe_cmd.set_defaults(run=cmd_dedupe)
+
+    return parser
+
+
+def split_pipeline(argv):
+    segments = [[]]
+    for arg in argv:
+        if arg == PIPELINE_SEPARATOR:
+            segments.append([])
+        else:
+            segments[-1].append(arg)
+    return [segment for segment in segments if segment]
+
+
+def main(argv=None):
+    parser = build_parser()
+    segments = split_pipeline(sys.argv[1:] if argv is None else argv)
+    if not segments:
+        parser.print_help()
+        return 2
+
+    first = parser.parse_args(segments[0])
+    steps = [first] + [parser.parse_args(segment) for segment in segments[1:]]
+
+    ctx = Context(first.csv)
+    for step in steps:
+        status = step.run(ctx, step)
+        if status:
+            print(f"'{step.command}' failed; translations.csv left unchanged", file=sys.stderr)
+            return status
+
+    if ctx.dirty:
+        if first.dry_run:
+            print("Dry run: translations.csv not written")
+        else:
+            ctx.table.save(ctx.csv_path)
+            print(f"Saved {os.path.relpath(ctx.csv_path, REPO_ROOT)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
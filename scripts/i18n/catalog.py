@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Shared loaders for the i18n sources.
+
+Each loader makes a single pass over its source and returns a dict keyed by
+translation key, so callers can cross-reference sources with hash lookups.
+"""
+
+import csv
+import json
+import os
+
+# Paths come from config.json (relative to the repository root) so the tools
+# run unchanged on developer machines and in the Linux build containers.
+# I18N_ROOT and I18N_CONFIG override the root and the config file.
+REPO_ROOT = os.path.abspath(
+    os.environ.get('I18N_ROOT')
+    or os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+)
+CONFIG_PATH = os.environ.get('I18N_CONFIG') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'config.json'
+)
+
+
+def _load_config(path=CONFIG_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+CONFIG = _load_config()
+
+
+def repo_path(*parts):
+    """Resolve a config-relative path against the repository root"""
+    return os.path.join(REPO_ROOT, *parts)
+
+
+TRANSLATIONS_CSV = repo_path(CONFIG['translations'])
+GENERATED_DIR = repo_path(CONFIG['generated'])
+LOCALES_DIR = repo_path(CONFIG['legacy'])
+TRACKING_CSV = repo_path(CONFIG['tracking'])
+CACHE_DIR = repo_path(CONFIG['cache'])
+SCAN_DIRS = tuple(CONFIG['scan'])
+
+# Must match SUPPORTED_LANGUAGES in lib/i18n/csv-loader.ts
+LANGUAGES = ['en', 'ko', 'es', 'ar', 'hi', 'fr', 'de', 'ja', 'pt', 'ru', 'it', 'zh']
+TRACKING_STATUSES = ('TODO', 'DONE')
+
+
+def namespace_of(key):
+    """Return the top-level namespace of a dotted key"""
+    return key.split('.', 1)[0]
+
+
+class TranslationTable:
+    """In-memory model of translations.csv with a key -> row index"""
+
+    def __init__(self, header, rows):
+        self.header = header
+        self.rows = rows
+        self.columns = {name: i for i, name in enumerate(header)}
+        self.index = {}
+        self.duplicates = []
+
+        for position, row in enumerate(rows):
+            key = row[0].strip()
+            if key in self.index:
+                self.duplicates.append(key)
+            # Later rows win, matching csv-loader.ts which overwrites on repeat
+            self.index[key] = position
+
+    @classmethod
+    def load(cls, path=TRANSLATIONS_CSV):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = [column.strip() for column in next(reader)]
+            rows = []
+            for row in reader:
+                if not row or not row[0].strip():
+                    continue
+                # Pad short rows so every language column is addressable
+                if len(row) < len(header):
+                    row = row + [''] * (len(header) - len(row))
+                rows.append(row)
+        return cls(header, rows)
+
+    @property
+    def languages(self):
+        return [lang for lang in LANGUAGES if lang in self.columns]
+
+    def keys(self):
+        return self.index.keys()
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def row(self, key):
+        return self.rows[self.index[key]]
+
+    def value(self, key, lang):
+        """Return the raw cell for key/lang, or '' when it is empty"""
+        return self.row(key)[self.columns[lang]].strip()
+
+    def resolved(self, key, lang):
+        """Return the value csv-loader.ts would emit (lang -> en -> key)"""
+        return self.value(key, lang) or self.value(key, 'en') or key
+
+    def upsert(self, key, values, context=None):
+        """Update the given language cells of key, appending a new row if needed"""
+        if key not in self.index:
+            row = [''] * len(self.header)
+            row[0] = key
+            self.index[key] = len(self.rows)
+            self.rows.append(row)
+
+        row = self.row(key)
+        if context is not None:
+            row[self.columns['context']] = context
+        for lang, value in values.items():
+            row[self.columns[lang]] = value
+
+    def add_rows(self, rows):
+        """Upsert [key, context, en, ko, ...] rows in the add-* script format"""
+        languages = self.header[2:]
+        for row in rows:
+            self.upsert(row[0].strip(), dict(zip(languages, row[2:])), context=row[1])
+
+    def remove(self, keys):
+        """Drop every row whose key is in keys and rebuild the index"""
+        keys = set(keys)
+        self.rows = [row for row in self.rows if row[0].strip() not in keys]
+        self.index = {}
+        for position, row in enumerate(self.rows):
+            self.index[row[0].strip()] = position
+
+    def snapshot(self):
+        """Return {key: cells} for later comparison with diff_snapshots()"""
+        return {key: tuple(self.rows[position]) for key, position in self.index.items()}
+
+    def save(self, path=TRANSLATIONS_CSV):
+        """Write the table back in the quoting style used by the add-* scripts"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator='\n')
+            writer.writerow(self.header)
+            writer.writerows(self.rows)
+        os.replace(tmp_path, path)
+
+
+def diff_snapshots(before, after):
+    """Return (added, removed, changed) key lists between two table snapshots"""
+    added = sorted(key for key in after if key not in before)
+    removed = sorted(key for key in before if key not in after)
+    changed = sorted(key for key, cells in after.items() if key in before and before[key] != cells)
+    return added, removed, changed
+
+
+def flatten_json(data):
+    """Flatten a nested translation object into {dotted.key: value}"""
+    flat = {}
+    stack = [('', data)]
+    while stack:
+        prefix, node = stack.pop()
+        for name, value in node.items():
+            key = f"{prefix}{name}"
+            if isinstance(value, dict):
+                stack.append((key + '.', value))
+            else:
+                flat[key] = value
+    return flat
+
+
+def load_json_keys(path):
+    """Load a nested locale JSON file as a flat key index ({} if absent)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return flatten_json(json.load(f))
+
+
+def load_generated(lang, generated_dir=GENERATED_DIR):
+    return load_json_keys(os.path.join(generated_dir, f'{lang}.json'))
+
+
+def load_legacy(lang, locales_dir=LOCALES_DIR):
+    return load_json_keys(os.path.join(locales_dir, lang, 'common.json'))
+
+
+def load_tracking(path=TRACKING_CSV):
+    """
+    Load docs/i18n-tracking.csv as {key: entry}.
+
+    Several rows contain unquoted commas in the text columns, so the fixed
+    trailing columns (status, priority, file, line) are read from the right.
+    """
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 8 or not row[2].strip():
+                continue
+
+            status = row[-4].strip()
+            if status not in TRACKING_STATUSES:
+                status = status.rsplit(',', 1)[-1].strip()
+
+            key = row[2].strip()
+            entries[key] = {
+                'page': row[0].strip(),
+                'section': row[1].strip(),
+                'key': key,
+                # English text is only trustworthy when the row parsed cleanly
+                'en': row[3].strip() if len(row) == 9 else None,
+                'status': status,
+                'priority': row[-3].strip(),
+                'file': row[-2].strip(),
+                'line': row[-1].strip(),
+            }
+    return entries
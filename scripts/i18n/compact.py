@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Compact, memory-mappable translation catalogs (locales/generated/<lang>.cat).
+
+One file per language holding the same flattened key -> value mapping as
+the generated JSON bundle, laid out so a reader can mmap it and resolve a
+key with a couple of reads instead of parsing the whole document.
+
+Layout (all integers little-endian uint32 unless noted):
+
+  header    magic b'I18NCAT1', version u16, reserved u16,
+            entry_count, bucket_count, buckets_offset, entries_offset,
+            strings_offset, strings_size
+  buckets   bucket_count x (entry_index + 1); 0 marks an empty slot.
+            Open addressing with linear probing, load factor <= 0.5.
+  entries   entry_count x (key_offset, value_offset, key_length u16,
+            value_length u16), sorted by key so iteration is ordered
+  strings   interned UTF-8 string table; identical keys/values are stored once
+
+The hash is zlib.crc32 of the UTF-8 key, which is cheap in Python and easy
+to reproduce in other runtimes.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+
+from catalog import GENERATED_DIR
+
+MAGIC = b'I18NCAT1'
+VERSION = 1
+HEADER = struct.Struct('<8sHHIIIIII')
+BUCKET = struct.Struct('<I')
+ENTRY = struct.Struct('<IIHH')
+MAX_STRING_BYTES = 0xFFFF
+
+
+def _hash(key_bytes):
+    return zlib.crc32(key_bytes) & 0xFFFFFFFF
+
+
+def _bucket_count(entry_count):
+    count = 8
+    while count < entry_count * 2:
+        count *= 2
+    return count
+
+
+def build_catalog(mapping):
+    """Serialize a flat {key: value} mapping into catalog bytes"""
+    strings = bytearray()
+    interned = {}
+
+    def intern(text):
+        data = text.encode('utf-8')
+        if len(data) > MAX_STRING_BYTES:
+            raise ValueError(f"String of {len(data)} bytes does not fit in a catalog entry")
+        offset = interned.get(data)
+        if offset is None:
+            offset = len(strings)
+            interned[data] = offset
+            strings.extend(data)
+        return offset, len(data)
+
+    entries = []
+    for key in sorted(mapping):
+        key_offset, key_length = intern(key)
+        value_offset, value_length = intern(str(mapping[key]))
+        entries.append((key, key_offset, value_offset, key_length, value_length))
+
+    bucket_count = _bucket_count(len(entries))
+    mask = bucket_count - 1
+    buckets = [0] * bucket_count
+    for index, (key, *_) in enumerate(entries):
+        slot = _hash(key.encode('utf-8')) & mask
+        while buckets[slot]:
+            slot = (slot + 1) & mask
+        buckets[slot] = index + 1
+
+    buckets_offset = HEADER.size
+    entries_offset = buckets_offset + bucket_count * BUCKET.size
+    strings_offset = entries_offset + len(entries) * ENTRY.size
+
+    out = bytearray(HEADER.pack(
+        MAGIC, VERSION, 0, len(entries), bucket_count,
+        buckets_offset, entries_offset, strings_offset, len(strings),
+    ))
+    out.extend(struct.pack(f'<{bucket_count}I', *buckets))
+    for _, *fields in entries:
+        out.extend(ENTRY.pack(*fields))
+    out.extend(strings)
+    return bytes(out)
+
+
+def write_catalog(mapping, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(build_catalog(mapping))
+    os.replace(tmp_path, path)
+
+
+def write_catalogs(table, output_dir=GENERATED_DIR, languages=None):
+    """Write <lang>.cat for each language from a TranslationTable"""
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for lang in languages or table.languages:
+        path = os.path.join(output_dir, f'{lang}.cat')
+        write_catalog({key: table.resolved(key, lang) for key in table.keys()}, path)
+        written.append(path)
+    return written
+
+
+class CompactCatalog:
+    """
+    Read-only view over a .cat file.
+
+    The file is memory-mapped; lookups touch only the probed buckets, their
+    entry records and the strings involved, so opening is O(1) and the
+    resident footprint is just the pages actually read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, self._count, self._bucket_count, self._buckets_offset,
+         self._entries_offset, self._strings_offset, _) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} translation catalog")
+        self._mask = self._bucket_count - 1
+
+    def _string(self, offset, length):
+        start = self._strings_offset + offset
+        return self._map[start:start + length]
+
+    def _entry(self, index):
+        return ENTRY.unpack_from(self._map, self._entries_offset + index * ENTRY.size)
+
+    def _find(self, key):
+        key_bytes = key.encode('utf-8')
+        slot = _hash(key_bytes) & self._mask
+        while True:
+            (entry,) = BUCKET.unpack_from(self._map, self._buckets_offset + slot * BUCKET.size)
+            if not entry:
+                return None
+            fields = self._entry(entry - 1)
+            if fields[2] == len(key_bytes) and self._string(fields[0], fields[2]) == key_bytes:
+                return fields
+            slot = (slot + 1) & self._mask
+
+    def get(self, key, default=None):
+        fields = self._find(key)
+        if fields is None:
+            return default
+        return self._string(fields[1], fields[3]).decode('utf-8')
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __len__(self):
+        return self._count
+
+    def keys(self):
+        for index in range(self._count):
+            key_offset, _, key_length, _ = self._entry(index)
+            yield self._string(key_offset, key_length).decode('utf-8')
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_catalog(lang, directory=GENERATED_DIR):
+    return CompactCatalog(os.path.join(directory, f'{lang}.cat'))
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Translation coverage and drift report.
+
+Cross-references the four i18n sources:
+  - locales/translations.csv        (source of truth)
+  - locales/generated/<lang>.json   (build output of lib/i18n/csv-loader.ts)
+  - locales/<lang>/common.json      (legacy hand-maintained set)
+  - docs/i18n-tracking.csv          (per-page TODO tracking)
+
+Every source is read exactly once into a key index; all comparisons are
+dict/set lookups, so the report stays linear in the number of keys.
+
+Usage:
+  python3 scripts/i18n/coverage.py [--json] [--list] [--lang ko ...]
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+from catalog import (
+    LANGUAGES,
+    TranslationTable,
+    load_generated,
+    load_legacy,
+    load_tracking,
+    namespace_of,
+)
+
+
+def _counter():
+    return {'total': 0, 'translated': 0}
+
+
+def build_report(table, generated, legacy, tracking, languages):
+    """Build the coverage matrix and key lists from pre-loaded indexes"""
+    csv_keys = table.keys()
+
+    by_language = {}
+    by_namespace = defaultdict(lambda: {lang: _counter() for lang in languages})
+    missing = {lang: [] for lang in languages}
+    stale = {lang: [] for lang in languages}
+    orphaned = {lang: [] for lang in languages}
+    legacy_orphaned = {}
+    legacy_stale = {}
+
+    for lang in languages:
+        gen = generated.get(lang, {})
+        translated = 0
+        not_generated = []
+
+        for key in csv_keys:
+            counts = by_namespace[namespace_of(key)][lang]
+            counts['total'] += 1
+
+            if table.value(key, lang):
+                translated += 1
+                counts['translated'] += 1
+            else:
+                missing[lang].append(key)
+
+            if key not in gen:
+                not_generated.append(key)
+            elif gen[key] != table.resolved(key, lang):
+                stale[lang].append(key)
+
+        orphaned[lang] = sorted(key for key in gen if key not in table)
+
+        total = len(table)
+        by_language[lang] = {
+            'total': total,
+            'translated': translated,
+            'missing': total - translated,
+            'coverage': round(100.0 * translated / total, 1) if total else 0.0,
+            'not_generated': len(not_generated),
+            'stale_generated': len(stale[lang]),
+            'orphaned_generated': len(orphaned[lang]),
+        }
+
+        if lang in legacy:
+            legacy_keys = legacy[lang]
+            legacy_orphaned[lang] = sorted(key for key in legacy_keys if key not in table)
+            legacy_stale[lang] = sorted(
+                key for key, value in legacy_keys.items()
+                if key in table and table.value(key, lang) and value != table.value(key, lang)
+            )
+            by_language[lang]['legacy_keys'] = len(legacy_keys)
+            by_language[lang]['legacy_orphaned'] = len(legacy_orphaned[lang])
+            by_language[lang]['legacy_stale'] = len(legacy_stale[lang])
+
+    by_page = defaultdict(lambda: {
+        'tracked': 0, 'in_csv': 0, 'complete': 0, 'todo': 0, 'status_stale': 0,
+    })
+    tracking_missing = []
+    tracking_stale = []
+
+    for key, entry in tracking.items():
+        page = by_page[entry['page']]
+        page['tracked'] += 1
+        is_todo = entry['status'] == 'TODO'
+        if is_todo:
+            page['todo'] += 1
+
+        if key not in table:
+            tracking_missing.append(key)
+            continue
+
+        page['in_csv'] += 1
+        complete = all(table.value(key, lang) for lang in languages)
+        if complete:
+            page['complete'] += 1
+        # Tracking still says TODO although the CSV already covers the key,
+        # or the tracked English text no longer matches the CSV source
+        if (is_todo and complete) or (entry['en'] and entry['en'] != table.value(key, 'en')):
+            page['status_stale'] += 1
+            tracking_stale.append(key)
+
+    return {
+        'summary': {
+            'csv_keys': len(table),
+            'csv_duplicates': sorted(set(table.duplicates)),
+            'languages': languages,
+            'tracked_keys': len(tracking),
+        },
+        'by_language': by_language,
+        'by_namespace': {
+            namespace: dict(counts) for namespace, counts in sorted(by_namespace.items())
+        },
+        'by_page': dict(sorted(by_page.items())),
+        'missing': missing,
+        'stale': stale,
+        'orphaned': orphaned,
+        'legacy_orphaned': legacy_orphaned,
+        'legacy_stale': legacy_stale,
+        'tracking_missing': sorted(tracking_missing),
+        'tracking_stale': sorted(tracking_stale),
+    }
+
+
+def load_sources(languages):
+    table = TranslationTable.load()
+    generated = {lang: load_generated(lang) for lang in languages}
+    legacy = {}
+    for lang in languages:
+        keys = load_legacy(lang)
+        if keys:
+            legacy[lang] = keys
+    return table, generated, legacy, load_tracking()
+
+
+def print_report(report, list_keys=False):
+    summary = report['summary']
+    print(f"CSV keys: {summary['csv_keys']} "
+          f"(duplicate rows: {len(summary['csv_duplicates'])}), "
+          f"tracked keys: {summary['tracked_keys']}")
+
+    print("\n=== COVERAGE BY LANGUAGE ===")
+    print(f"{'lang':<6}{'translated':>12}{'missing':>9}{'cov%':>7}"
+          f"{'not gen':>9}{'stale':>7}{'orphan':>8}{'legacy orphan':>15}")
+    for lang, row in report['by_language'].items():
+        legacy = row.get('legacy_orphaned', '-')
+        print(f"{lang:<6}{row['translated']:>12}{row['missing']:>9}{row['coverage']:>7}"
+              f"{row['not_generated']:>9}{row['stale_generated']:>7}"
+              f"{row['orphaned_generated']:>8}{legacy:>15}")
+
+    print("\n=== COVERAGE BY NAMESPACE (translated/total) ===")
+    languages = summary['languages']
+    print(f"{'namespace':<24}" + ''.join(f"{lang:>8}" for lang in languages))
+    for namespace, counts in report['by_namespace'].items():
+        cells = ''.join(
+            f"{counts[lang]['translated']}/{counts[lang]['total']}".rjust(8) for lang in languages
+        )
+        print(f"{namespace[:23]:<24}{cells}")
+
+    print("\n=== TRACKING BY PAGE ===")
+    print(f"{'page':<20}{'tracked':>9}{'in csv':>8}{'complete':>10}{'todo':>6}{'stale':>7}")
+    for page, row in report['by_page'].items():
+        print(f"{page[:19]:<20}{row['tracked']:>9}{row['in_csv']:>8}"
+              f"{row['complete']:>10}{row['todo']:>6}{row['status_stale']:>7}")
+
+    if not list_keys:
+        return
+
+    for section in ('missing', 'stale', 'orphaned', 'legacy_orphaned', 'legacy_stale'):
+        for lang, keys in report[section].items():
+            if keys:
+                print(f"\n--- {section} [{lang}] ({len(keys)}) ---")
+                for key in keys:
+                    print(f"  {key}")
+
+    for section in ('tracking_missing', 'tracking_stale'):
+        if report[section]:
+            print(f"\n--- {section} ({len(report[section])}) ---")
+            for key in report[section]:
+                print(f"  {key}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Translation coverage and drift report')
+    parser.add_argument('--json', action='store_true', help='emit the full report as JSON')
+    parser.add_argument('--list', action='store_true', help='list individual missing/stale/orphaned keys')
+    parser.add_argument('--lang', nargs='+', choices=LANGUAGES, help='restrict to these languages')
+    args = parser.parse_args(argv)
+
+    languages = args.lang or LANGUAGES
+    report = build_report(*load_sources(languages), languages)
+
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report, list_keys=args.list)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Exact and near-duplicate English sources in translations.csv.
+
+Every key is translated and shipped in all languages, so two keys with the
+same English text cost twice in the translation workload and in each
+generated bundle. Finding them pairwise is quadratic. Instead, each English
+source is normalized (case, whitespace, trailing punctuation, placeholder
+names) and cut into character n-grams. A MinHash signature then goes into
+LSH bands, so only strings that share a band bucket are compared, and the
+index stays roughly linear in the number of keys:
+
+  exact     identical after normalization; merge into one shared key
+  near      n-gram Jaccard similarity >= threshold; when the members differ
+            in one span ("Failed to save story. Please try again." /
+            "Failed to delete story. ..."), a template with a placeholder
+            for that span is suggested
+
+Clusters are connected components of the matched pairs. Each cluster gets a
+suggested shared key: an existing common.* member, or a new common.* key
+derived from the text. It also gets the cells and bundle bytes that merging
+would save. Exact duplicates whose translations differ are marked, since
+the same English word can need different translations in different
+contexts ("Published" as a status or as a date label).
+
+Usage:
+  python3 scripts/i18n dedupe [--threshold 0.7] [--ngram 3] [--json] [--list]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import zlib
+from collections import defaultdict
+
+from catalog import TranslationTable, namespace_of
+from validate import PLACEHOLDER_PATTERN
+
+SOURCE_LANGUAGE = 'en'
+SHARED_NAMESPACE = 'common'
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NGRAM = 3
+DEFAULT_PERMUTATIONS = 64
+DEFAULT_BANDS = 16
+MERSENNE_PRIME = (1 << 61) - 1
+TRAILING_PUNCTUATION = ' .!?:…'
+WORD_PATTERN = re.compile(r'[A-Za-z0-9]+')
+
+
+def normalize(text):
+    """Lowercase, collapse whitespace, drop trailing punctuation and placeholder names"""
+    text = PLACEHOLDER_PATTERN.sub('{}', text)
+    return ' '.join(text.lower().split()).rstrip(TRAILING_PUNCTUATION)
+
+
+def shingles(text, n=DEFAULT_NGRAM):
+    """Character n-grams of a normalized string, padded so short words still match"""
+    padded = f' {text} '
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class MinHasher:
+    """MinHash signatures from one crc32 per shingle and num_perm universal hash permutations"""
+
+    def __init__(self, num_perm=DEFAULT_PERMUTATIONS, seed=1):
+        generator = random.Random(seed)
+        self.permutations = [(generator.randrange(1, MERSENNE_PRIME), generator.randrange(0, MERSENNE_PRIME))
+                             for _ in range(num_perm)]
+
+    def signature(self, items):
+        hashes = [zlib.crc32(item.encode('utf-8')) for item in items]
+        return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self.permutations)
+
+
+def candidate_pairs(signatures, bands=DEFAULT_BANDS):
+    """Pairs of keys whose signatures agree on all rows of at least one band"""
+    if not signatures:
+        return set()
+    rows = len(next(iter(signatures.values()))) // bands
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for key, signature in signatures.items():
+            buckets[signature[band * rows:(band + 1) * rows]].append(key)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pairs.add((members[i], members[j]) if members[i] < members[j] else (members[j], members[i]))
+    return pairs
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def groups(self):
+        groups = defaultdict(list)
+        for item in self.parent:
+            groups[self.find(item)].append(item)
+        return [sorted(members) for members in groups.values() if len(members) > 1]
+
+
+def template_for(texts):
+    """'Failed to {detail}. Please try again.' when the texts differ in one span, else None"""
+    prefix = texts[0]
+    for text in texts[1:]:
+        while not text.startswith(prefix):
+            prefix = prefix[:-1]
+    suffix = texts[0][len(prefix):]
+    for text in texts[1:]:
+        while not text[len(prefix):].endswith(suffix):
+            suffix = suffix[1:]
+    # Cut at word boundaries so the placeholder replaces whole words
+    prefix = prefix[:prefix.rfind(' ') + 1] if ' ' in prefix else ''
+    suffix = suffix[suffix.find(' '):] if ' ' in suffix else ''
+    if not prefix.strip() and not suffix.strip():
+        return None
+    return f'{prefix}{{detail}}{suffix}'
+
+
+def shared_key(members, table, taken):
+    """An existing common.* member, or a new common.<camelCase> key that is not taken"""
+    for key in members:
+        if namespace_of(key) == SHARED_NAMESPACE:
+            return key, False
+    words = WORD_PATTERN.findall(table.value(members[0], SOURCE_LANGUAGE).replace("'", ''))[:4] or ['shared']
+    base = f"{SHARED_NAMESPACE}.{words[0].lower()}{''.join(word.capitalize() for word in words[1:])}"
+    key, suffix = base, 2
+    while key in taken:
+        key, suffix = f'{base}{suffix}', suffix + 1
+    taken.add(key)
+    return key, True
+
+
+def bundle_bytes(table, key, languages):
+    """Bytes the key adds across all generated bundles: leaf name and value as JSON"""
+    leaf = key.rsplit('.', 1)[-1]
+    return sum(len(json.dumps({leaf: table.resolved(key, lang)}, ensure_ascii=False).encode('utf-8')) - 2
+               for lang in languages)
+
+
+def find_duplicates(table, threshold=DEFAULT_THRESHOLD, ngram=DEFAULT_NGRAM, num_perm=DEFAULT_PERMUTATIONS,
+                    bands=DEFAULT_BANDS):
+    """Clusters of keys with exact or near-duplicate English sources, largest savings first"""
+    languages = table.languages
+    sources = {key: table.value(key, SOURCE_LANGUAGE) for key in table.keys() if table.value(key, SOURCE_LANGUAGE)}
+    normalized = {key: normalize(text) for key, text in sources.items()}
+
+    clusters_of = UnionFind()
+    by_text = {}
+    for key, text in normalized.items():
+        clusters_of.find(key)
+        if text in by_text:
+            clusters_of.union(by_text[text], key)
+        else:
+            by_text[text] = key
+
+    # Near duplicates are searched among one representative per distinct text
+    hasher = MinHasher(num_perm)
+    grams = {key: shingles(text, ngram) for text, key in by_text.items()}
+    signatures = {key: hasher.signature(items) for key, items in grams.items()}
+    similarity = []
+    compared = 0
+    for a, b in candidate_pairs(signatures, bands):
+        compared += 1
+        score = jaccard(grams[a], grams[b])
+        if score >= threshold:
+            clusters_of.union(a, b)
+            similarity.append((a, score))
+
+    lowest = {}
+    for key, score in similarity:
+        root = clusters_of.find(key)
+        lowest[root] = min(score, lowest.get(root, 1.0))
+
+    taken = set(table.keys())
+    clusters = []
+    for members in clusters_of.groups():
+        texts = sorted({sources[key] for key in members})
+        kind = 'exact' if len({normalized[key] for key in members}) == 1 else 'near'
+        key, new = shared_key(members, table, taken)
+        differs = [lang for lang in languages if lang != SOURCE_LANGUAGE
+                   and len({table.value(member, lang) for member in members if table.value(member, lang)}) > 1]
+        removed = [member for member in members if member != key]
+        clusters.append({
+            'kind': kind,
+            'keys': members,
+            'texts': texts,
+            'similarity': round(lowest.get(clusters_of.find(members[0]), 1.0), 3),
+            'suggested_key': key,
+            'new_key': new,
+            'template': template_for(texts) if kind == 'near' else None,
+            'translations_differ': differs,
+            'saved_cells': len(removed) * len(languages),
+            'saved_bytes': sum(bundle_bytes(table, member, languages) for member in removed),
+        })
+
+    clusters.sort(key=lambda cluster: (-cluster['saved_bytes'], cluster['keys']))
+    return {
+        'keys': len(sources),
+        'distinct_texts': len(by_text),
+        'candidate_pairs': compared,
+        'threshold': threshold,
+        'clusters': clusters,
+        # Exact merges are safe; near clusters need a reviewer, so they are counted apart
+        'saved_cells': sum(cluster['saved_cells'] for cluster in clusters if cluster['kind'] == 'exact'),
+        'saved_bytes': sum(cluster['saved_bytes'] for cluster in clusters if cluster['kind'] == 'exact'),
+        'review_cells': sum(cluster['saved_cells'] for cluster in clusters if cluster['kind'] == 'near'),
+        'review_bytes': sum(cluster['saved_bytes'] for cluster in clusters if cluster['kind'] == 'near'),
+    }
+
+
+def print_report(report, list_all=False):
+    exact = [cluster for cluster in report['clusters'] if cluster['kind'] == 'exact']
+    near = [cluster for cluster in report['clusters'] if cluster['kind'] == 'near']
+    print(f"English sources: {report['keys']} keys, {report['distinct_texts']} distinct after normalization, "
+          f"{report['candidate_pairs']} candidate pairs compared")
+    print(f"Clusters: {len(exact)} exact, {len(near)} near (Jaccard >= {report['threshold']})")
+    print(f"Merging exact duplicates saves {report['saved_cells']} translated cells and "
+          f"{report['saved_bytes']} bytes across the generated bundles")
+    print(f"Near duplicates could save another {report['review_cells']} cells and "
+          f"{report['review_bytes']} bytes after review")
+
+    for title, clusters in (('EXACT DUPLICATES', exact), ('NEAR DUPLICATES', near)):
+        print(f"\n=== {title} ({len(clusters)}) ===")
+        for cluster in clusters if list_all else clusters[:20]:
+            target = cluster['suggested_key'] + (' (new)' if cluster['new_key'] else '')
+            print(f"  -> {target}  saves {cluster['saved_cells']} cells, {cluster['saved_bytes']} bytes")
+            if cluster['template']:
+                print(f"     template: {cluster['template']}")
+            for text in cluster['texts']:
+                print(f"     \"{text}\"")
+            print(f"     keys: {', '.join(cluster['keys'])}")
+            if cluster['translations_differ']:
+                print(f"     translations differ in: {', '.join(cluster['translations_differ'])} (check context)")
+        if not list_all and len(clusters) > 20:
+            print(f"  ... {len(clusters) - 20} more (--list)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find exact and near-duplicate English sources')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='minimum n-gram Jaccard similarity')
+    parser.add_argument('--ngram', type=int, default=DEFAULT_NGRAM, help='character n-gram size')
+    parser.add_argument('--json', action='store_true', help='emit the report as JSON')
+    parser.add_argument('--list', action='store_true', help='list every cluster')
+    args = parser.parse_args(argv)
+
+    report = find_duplicates(TranslationTable.load(), args.threshold, args.ngram)
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report, list_all=args.list)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
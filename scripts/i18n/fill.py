@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Fill empty language cells in translations.csv through a translation backend.
+
+Empty cells are grouped per target language, de-duplicated by source text
+and sent to the backend in batches from a bounded thread pool. Every result
+is stored in a per-backend content-addressed cache (sha256 of languages and
+source text), so identical strings are only ever translated once and an
+interrupted run resumes from where it stopped. Results are written back to
+the CSV with TranslationTable.upsert.
+
+Backends:
+  echo                   returns the source text unchanged (for tests)
+  dictionary:<file.json> looks strings up in {"ko": {"Save": "저장"}, ...}
+  <module>:<Class>       any importable class with translate_batch()
+
+Usage:
+  python3 scripts/i18n/fill.py --backend dictionary:glossary.json [--lang ko es] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from catalog import CACHE_DIR, LANGUAGES, TRANSLATIONS_CSV, TranslationTable
+
+SOURCE_LANGUAGE = 'en'
+MT_CACHE_DIR = os.path.join(CACHE_DIR, 'mt')
+
+
+class EchoBackend:
+    """Stub backend that returns the source text; used to exercise the pipeline"""
+
+    name = 'echo'
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        return list(texts)
+
+
+class DictionaryBackend:
+    """Local backend that resolves strings from a {lang: {source: text}} JSON file"""
+
+    def __init__(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            self.entries = json.load(f)
+        self.name = 'dictionary-' + hashlib.sha256(
+            json.dumps(self.entries, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:12]
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        table = self.entries.get(target_lang, {})
+        # None means "no translation"; the cell is left empty and retried later
+        return [table.get(text) for text in texts]
+
+
+def load_backend(spec):
+    """Build a backend from 'echo', 'dictionary:<path>' or '<module>:<Class>'"""
+    if spec == 'echo':
+        return EchoBackend()
+
+    kind, _, argument = spec.partition(':')
+    if kind == 'dictionary':
+        return DictionaryBackend(argument)
+
+    if not argument:
+        raise ValueError(f"Unknown translation backend: {spec}")
+    backend = getattr(importlib.import_module(kind), argument)()
+    if not hasattr(backend, 'name'):
+        backend.name = spec
+    return backend
+
+
+class TranslationCache:
+    """Content-addressed store of translated strings, one small file per entry"""
+
+    def __init__(self, backend_name, root=MT_CACHE_DIR):
+        self.root = os.path.join(root, backend_name)
+
+    def _path(self, text, source_lang, target_lang):
+        digest = hashlib.sha256(f"{source_lang}\0{target_lang}\0{text}".encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def get(self, text, source_lang, target_lang):
+        try:
+            with open(self._path(text, source_lang, target_lang), 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, text, source_lang, target_lang, translation):
+        path = self._path(text, source_lang, target_lang)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(translation)
+        os.replace(tmp_path, path)
+
+
+def find_gaps(table, languages):
+    """Return {lang: {source_text: [keys]}} for every empty cell with an English source"""
+    gaps = {lang: {} for lang in languages}
+    for key in table.keys():
+        source = table.value(key, SOURCE_LANGUAGE)
+        if not source:
+            continue
+        for lang in languages:
+            if not table.value(key, lang):
+                gaps[lang].setdefault(source, []).append(key)
+    return {lang: texts for lang, texts in gaps.items() if texts}
+
+
+def iter_batches(texts, batch_size, max_chars):
+    batch = []
+    size = 0
+    for text in texts:
+        if batch and (len(batch) >= batch_size or size + len(text) > max_chars):
+            yield batch
+            batch = []
+            size = 0
+        batch.append(text)
+        size += len(text)
+    if batch:
+        yield batch
+
+
+def fill(table, backend, languages, batch_size=50, max_chars=5000, concurrency=4, cache=None):
+    """
+    Translate all gaps for the given languages and upsert them into table.
+
+    Returns per-language stats. Batches that fail are reported and skipped;
+    their cells stay empty and will be picked up by the next run.
+    """
+    cache = cache or TranslationCache(backend.name)
+    stats = {}
+    translated = {}
+    jobs = []
+    gaps = find_gaps(table, languages)
+
+    for lang, texts in gaps.items():
+        stats[lang] = {'cells': sum(len(keys) for keys in texts.values()), 'unique': len(texts),
+                       'cached': 0, 'requested': 0, 'filled': 0, 'failed': 0}
+        pending = []
+        for text in texts:
+            hit = cache.get(text, SOURCE_LANGUAGE, lang)
+            if hit is None:
+                pending.append(text)
+            else:
+                translated[(lang, text)] = hit
+                stats[lang]['cached'] += 1
+
+        for batch in iter_batches(pending, batch_size, max_chars):
+            jobs.append((lang, batch))
+
+    def run(lang, batch):
+        results = backend.translate_batch(batch, SOURCE_LANGUAGE, lang)
+        if len(results) != len(batch):
+            raise ValueError(f"backend returned {len(results)} results for {len(batch)} texts")
+        for text, result in zip(batch, results):
+            if result:
+                cache.put(text, SOURCE_LANGUAGE, lang, result)
+        return results
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(run, lang, batch): (lang, batch) for lang, batch in jobs}
+        for future in as_completed(futures):
+            lang, batch = futures[future]
+            stats[lang]['requested'] += len(batch)
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"Batch of {len(batch)} [{lang}] failed: {e}", file=sys.stderr)
+                stats[lang]['failed'] += len(batch)
+                continue
+            for text, result in zip(batch, results):
+                if result:
+                    translated[(lang, text)] = result
+
+    for lang, texts in gaps.items():
+        for text, keys in texts.items():
+            value = translated.get((lang, text))
+            if not value:
+                continue
+            for key in keys:
+                table.upsert(key, {lang: value})
+                stats[lang]['filled'] += 1
+
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fill empty translation cells via a backend')
+    parser.add_argument('--backend', required=True, help="'echo', 'dictionary:<file.json>' or '<module>:<Class>'")
+    parser.add_argument('--csv', default=TRANSLATIONS_CSV, help='translations CSV to update')
+    parser.add_argument('--lang', nargs='+', choices=LANGUAGES, help='target languages (default: all but en)')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--max-chars', type=int, default=5000, help='character budget per batch')
+    parser.add_argument('--concurrency', type=int, default=4, help='batches in flight at once')
+    parser.add_argument('--dry-run', action='store_true', help='translate and cache but do not write the CSV')
+    args = parser.parse_args(argv)
+
+    table = TranslationTable.load(args.csv)
+    languages = args.lang or [lang for lang in table.languages if lang != SOURCE_LANGUAGE]
+    backend = load_backend(args.backend)
+
+    stats = fill(table, backend, languages, batch_size=args.batch_size,
+                 max_chars=args.max_chars, concurrency=args.concurrency)
+
+    if not stats:
+        print("No empty cells to fill")
+        return 0
+
+    print(f"{'lang':<6}{'cells':>7}{'unique':>8}{'cached':>8}{'requested':>11}{'filled':>8}{'failed':>8}")
+    for lang, row in stats.items():
+        print(f"{lang:<6}{row['cells']:>7}{row['unique']:>8}{row['cached']:>8}"
+              f"{row['requested']:>11}{row['filled']:>8}{row['failed']:>8}")
+
+    if args.dry_run:
+        print("Dry run: translations.csv not modified")
+    else:
+        table.save(args.csv)
+        print(f"Updated {args.csv}")
+
+    failed = sum(row['failed'] for row in stats.values())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
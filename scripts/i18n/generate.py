@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Generate locales/generated/<lang>.json from a TranslationTable.
+
+Produces the same output as generateTranslationFiles() in
+lib/i18n/csv-loader.ts, so either side can rebuild the bundles.
+"""
+
+import json
+import os
+
+from catalog import GENERATED_DIR
+
+
+def _is_array_index(name):
+    # JS objects enumerate canonical array-index keys first, in numeric order
+    return name.isdigit() and str(int(name)) == name and int(name) < 2 ** 32 - 1
+
+
+def js_key_order(node):
+    """Reorder a nested dict the way JSON.stringify would enumerate it"""
+    if not isinstance(node, dict):
+        return node
+    indexes = sorted((name for name in node if _is_array_index(name)), key=int)
+    others = [name for name in node if not _is_array_index(name)]
+    return {name: js_key_order(node[name]) for name in indexes + others}
+
+
+def set_nested_value(tree, key, value):
+    """Python port of setNestedValue() in csv-loader.ts"""
+    *parents, last = key.split('.')
+    current = tree
+    for name in parents:
+        if name not in current:
+            current[name] = {}
+        current = current[name]
+        if not isinstance(current, dict):
+            raise ValueError(f"Key '{key}' nests under a key that already holds a string")
+    current[last] = value
+
+
+def build_locale_tree(table, lang):
+    tree = {}
+    for key in table.keys():
+        set_nested_value(tree, key, table.resolved(key, lang))
+    return js_key_order(tree)
+
+
+def write_locales(table, output_dir=GENERATED_DIR, languages=None):
+    """Write one JSON bundle per language and return the written paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for lang in languages or table.languages:
+        path = os.path.join(output_dir, f'{lang}.json')
+        # Matches JSON.stringify(data, null, 2): no ASCII escaping, no trailing newline
+        content = json.dumps(build_locale_tree(table, lang), ensure_ascii=False, indent=2)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        written.append(path)
+    return written
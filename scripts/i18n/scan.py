@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Translation key usage index for app/, components/ and the document sources.
+
+Walks the TS/TSX tree and scripts/documents/content, extracts key
+references in worker processes and caches per-file results (mtime/size,
+then content hash) so reruns only re-parse files that actually changed.
+
+Three kinds of references are collected per file:
+  - calls:    t('a.b.c') with a literal key, or {t: a.b.c} in a YAML
+              document source
+  - prefixes: t(`a.b.${x}`) template literals, keeping the static prefix
+  - literals: any other quoted string shaped like a dotted key, which
+              covers keys kept in config arrays (labelKey: 'a.b.c')
+
+Dead keys are CSV keys with no call, literal or matching prefix. Missing
+keys are t() calls whose key is absent from translations.csv.
+
+Usage:
+  python3 scripts/i18n/scan.py [--jobs N] [--no-cache] [--json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from catalog import CACHE_DIR, REPO_ROOT, SCAN_DIRS, TranslationTable
+
+SCAN_EXTENSIONS = ('.ts', '.tsx', '.yaml')
+CACHE_PATH = os.path.join(CACHE_DIR, 'key-index.json')
+# Bump when the extraction rules change so stale cache entries are ignored
+CACHE_VERSION = 2
+# Below this many changed files a process pool costs more than it saves
+PARALLEL_THRESHOLD = 32
+
+CALL_PATTERN = re.compile(r"""\bt\(\s*(['"])([^'"\n]+?)\1""")
+TEMPLATE_PATTERN = re.compile(r"""\bt\(\s*`([^`$\n]*)(\$\{)?[^`\n]*`""")
+REFERENCE_PATTERN = re.compile(r"""\{\s*t:\s*(['"]?)([A-Za-z][\w-]*(?:\.[\w-]+)+)\1\s*[,}]""")
+LITERAL_PATTERN = re.compile(r"""(['"`])([A-Za-z][\w-]*(?:\.[\w-]+)+)\1""")
+
+
+def extract_references(source):
+    """Extract calls, dynamic prefixes and key-shaped literals from source"""
+    calls = set()
+    prefixes = set()
+
+    for pattern in (CALL_PATTERN, REFERENCE_PATTERN):
+        for match in pattern.finditer(source):
+            calls.add(match.group(2))
+
+    for match in TEMPLATE_PATTERN.finditer(source):
+        if match.group(2):
+            if match.group(1):
+                prefixes.add(match.group(1))
+        else:
+            calls.add(match.group(1))
+
+    literals = {match.group(2) for match in LITERAL_PATTERN.finditer(source)} - calls
+
+    return {
+        'calls': sorted(calls),
+        'prefixes': sorted(prefixes),
+        'literals': sorted(literals),
+    }
+
+
+def scan_file(task):
+    """Worker: hash and parse one file, skipping the parse if the hash is known"""
+    path, known_hash = task
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    digest = hashlib.sha1(content).hexdigest()
+    if digest == known_hash:
+        return path, digest, None
+
+    return path, digest, extract_references(content.decode('utf-8', errors='replace'))
+
+
+def iter_source_files(root=REPO_ROOT):
+    for directory in SCAN_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, directory)):
+            dirnames[:] = [name for name in dirnames if name != 'node_modules']
+            for filename in filenames:
+                if filename.endswith(SCAN_EXTENSIONS):
+                    yield os.path.join(dirpath, filename)
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('files', {})
+
+
+def save_cache(files, path=CACHE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'files': files}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def build_index(root=REPO_ROOT, jobs=None, use_cache=True):
+    """
+    Return ({relpath: references}, stats) for every scanned source file.
+
+    Files whose mtime and size match the cache are reused without being read;
+    the rest are hashed and parsed in a process pool.
+    """
+    cached = load_cache() if use_cache else {}
+    files = {}
+    tasks = []
+    stats = {'files': 0, 'reused': 0, 'rehashed': 0, 'parsed': 0}
+
+    for path in iter_source_files(root):
+        relpath = os.path.relpath(path, root)
+        st = os.stat(path)
+        entry = cached.get(relpath)
+        stats['files'] += 1
+
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            files[relpath] = entry
+            stats['reused'] += 1
+            continue
+
+        files[relpath] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'refs': None}
+        if entry:
+            files[relpath]['refs'] = entry['refs']
+        tasks.append((path, entry['sha1'] if entry else None))
+
+    def collect(results):
+        for path, digest, refs in results:
+            entry = files[os.path.relpath(path, root)]
+            entry['sha1'] = digest
+            if refs is None:
+                stats['rehashed'] += 1
+            else:
+                entry['refs'] = refs
+                stats['parsed'] += 1
+
+    if len(tasks) < PARALLEL_THRESHOLD or jobs == 1:
+        collect(map(scan_file, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            collect(executor.map(scan_file, tasks, chunksize=16))
+
+    if use_cache:
+        save_cache(files)
+
+    return {relpath: entry['refs'] for relpath, entry in files.items()}, stats
+
+
+def analyze(index, table):
+    """Compare the usage index against translations.csv"""
+    calls = {}
+    literals = set()
+    prefixes = set()
+
+    for relpath, refs in index.items():
+        for key in refs['calls']:
+            calls.setdefault(key, []).append(relpath)
+        literals.update(refs['literals'])
+        prefixes.update(refs['prefixes'])
+
+    # Bucket dynamic prefixes by namespace so each CSV key only checks the
+    # handful of prefixes that could possibly match it
+    prefixes_by_namespace = {}
+    for prefix in prefixes:
+        prefixes_by_namespace.setdefault(prefix.split('.', 1)[0], []).append(prefix)
+
+    def is_referenced(key):
+        if key in calls or key in literals:
+            return True
+        candidates = prefixes_by_namespace.get(key.split('.', 1)[0], ())
+        return any(key.startswith(prefix) for prefix in candidates)
+
+    dead = sorted(key for key in table.keys() if not is_referenced(key))
+    missing = {key: sorted(set(paths)) for key, paths in sorted(calls.items()) if key not in table}
+
+    return {
+        'referenced_keys': len(calls),
+        'dynamic_prefixes': sorted(prefixes),
+        'dead': dead,
+        'missing': missing,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find unused and missing translation keys')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and do not write the file cache')
+    parser.add_argument('--json', action='store_true', help='emit the result as JSON')
+    args = parser.parse_args(argv)
+
+    index, stats = build_index(jobs=args.jobs, use_cache=not args.no_cache)
+    result = analyze(index, TranslationTable.load())
+
+    if args.json:
+        json.dump(dict(result, stats=stats), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    print(f"Scanned {stats['files']} files "
+          f"({stats['reused']} cached, {stats['rehashed']} unchanged content, {stats['parsed']} parsed)")
+    print(f"Referenced keys: {result['referenced_keys']}, "
+          f"dynamic prefixes: {len(result['dynamic_prefixes'])}")
+
+    print(f"\n=== DEAD KEYS IN translations.csv ({len(result['dead'])}) ===")
+    for key in result['dead']:
+        print(f"  {key}")
+
+    print(f"\n=== REFERENCED KEYS MISSING FROM translations.csv ({len(result['missing'])}) ===")
+    for key, paths in result['missing'].items():
+        print(f"  {key}  ({paths[0]}{' +' + str(len(paths) - 1) if len(paths) > 1 else ''})")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
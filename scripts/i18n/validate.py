@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Consistency checks for translations.csv.
+
+Errors are problems that break generation or rendering (bad header, invalid
+keys, a key that is both a string and a parent object). Warnings are data
+quality issues (duplicates, empty cells, placeholder mismatches).
+"""
+
+import re
+
+from catalog import LANGUAGES
+
+KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]+(\.[A-Za-z0-9_-]+)*$')
+PLACEHOLDER_PATTERN = re.compile(r'\{\{?\s*(\w+)\s*\}?\}')
+
+
+def validate(table):
+    """Return (errors, warnings) as lists of human-readable messages"""
+    errors = []
+    warnings = []
+
+    missing_columns = [name for name in ['key', 'context'] + LANGUAGES if name not in table.columns]
+    if missing_columns:
+        errors.append(f"Header is missing columns: {', '.join(missing_columns)}")
+        return errors, warnings
+
+    for key in sorted(set(table.duplicates)):
+        warnings.append(f"{key}: defined more than once (last row wins)")
+
+    keys = set(table.keys())
+    for key in table.keys():
+        if not KEY_PATTERN.match(key):
+            errors.append(f"{key}: invalid key")
+            continue
+
+        # A key that is also a parent of another key cannot be nested
+        parts = key.split('.')
+        for depth in range(1, len(parts)):
+            parent = '.'.join(parts[:depth])
+            if parent in keys:
+                errors.append(f"{key}: parent '{parent}' is already a string")
+                break
+
+        row = table.row(key)
+        source = table.value(key, 'en')
+        expected = set(PLACEHOLDER_PATTERN.findall(source))
+
+        for lang in LANGUAGES:
+            raw = row[table.columns[lang]]
+            value = raw.strip()
+            if not value:
+                warnings.append(f"{key}: empty [{lang}]")
+                continue
+            if raw != value:
+                warnings.append(f"{key}: surrounding whitespace [{lang}]")
+            if lang != 'en' and set(PLACEHOLDER_PATTERN.findall(value)) != expected:
+                warnings.append(f"{key}: placeholders differ from English [{lang}]")
+
+    return errors, warnings